@@ -5,17 +5,35 @@
 import sys
 import cv2
 import numpy as np
-import math
-import json
+import os
+import shutil
+import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QSlider, QFileDialog, QGraphicsView,
     QGraphicsScene, QGraphicsPixmapItem, QGraphicsEllipseItem, QProgressDialog,
     QGraphicsLineItem, QGroupBox, QComboBox, QGraphicsRectItem, QGraphicsObject, QGraphicsItem,
-    QColorDialog, QDialog, QDialogButtonBox, QFormLayout, QStatusBar, QProgressBar, QMessageBox
+    QColorDialog, QDialog, QDialogButtonBox, QFormLayout, QStatusBar, QProgressBar, QMessageBox,
+    QSpinBox, QDoubleSpinBox, QCheckBox, QInputDialog
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QPointF, QRectF, QRect
-from PyQt6.QtGui import QPixmap, QImage, QPen, QBrush, QColor, QIcon, QPainterPath, QPainter
+from PyQt6.QtCore import Qt, QThread, QObject, QTimer, QElapsedTimer, pyqtSignal, QPointF, QRectF, QRect
+from PyQt6.QtGui import QPixmap, QImage, QPen, QBrush, QColor, QIcon, QPainterPath, QPainter, QTransform
+from tube_render import (
+    PROFILES, DEFAULT_SETTINGS, EXPORT_IMAGE_STORE,
+    open_project, save_project, image_file_hash, is_binary_project, BINARY_PROJECT_EXTENSION,
+    ArcLengthTable, PathLengthIndex, AnimationTimeline, IncrementalFrameRenderer, PreviewPacer,
+    prepare_export_images, timeline_to_output, camera_windows, render_pipelined, render_parallel,
+    RenderCache, render_cached
+)
+from tube_tiles import TILED_IMAGE_MIN_PIXELS, open_tiled_image, read_image_size
+from tube_path import PathModel, PointGrid
+from tube_import import DEFAULT_TOLERANCE, import_path
+
+PREVIEW_SCENE, PREVIEW_REFERENCE = "Aperçu scène", "Aperçu image"  # Modes de prévisualisation
+DISPLAY_MAX_SIDE = 4096  # Côté maximal du pixmap affiché pour une image en tuiles
+HIT_TOLERANCE_PX = 8     # Rayon de sélection d'un point de contrôle, en pixels écran
+PROJECT_JSON_FILTER = "Projet Vidéo (*.json)"
+PROJECT_BINARY_FILTER = "Projet binaire (*.npz)"
 
 class PathEditor:
     """
@@ -30,10 +48,13 @@ class PathEditor:
             scene: La scène QGraphicsScene où le chemin sera affiché
         """
         self.scene = scene           # Scène graphique parente
-        self.points = []             # Liste des points de contrôle du chemin
-        self.bezier_handles = []     # Poignées de Bézier pour les courbes
-        self.smoothing = 0.5         # Niveau de lissage (0.0 à 1.0)
+        self.points = PathModel()    # Points de contrôle et poignées de Bézier, en tableaux
         self.show_handles = True     # Afficher les poignées de contrôle
+        self.length_index = PathLengthIndex()  # Longueurs d'arc cumulées, mises à jour point par point
+        # Registre des éléments graphiques de l'éditeur, mis à jour localement
+        self._segment_items = []     # Un élément de chemin par segment (point i -> point i+1)
+        self._point_items = []       # Un élément par point de contrôle
+        self._handle_items = []      # Lignes et poignées de chaque point (None si absentes)
         
     def add_point(self, pos, size):
         """
@@ -46,53 +67,25 @@ class PathEditor:
         Returns:
             int: Index du point ajouté
         """
-        point = {"x": pos.x(), "y": pos.y(), "size": size}
-        self.points.append(point)
-        self.update_bezier_handles()  # Met à jour les poignées de Bézier
-        self.redraw()  # Redessine le chemin
-        return len(self.points) - 1  # Retourne l'index du point
+        # Le modèle ne recalcule que les poignées de l'ancien dernier point
+        index = self.points.append(pos.x(), pos.y(), size)
+        self.length_index.point_inserted(self.points, self.bezier_handles, index)
+        self.refresh_items(index - 1, index)
+        return index  # Retourne l'index du point
     
-    def update_bezier_handles(self):
-        """
-        Calcule et met à jour les poignées de Bézier pour tous les points de contrôle.
-        Les poignées déterminent la courbure du chemin entre les points.
-        """
-        self.bezier_handles = []  # Réinitialise les poignées existantes
-        
-        # Parcourt tous les points sauf le premier et le dernier
-        for i in range(len(self.points)):
-            # Pas de poignées pour les extrémités
-            if i == 0 or i == len(self.points) - 1:
-                self.bezier_handles.append({"in": None, "out": None})
-                continue
-                
-            # Points adjacents pour calculer la tangente
-            prev = self.points[i-1]
-            curr = self.points[i]
-            next_pt = self.points[i+1]
-            
-            # Calcul du vecteur tangent (direction du chemin)
-            # Le facteur 0.2 et le smoothing déterminent l'intensité de la courbure
-            dx = (next_pt["x"] - prev["x"]) * 0.2 * self.smoothing
-            dy = (next_pt["y"] - prev["y"]) * 0.2 * self.smoothing
-            
-            # Création des poignées d'entrée et de sortie
-            # Ces points contrôlent la courbe avant et après le point de contrôle
-            handle_in = {
-                "x": curr["x"] - dx,  # Poignée d'entrée (côté point précédent)
-                "y": curr["y"] - dy
-            }
-            
-            handle_out = {
-                "x": curr["x"] + dx,  # Poignée de sortie (côté point suivant)
-                "y": curr["y"] + dy
-            }
-            
-            # Stockage des poignées pour ce point
-            self.bezier_handles.append({
-                "in": handle_in,
-                "out": handle_out
-            })
+    @property
+    def bezier_handles(self):
+        """Poignées de Bézier (entrée, sortie) de chaque point, NaN aux extrémités."""
+        return self.points.handles
+    
+    @property
+    def smoothing(self):
+        """Niveau de lissage (0.0 à 1.0)."""
+        return self.points.smoothing
+    
+    @smoothing.setter
+    def smoothing(self, value):
+        self.points.set_smoothing(value)
     
     def get_smoothed_path(self):
         """
@@ -108,142 +101,180 @@ class PathEditor:
             return path
             
         # Positionnement au premier point
-        first = self.points[0]
-        path.moveTo(QPointF(first["x"], first["y"]))
-        
-        # Cas particulier : seulement 2 points -> ligne droite
-        if len(self.points) == 2:
-            second = self.points[1]
-            path.lineTo(QPointF(second["x"], second["y"]))
-            return path
+        xy = self.points.xy
+        handle_in, handle_out = self.bezier_handles
+        path.moveTo(QPointF(*xy[0]))
         
         # Parcours des points pour créer des courbes de Bézier
-        for i in range(1, len(self.points)):
-            prev = self.points[i-1]
-            curr = self.points[i]
-            
-            # Vérifie si on peut créer une courbe de Bézier cubique
-            if (i < len(self.bezier_handles) and 
-                self.bezier_handles[i-1]["out"] and 
-                self.bezier_handles[i]["in"]):
-                
-                # Récupération des points de contrôle de Bézier
-                handle_out = self.bezier_handles[i-1]["out"]  # Poignée de sortie du point précédent
-                handle_in = self.bezier_handles[i]["in"]      # Poignée d'entrée du point courant
-                
-                # Création d'une courbe de Bézier cubique
+        for i in range(1, len(xy)):
+            # Courbe cubique si les deux poignées existent (2 points : ligne droite)
+            if not (np.isnan(handle_out[i-1, 0]) or np.isnan(handle_in[i, 0])):
                 path.cubicTo(
-                    QPointF(handle_out["x"], handle_out["y"]),  # Point de contrôle de départ
-                    QPointF(handle_in["x"], handle_in["y"]),    # Point de contrôle d'arrivée
-                    QPointF(curr["x"], curr["y"])               # Point d'arrivée
+                    QPointF(*handle_out[i-1]),  # Poignée de sortie du point précédent
+                    QPointF(*handle_in[i]),     # Poignée d'entrée du point courant
+                    QPointF(*xy[i])             # Point d'arrivée
                 )
             else:
                 # Si pas de poignées, on trace une ligne droite
-                path.lineTo(QPointF(curr["x"], curr["y"]))
+                path.lineTo(QPointF(*xy[i]))
                 
         return path
     
+    def get_segment_path(self, index):
+        """
+        Construit le QPainterPath d'un seul segment du chemin lissé.
+        
+        Args:
+            index: Index du segment (du point index au point index + 1)
+            
+        Returns:
+            QPainterPath: Le segment, courbe de Bézier ou ligne droite comme dans get_smoothed_path
+        """
+        xy = self.points.xy
+        path = QPainterPath(QPointF(*xy[index]))
+        handle_out = self.bezier_handles[1][index]
+        handle_in = self.bezier_handles[0][index + 1]
+        if not (np.isnan(handle_out[0]) or np.isnan(handle_in[0])):
+            path.cubicTo(QPointF(*handle_out), QPointF(*handle_in), QPointF(*xy[index + 1]))
+        else:
+            path.lineTo(QPointF(*xy[index + 1]))
+        return path
+    
     def redraw(self):
         """
         Redessine l'ensemble du chemin et ses éléments de contrôle dans la scène.
-        Cette méthode est appelée à chaque modification du chemin.
+        Utilisée après une modification globale (lissage, chargement, effacement) ;
+        les éléments existants sont réutilisés. Les ajouts et déplacements de
+        points passent par refresh_items.
         """
-        # Supprime tous les éléments graphiques précédents du chemin
-        for item in self.scene.items():
-            if hasattr(item, 'is_path_element') and item.is_path_element:
-                self.scene.removeItem(item)
-        
-        # Vérifie s'il y a assez de points pour former un chemin
-        if len(self.points) >= 2:
-            # Création du style pour le chemin principal
-            pen = QPen(QColor("#4f46e5"), 2, Qt.PenStyle.SolidLine)
-            
-            # Obtention du chemin lissé
-            path = self.get_smoothed_path()
-            
-            # Ajout du chemin à la scène
-            path_item = self.scene.addPath(path, pen)
-            path_item.is_path_element = True  # Marque l'élément pour une suppression facile
-            
-            # Dessin des points de contrôle
-            for i, point in enumerate(self.points):
-                # Dessin du point principal
-                point_size = 8
-                point_item = self.scene.addEllipse(
-                    point["x"] - point_size/2,
-                    point["y"] - point_size/2,
-                    point_size, point_size,
-                    QPen(Qt.GlobalColor.white, 1.5),  # Contour blanc
-                    QBrush(QColor("#4f46e5"))          # Remplissage bleu
-                )
-                point_item.is_path_element = True
-                point_item.setZValue(15)  # S'assure que les points sont au-dessus du chemin
-                
-                # Dessin des poignées de Bézier si activé et pour les points intermédiaires
-                if (self.show_handles and 
-                    0 < i < len(self.points) - 1 and 
-                    i-1 < len(self.bezier_handles)):
-                    
-                    self._draw_bezier_handles(i, point)
+        self.refresh_items(0, len(self.points) - 1)
     
-    def _draw_bezier_handles(self, point_index, point):
+    def refresh_items(self, first, last):
         """
-        Dessine les poignées de Bézier pour un point de contrôle.
+        Met à jour les éléments graphiques des points first à last, de leurs
+        poignées et des segments qui les touchent. Les éléments existants sont
+        déplacés, les manquants créés et ceux en trop retirés.
         
         Args:
-            point_index: Index du point de contrôle
-            point: Dictionnaire contenant les coordonnées du point
+            first, last: Plage d'index des points modifiés
         """
-        handle_in = self.bezier_handles[point_index-1]["in"]
-        handle_out = self.bezier_handles[point_index-1]["out"]
-        
-        if not handle_in or not handle_out:
+        count = len(self.points)
+        self._remove_items(count)
+        first, last = max(0, first), min(count - 1, last)
+        if count < 2:
+            # Pas de chemin : les points ne sont affichés qu'à partir de deux
+            self._remove_items(0)
             return
-        
-        # Style des lignes de guidage
-        line_pen = QPen(QColor("#6b7280"), 1, Qt.PenStyle.DotLine)
-        
-        # Ligne point de contrôle -> poignée d'entrée
-        line_in = self.scene.addLine(
-            point["x"], point["y"],
-            handle_in["x"], handle_in["y"],
-            line_pen
+        # Création des éléments manquants (nouveaux points, ou chemin qui atteint deux points)
+        for i in range(len(self._point_items), count):
+            self._update_point_item(i)
+            self._update_handle_items(i)
+        for segment in range(len(self._segment_items), count - 1):
+            self._update_segment_item(segment)
+        # Mise à jour des points modifiés et des segments qui les touchent
+        for i in range(first, last + 1):
+            self._update_point_item(i)
+            self._update_handle_items(i)
+        for segment in range(max(0, first - 1), min(count - 1, last + 1)):
+            self._update_segment_item(segment)
+    
+    def _remove_items(self, count):
+        """Retire de la scène les éléments des points d'index >= count."""
+        def remove(items):
+            for item in items:
+                if item is not None and item.scene() is self.scene:
+                    self.scene.removeItem(item)
+        for items in self._point_items[count:], self._segment_items[max(0, count - 1):]:
+            remove(items)
+        for handles in self._handle_items[count:]:
+            remove(handles or ())
+        del self._point_items[count:]
+        del self._segment_items[max(0, count - 1):]
+        del self._handle_items[count:]
+    
+    def _update_segment_item(self, index):
+        """Crée ou met à jour l'élément du segment index -> index + 1."""
+        path = self.get_segment_path(index)
+        if index < len(self._segment_items):
+            self._segment_items[index].setPath(path)
+            return
+        path_item = self.scene.addPath(path, QPen(QColor("#4f46e5"), 2, Qt.PenStyle.SolidLine))
+        path_item.is_path_element = True
+        self._segment_items.append(path_item)
+    
+    def _update_point_item(self, index):
+        """Crée ou déplace l'élément d'un point de contrôle."""
+        x, y = self.points.xy[index]
+        point_size = 8
+        rect = QRectF(x - point_size/2, y - point_size/2, point_size, point_size)
+        if index < len(self._point_items):
+            self._point_items[index].setRect(rect)
+            return
+        point_item = self.scene.addEllipse(
+            rect,
+            QPen(Qt.GlobalColor.white, 1.5),  # Contour blanc
+            QBrush(QColor("#4f46e5"))          # Remplissage bleu
         )
-        line_in.is_path_element = True
+        point_item.is_path_element = True
+        point_item.setZValue(15)  # S'assure que les points sont au-dessus du chemin
+        self._point_items.append(point_item)
+    
+    def _update_handle_items(self, index):
+        """
+        Crée, déplace ou retire les poignées de Bézier d'un point de contrôle
+        (lignes de guidage et poignées d'entrée et de sortie).
+        """
+        while len(self._handle_items) <= index:
+            self._handle_items.append(None)
+        x, y = self.points.xy[index]
+        handle_in = self.bezier_handles[0][index]
+        handle_out = self.bezier_handles[1][index]
+        items = self._handle_items[index]
         
-        # Ligne point de contrôle -> poignée de sortie
-        line_out = self.scene.addLine(
-            point["x"], point["y"],
-            handle_out["x"], handle_out["y"],
-            line_pen
-        )
-        line_out.is_path_element = True
+        if not self.show_handles or np.isnan(handle_in[0]) or np.isnan(handle_out[0]):
+            for item in items or ():
+                self.scene.removeItem(item)
+            self._handle_items[index] = None
+            return
         
-        # Style des poignées
         handle_size = 6
-        handle_brush = QBrush(QColor("#ef4444"))  # Couleur rouge pour les poignées
+        in_rect = QRectF(handle_in[0] - handle_size/2, handle_in[1] - handle_size/2, handle_size, handle_size)
+        out_rect = QRectF(handle_out[0] - handle_size/2, handle_out[1] - handle_size/2, handle_size, handle_size)
+        if items is not None:
+            line_in, line_out, handle_in_item, handle_out_item = items
+            line_in.setLine(x, y, *handle_in)
+            line_out.setLine(x, y, *handle_out)
+            handle_in_item.setRect(in_rect)
+            handle_out_item.setRect(out_rect)
+            return
         
-        # Dessin de la poignée d'entrée
-        handle_in_item = self.scene.addEllipse(
-            handle_in["x"] - handle_size/2,
-            handle_in["y"] - handle_size/2,
-            handle_size, handle_size,
-            QPen(Qt.GlobalColor.white, 1),
-            handle_brush
+        # Style des lignes de guidage et des poignées
+        line_pen = QPen(QColor("#6b7280"), 1, Qt.PenStyle.DotLine)
+        handle_brush = QBrush(QColor("#ef4444"))  # Couleur rouge pour les poignées
+        items = (
+            self.scene.addLine(x, y, *handle_in, line_pen),
+            self.scene.addLine(x, y, *handle_out, line_pen),
+            self.scene.addEllipse(in_rect, QPen(Qt.GlobalColor.white, 1), handle_brush),
+            self.scene.addEllipse(out_rect, QPen(Qt.GlobalColor.white, 1), handle_brush)
         )
-        handle_in_item.is_path_element = True
-        handle_in_item.setZValue(15)
+        for item in items:
+            item.is_path_element = True
+        items[2].setZValue(15)
+        items[3].setZValue(15)
+        self._handle_items[index] = items
+    
+    def move_point(self, index, pos):
+        """
+        Déplace un point de contrôle. Seules les poignées du point et de ses
+        voisins changent, ainsi que les segments qu'elles dessinent.
         
-        # Dessin de la poignée de sortie
-        handle_out_item = self.scene.addEllipse(
-            handle_out["x"] - handle_size/2,
-            handle_out["y"] - handle_size/2,
-            handle_size, handle_size,
-            QPen(Qt.GlobalColor.white, 1),
-            handle_brush
-        )
-        handle_out_item.is_path_element = True
-        handle_out_item.setZValue(15)
+        Args:
+            index: Index du point
+            pos: Nouvelle position QPointF
+        """
+        self.points.move(index, pos.x(), pos.y())
+        self.length_index.points_moved(self.points, self.bezier_handles, index, index)
+        self.refresh_items(index - 1, index + 1)
     
     def set_smoothing(self, value):
         """
@@ -252,16 +283,48 @@ class PathEditor:
         Args:
             value: Niveau de lissage entre 0 (pas de lissage) et 100 (lissage maximal)
         """
-        self.smoothing = value / 100.0  # Conversion en 0.0-1.0
-        self.update_bezier_handles()  # Met à jour les poignées
+        self.smoothing = value / 100.0  # Conversion en 0.0-1.0 ; le modèle recalcule les poignées
+        self.length_index.set_path(self.points, self.bezier_handles)
         self.redraw()  # Redessine le chemin
     
+    def get_arc_length_table(self):
+        """
+        Retourne la table de longueur d'arc du chemin lissé, utilisée par le
+        moteur d'animation pour suivre les courbes affichées.
+        Elle est assemblée depuis l'index de longueur d'arc, qui ne rééchantillonne
+        que les segments modifiés.
+        
+        Returns:
+            ArcLengthTable: Table de correspondance distance -> position et taille
+        """
+        return self.length_index.arc_table()
+
+    def total_distance(self):
+        """
+        Retourne la longueur du chemin lissé, sans rééchantillonner le tracé.
+        
+        Returns:
+            float: Longueur totale en pixels
+        """
+        return self.length_index.total_distance
+    
+    def set_points(self, points):
+        """
+        Remplace les points de contrôle du chemin (chargement d'un projet).
+        
+        Args:
+            points: PathModel ou liste des points de contrôle avec leurs coordonnées et tailles
+        """
+        self.points = PathModel.from_points(points, self.smoothing)
+        self.length_index.set_path(self.points, self.bezier_handles)
+        self.redraw()
+    
     def get_points(self):
         """
-        Retourne la liste des points de contrôle du chemin.
+        Retourne le modèle du chemin, partagé avec la fenêtre principale.
         
         Returns:
-            list: Liste des points de contrôle avec leurs coordonnées et tailles
+            PathModel: Points de contrôle avec leurs coordonnées et tailles
         """
         return self.points
     
@@ -269,28 +332,10 @@ class PathEditor:
         """
         Réinitialise l'éditeur en supprimant tous les points de contrôle.
         """
-        self.points = []
-        self.bezier_handles = []
+        self.points.clear()
+        self.length_index.set_path(self.points, self.bezier_handles)
         self.redraw()  # Met à jour l'affichage
 
-# =============================================================================
-# --- Constantes globales de l'application ---
-# =============================================================================
-PROFILES = {
-    "HD 720p": (1280, 720),
-    "Full HD 1080p": (1920, 1080),
-    "4K UHD": (3840, 2160)
-}
-DEFAULT_SETTINGS = {
-    "speed": 500,
-    "size": 250,
-    "brightness": 50,
-    "fps": 50,
-    "shape": "Cercle",
-    "trace_color": "#FFFF00",
-    "shape_color": "#00FFFF"
-}
-
 # =============================================================================
 # --- Classe Point de Contrôle ---
 # =============================================================================
@@ -325,16 +370,20 @@ class ControlPoint(QGraphicsObject):
 class AnimationWorker(QThread):
     progress_update = pyqtSignal(int)
     frame_ready_for_preview = pyqtSignal(np.ndarray)
+    stats_ready = pyqtSignal(dict)    # Mesures du pipeline d'export ou de la lecture de l'aperçu
     finished = pyqtSignal()
     error_occurred = pyqtSignal(str)  # Signal pour les erreurs
 
-    def __init__(self, path_points, settings, image, resolution, output_path=None):
+    def __init__(self, path_points, settings, image, resolution, output_path=None, timeline=None):
         super().__init__()
         self.path_points = path_points
         self.settings = settings
-        self.image = image.copy()
+        self.image = image  # Empruntée en lecture seule : l'image de la fenêtre n'est jamais modifiée
         self.target_resolution = resolution
         self.output_path = output_path
+        self.timeline = timeline  # Trajectoire précalculée partagée (optionnelle)
+        self.pipeline_stats = None
+        self.preview_stats = None
         self.is_running = True
 
     def run(self):
@@ -343,153 +392,257 @@ class AnimationWorker(QThread):
         Gère la création des frames et l'exportation vidéo si nécessaire.
         """
         try:
-            # Récupération des dimensions de l'image et des paramètres
-            height, width, _ = self.image.shape
+            # Récupération des paramètres
             speed = self.settings['speed']  # en pixels par seconde
             fps = self.settings['fps']      # images par seconde
             
-            # Calcul du facteur d'assombrissement de l'arrière-plan (0.0 à 1.0)
-            bg_brightness_factor = self.settings['brightness'] / 100.0
-            
-            # Calcul de la distance totale du trajet
-            total_distance = sum(
-                self.calculate_distance(self.path_points[i], self.path_points[i+1]) 
-                for i in range(len(self.path_points) - 1)
-            )
-            
-            # Calcul du nombre total de frames pour la barre de progression
-            if speed > 0 and fps > 0:
-                total_frames = int((total_distance / speed) * fps)
-            else:
-                total_frames = 0
-
-            # Initialisation du writer vidéo si nécessaire
-            video_writer = None
-            if self.output_path:
-                out_w, out_h = self.target_resolution if self.target_resolution else (width, height)
-                # Utilisation de l'encodeur H.264 (X264) pour une meilleure qualité
-                fourcc = cv2.VideoWriter_fourcc(*'X264')
-                video_writer = cv2.VideoWriter(self.output_path, fourcc, fps, (out_w, out_h))
-                if not video_writer.isOpened():
-                    raise RuntimeError(f"Impossible d'initialiser le fichier vidéo: {self.output_path}")
+            # Trajectoire précalculée de toutes les frames
+            timeline = self.timeline
+            if timeline is None:
+                timeline = AnimationTimeline(self.path_points, speed, fps)
+            total_frames = len(timeline)
 
             # Vérification des paramètres valides
             if speed <= 0 or fps <= 0:
-                if video_writer:
-                    video_writer.release()
-                self.finished.emit()
                 return
-                
-            # Calcul du nombre de pixels à parcourir par frame
-            pixels_per_frame = speed / fps
-            
-            # Initialisation des variables de suivi de l'animation
-            current_segment = 0
-            progress_in_segment = 0.0
-            frame_count = 0
-            
-            # Création de l'image d'arrière-plan assombrie
-            dark_image = (self.image * bg_brightness_factor).astype(np.uint8)
-
-            # Boucle principale de génération des frames
-            while current_segment < len(self.path_points) - 1 and self.is_running:
-                # Récupération des points de début et de fin du segment actuel
-                start_point = self.path_points[current_segment]
-                end_point = self.path_points[current_segment + 1]
-                
-                # Calcul de la position et de la taille actuelles par interpolation linéaire
-                current_x = start_point["x"] + (end_point["x"] - start_point["x"]) * progress_in_segment
-                current_y = start_point["y"] + (end_point["y"] - start_point["y"]) * progress_in_segment
-                current_size = start_point["size"] + (end_point["size"] - start_point["size"]) * progress_in_segment
+
+            # Exportation : compositing et encodage en pipeline
+            if self.output_path:
+                _, self.pipeline_stats = render_pipelined(
+                    timeline, self.settings, self.image, self.target_resolution, self.output_path,
+                    progress_callback=self.progress_update.emit,
+                    is_cancelled=lambda: not self.is_running
+                )
+                self.stats_ready.emit(self.pipeline_stats)
+                return
+
+            # Aperçu composé directement à la résolution demandée (taille de la vue)
+            image, dark_image, scale_x, scale_y = prepare_export_images(
+                self.image, self.target_resolution, self.settings['brightness']
+            )
+            xs, ys, widths, heights = timeline_to_output(timeline, scale_x, scale_y)
+            renderer = IncrementalFrameRenderer(image, dark_image, self.settings['shape'])
+
+            # Boucle principale de génération des frames de prévisualisation,
+            # cadencée sur l'horloge : les frames en retard sont sautées
+            pacer = PreviewPacer(total_frames, fps)
+            for frame_index in pacer.frames():
+                if not self.is_running:
+                    break
                 
                 # Création de la frame avec la zone mise en évidence
-                frame = self.create_highlight_frame(dark_image, current_x, current_y, current_size)
-                
-                # Gestion de l'exportation ou de la prévisualisation
-                if video_writer:
-                    # Redimensionnement si nécessaire pour l'exportation
-                    if self.target_resolution:
-                        frame = cv2.resize(frame, self.target_resolution, interpolation=cv2.INTER_AREA)
-                    video_writer.write(frame)
-                else:
-                    # Envoi de la frame pour prévisualisation
-                    self.frame_ready_for_preview.emit(frame)
-                    self.msleep(int(1000/fps))  # Contrôle de la vitesse de lecture
+                render_start = time.perf_counter()
+                frame = renderer.render(
+                    xs[frame_index], ys[frame_index], widths[frame_index], heights[frame_index]
+                ).copy()  # Le tampon du moteur de rendu est réutilisé
+                pacer.present(frame_index, time.perf_counter() - render_start)
+                self.frame_ready_for_preview.emit(frame)
                 
                 # Mise à jour de la progression
-                frame_count += 1
-                if total_frames > 0:
-                    progress_percent = int((frame_count / total_frames) * 100)
-                    self.progress_update.emit(progress_percent)
-                
-                # Calcul de la progression dans le segment actuel
-                segment_length = self.calculate_distance(start_point, end_point)
-                if segment_length > 0:
-                    progress_in_segment += pixels_per_frame / segment_length
-                else:
-                    progress_in_segment = 1.0
-                
-                # Passage au segment suivant si nécessaire
-                if progress_in_segment >= 1.0:
-                    progress_in_segment = 0.0
-                    current_segment += 1
-
-            # Nettoyage final
-            if video_writer:
-                video_writer.release()
+                self.progress_update.emit(int(((frame_index + 1) / total_frames) * 100))
+            self.preview_stats = pacer.stats()
+            self.stats_ready.emit(self.preview_stats)
                 
         except Exception as e:
             self.error_occurred.emit(str(e))
         finally:
             self.finished.emit()
 
-    def create_highlight_frame(self, dark_image, x, y, size):
-        """
-        Crée une frame avec une zone mise en évidence.
-        
-        Args:
-            dark_image: Image de fond assombrie
-            x, y: Position du centre de la zone
-            size: Taille de la zone
-            
-        Returns:
-            Image avec la zone mise en évidence
-        """
-        # Création d'un masque pour la zone éclairée
-        mask = np.zeros(self.image.shape[:2], dtype="uint8")
-        
-        # Dessin de la forme sélectionnée dans le masque
-        if self.settings['shape'] == "Cercle":
-            cv2.circle(mask, (int(x), int(y)), int(size / 2), 255, -1)
-        elif self.settings['shape'] == "Carré":
-            half_size = int(size / 2)
-            cv2.rectangle(
-                mask, 
-                (int(x - half_size), int(y - half_size)), 
-                (int(x + half_size), int(y + half_size)), 
-                255, 
-                -1
+    def stop(self):
+        """Arrête le rendu de l'animation en cours."""
+        self.is_running = False
+
+
+class ParallelExportWorker(QThread):
+    """
+    Export vidéo réparti sur un pool de processus (voir tube_render.render_parallel).
+    Expose les mêmes signaux de progression et d'annulation qu'AnimationWorker.
+    """
+    progress_update = pyqtSignal(int)
+    finished = pyqtSignal()
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, settings, image, resolution, output_path, timeline, workers):
+        super().__init__()
+        self.settings = settings.copy()
+        self.image = image
+        self.target_resolution = resolution
+        self.output_path = output_path
+        self.timeline = timeline
+        self.workers = workers
+        self.is_running = True
+
+    def run(self):
+        try:
+            render_parallel(
+                self.timeline, self.settings, self.image, self.target_resolution,
+                self.output_path, workers=self.workers,
+                progress_callback=self.progress_update.emit,
+                is_cancelled=lambda: not self.is_running
             )
-        
-        # Application du masque pour combiner les images
-        mask_3d = mask[:, :, np.newaxis] > 0
-        return np.where(mask_3d, self.image, dark_image)
-        
-    def calculate_distance(self, p1, p2):
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+        finally:
+            self.finished.emit()
+
+    def stop(self):
+        """Arrête l'export en cours."""
+        self.is_running = False
+
+
+class CachedExportWorker(QThread):
+    """
+    Export vidéo qui réutilise les segments déjà rendus (voir tube_render.render_cached).
+    Expose les mêmes signaux de progression et d'annulation qu'AnimationWorker.
+    """
+    progress_update = pyqtSignal(int)
+    stats_ready = pyqtSignal(dict)
+    finished = pyqtSignal()
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, settings, image, resolution, output_path, timeline, workers, cache):
+        super().__init__()
+        self.settings = settings.copy()
+        self.image = image
+        self.target_resolution = resolution
+        self.output_path = output_path
+        self.timeline = timeline
+        self.workers = workers
+        self.cache = cache
+        self.is_running = True
+
+    def run(self):
+        try:
+            completed, stats = render_cached(
+                self.timeline, self.settings, self.image, self.target_resolution,
+                self.output_path, self.cache, workers=self.workers,
+                progress_callback=self.progress_update.emit,
+                is_cancelled=lambda: not self.is_running
+            )
+            if completed:
+                self.stats_ready.emit(stats)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+        finally:
+            self.finished.emit()
+
+    def stop(self):
+        """Arrête l'export en cours."""
+        self.is_running = False
+
+
+class ScenePreview(QObject):
+    """
+    Aperçu léger animé directement dans la scène : une copie de l'image en
+    pleine luminosité, découpée par la forme du projecteur, est déplacée
+    au-dessus du voile d'assombrissement le long de la trajectoire. Aucune
+    frame n'est calculée ; l'aperçu NumPy (AnimationWorker) reste le mode de
+    référence, identique à l'export.
+
+    Expose les signaux et méthodes d'AnimationWorker utilisés par la fenêtre.
+    """
+    stats_ready = pyqtSignal(dict)
+    finished = pyqtSignal()
+
+    def __init__(self, scene, pixmap, shape, timeline, z_value=6, pixmap_transform=None, camera=None):
         """
-        Calcule la distance euclidienne entre deux points.
-        
         Args:
-            p1, p2: Dictionnaires avec les clés 'x' et 'y'
-            
-        Returns:
-            Distance entre les deux points
+            scene: Scène où se trouve l'image
+            pixmap: Image source en pleine luminosité
+            shape: Forme du projecteur ("Cercle" ou "Carré")
+            timeline: Trajectoire précalculée (AnimationTimeline)
+            z_value: Profondeur du projecteur (au-dessus du voile, sous le tracé)
+            pixmap_transform: Mise à l'échelle du pixmap vers les pixels source (image réduite)
+            camera: Fenêtres du cadrage qui suit le projecteur (voir camera_windows),
+                affichées en pointillés ; None sans suivi caméra
         """
-        return math.sqrt((p2["x"] - p1["x"])**2 + (p2["y"] - p1["y"])**2)
+        super().__init__()
+        self.scene = scene
+        self.timeline = timeline
+        self.fps = timeline.fps
+        # La forme découpe son enfant : seule la zone éclairée de l'image est visible
+        self.clip_item = QGraphicsEllipseItem() if shape == "Cercle" else QGraphicsRectItem()
+        self.clip_item.setPen(QPen(Qt.PenStyle.NoPen))
+        self.clip_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemClipsChildrenToShape)
+        self.clip_item.setZValue(z_value)
+        self.light_item = QGraphicsPixmapItem(pixmap, self.clip_item)
+        if pixmap_transform is not None:
+            self.light_item.setTransform(pixmap_transform)
+        self.camera = camera
+        self.camera_item = None
+        if camera is not None:
+            self.camera_item = QGraphicsRectItem()
+            self.camera_item.setPen(QPen(QColor("white"), 0, Qt.PenStyle.DashLine))
+            self.camera_item.setZValue(z_value)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(max(1, int(1000 / self.fps)))
+        self.timer.timeout.connect(self.advance)
+        self.clock = QElapsedTimer()
+        self.last_index = -1
+        self.presented = 0
+        self.dropped = 0
+        self.update_times = []
+
+    def start(self):
+        """Place le projecteur sur la première frame et lance la lecture."""
+        self.scene.addItem(self.clip_item)
+        if self.camera_item:
+            self.scene.addItem(self.camera_item)
+        self.clock.start()
+        self.advance()
+        self.timer.start()
+
+    def advance(self):
+        """Affiche la frame dont l'échéance est atteinte, en sautant les frames dépassées."""
+        index = int(self.clock.nsecsElapsed() * 1e-9 * self.fps)
+        if index >= len(self.timeline):
+            self.stop()
+            return
+        if index == self.last_index:
+            return
+        update_start = self.clock.nsecsElapsed()
+        x, y, size = self.timeline.frame(index)
+        self.clip_item.setRect(QRectF(x - size / 2, y - size / 2, size, size))
+        if self.camera_item:
+            x0s, y0s, window_w, window_h = self.camera
+            self.camera_item.setRect(QRectF(float(x0s[index]), float(y0s[index]), window_w, window_h))
+        self.update_times.append((self.clock.nsecsElapsed() - update_start) * 1e-6)
+        self.dropped += max(0, index - self.last_index - 1)
+        self.presented += 1
+        self.last_index = index
+
+    def isRunning(self):
+        return self.timer.isActive()
 
     def stop(self):
-        """Arrête le rendu de l'animation en cours."""
-        self.is_running = False
+        """Arrête la lecture, retire le projecteur de la scène et publie les mesures."""
+        if self.clip_item.scene() is None:
+            return
+        self.timer.stop()
+        self.scene.removeItem(self.clip_item)
+        if self.camera_item:
+            self.scene.removeItem(self.camera_item)
+        self.stats_ready.emit(self.stats())
+        self.finished.emit()
+
+    def stats(self):
+        """
+        Mesures de la lecture, au format de PreviewPacer.stats ; le temps de
+        rendu est celui de la mise à jour de la scène.
+        """
+        elapsed = self.clock.nsecsElapsed() * 1e-9
+        times = self.update_times or [0.0]
+        p50, p95, p99 = np.percentile(times, [50, 95, 99])
+        return {
+            "target_fps": self.fps,
+            "achieved_fps": self.presented / elapsed if elapsed > 0 else 0.0,
+            "presented": self.presented,
+            "dropped": self.dropped,
+            "late": 0,
+            "elapsed_s": elapsed,
+            "render_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+        }
 
 class PreferencesDialog(QDialog):
     def __init__(self, settings, parent=None):
@@ -529,13 +682,25 @@ class MainWindow(QMainWindow):
         
         self.settings = DEFAULT_SETTINGS.copy()
         self.image_path, self.cv_image = None, None
-        self.path_points = []
+        self.image_hash = None  # Empreinte du fichier image, calculée au premier enregistrement binaire
+        self.image_item, self.source_pixmap = None, None  # Élément affichant l'image et son pixmap d'origine
+        self.image_transform = QTransform()  # Mise à l'échelle du pixmap d'origine vers les pixels source
+        self.path_points = PathModel()  # Partagé avec l'éditeur de chemin lorsqu'il existe
         self.graphic_items = {'points': [], 'lines': [], 'shapes': []}
         self.preview_worker, self.export_worker = None, None
+        self.export_resolutions = []  # Résolutions de l'export en cours, libérées à sa fin
+        self.render_cache = RenderCache()  # Segments des exports précédents, réutilisés à l'export suivant
         self.dragged_point = None
+        self.dragged_index = None      # Index du point en cours de déplacement (Maj + glisser)
+        self.pending_drag_pos = None   # Dernière position reçue, appliquée au prochain rafraîchissement
+        self.drag_timer = QTimer(self) # Regroupe les mouvements de souris : une mise à jour par image affichée
+        self.drag_timer.setSingleShot(True)
+        self.drag_timer.timeout.connect(self.apply_drag)
         self.overlay_item = None
         self.hovered_point_index = None
+        self.point_grid = PointGrid()  # Index spatial de path_points pour la sélection et le survol
         self.path_editor = None
+        self.timeline = None  # Trajectoire précalculée partagée par l'aperçu et l'export
         self.init_ui()
     
     def init_ui(self):
@@ -552,12 +717,14 @@ class MainWindow(QMainWindow):
         self.btn_load = QPushButton("Charger une image")
         self.btn_save_path = QPushButton("Sauvegarder le tracé")
         self.btn_load_path = QPushButton("Charger un tracé")
+        self.btn_import_path = QPushButton("Importer un tracé")
         self.btn_prefs = QPushButton("Préférences")
         
         # Ajout des boutons à la barre supérieure
         top_bar.addWidget(self.btn_load)
         top_bar.addWidget(self.btn_save_path)
         top_bar.addWidget(self.btn_load_path)
+        top_bar.addWidget(self.btn_import_path)
         top_bar.addWidget(self.btn_prefs)
         top_bar.addStretch()
         
@@ -640,12 +807,55 @@ class MainWindow(QMainWindow):
         profile_layout.addWidget(self.export_profile_combo)
         export_layout.addLayout(profile_layout)
         
+        # Nombre de processus de rendu (1 = export séquentiel)
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Processus:"))
+        self.export_workers_spin = QSpinBox()
+        self.export_workers_spin.setRange(1, os.cpu_count() or 1)
+        self.export_workers_spin.setValue(1)
+        workers_layout.addWidget(self.export_workers_spin)
+        export_layout.addLayout(workers_layout)
+        
+        # Réutilisation des segments inchangés depuis l'export précédent (assemblage par ffmpeg) ;
+        # décochée par défaut : l'export en un seul fichier reste la voie normale
+        self.ffmpeg_available = shutil.which("ffmpeg") is not None
+        self.export_cache_check = QCheckBox("Réutiliser les segments déjà rendus")
+        self.export_cache_check.setToolTip("Après une modification, seuls les segments de la vidéo qui changent sont rendus (nécessite ffmpeg)")
+        self.export_cache_check.setChecked(False)
+        self.export_cache_check.setEnabled(self.ffmpeg_available)
+        export_layout.addWidget(self.export_cache_check)
+        
+        # Cadrage qui suit le projecteur (fenêtre de la taille du profil)
+        camera_layout = QHBoxLayout()
+        self.camera_follow_check = QCheckBox("Suivre")
+        self.camera_follow_check.setToolTip("La vidéo cadre la zone autour du projecteur au lieu de l'image entière")
+        self.camera_zoom_spin = QDoubleSpinBox()
+        self.camera_zoom_spin.setRange(0.25, 8.0)
+        self.camera_zoom_spin.setSingleStep(0.25)
+        self.camera_zoom_spin.setSuffix(" ×")
+        self.camera_zoom_spin.setToolTip("Zoom du cadrage (pixels vidéo par pixel de l'image)")
+        self.camera_smoothing_spin = QDoubleSpinBox()
+        self.camera_smoothing_spin.setRange(0.0, 5.0)
+        self.camera_smoothing_spin.setSingleStep(0.1)
+        self.camera_smoothing_spin.setSuffix(" s")
+        self.camera_smoothing_spin.setToolTip("Lissage du mouvement du cadrage")
+        camera_layout.addWidget(QLabel("Caméra:"))
+        camera_layout.addWidget(self.camera_follow_check)
+        camera_layout.addWidget(self.camera_zoom_spin)
+        camera_layout.addWidget(self.camera_smoothing_spin)
+        export_layout.addLayout(camera_layout)
+        
         # Boutons d'action
         action_layout = QVBoxLayout()
         self.btn_preview = QPushButton("Prévisualiser")
+        self.preview_mode_combo = QComboBox()
+        self.preview_mode_combo.addItems([PREVIEW_SCENE, PREVIEW_REFERENCE])
+        self.preview_mode_combo.setToolTip("Scène : projecteur animé dans la vue, sans calcul de frames. "
+                                           "Référence : frames calculées comme à l'export.")
         self.btn_export = QPushButton("Exporter")
         self.btn_reset = QPushButton("Réinitialiser")
         action_layout.addWidget(self.btn_preview)
+        action_layout.addWidget(self.preview_mode_combo)
         action_layout.addWidget(self.btn_export)
         action_layout.addWidget(self.btn_reset)
         
@@ -688,6 +898,7 @@ class MainWindow(QMainWindow):
         self.btn_export.clicked.connect(self.export_video)
         self.btn_save_path.clicked.connect(self.save_path)
         self.btn_load_path.clicked.connect(self.load_path)
+        self.btn_import_path.clicked.connect(self.import_dense_path)
         self.btn_prefs.clicked.connect(self.open_preferences)
         self.btn_preview.clicked.connect(self.toggle_preview_animation)
         self.btn_reset.clicked.connect(self.reset_path)
@@ -701,6 +912,10 @@ class MainWindow(QMainWindow):
         
         # Connexion du slider de lissage
         self.smoothing_slider.valueChanged.connect(self.update_smoothing)
+        self.camera_follow_check.toggled.connect(lambda v: self.update_setting("camera_follow", v))
+        self.camera_follow_check.toggled.connect(self.update_export_controls)
+        self.camera_zoom_spin.valueChanged.connect(lambda v: self.update_setting("camera_zoom", v))
+        self.camera_smoothing_spin.valueChanged.connect(lambda v: self.update_setting("camera_smoothing", v))
 
     def init_controls(self):
         self.size_slider.setRange(20, 500)
@@ -712,6 +927,10 @@ class MainWindow(QMainWindow):
         self.update_all_labels()
         self.fps_combo.setCurrentText(str(self.settings['fps']))
         self.shape_combo.setCurrentText(self.settings.get('shape', 'Cercle'))
+        self.smoothing_slider.setValue(self.settings.get('smoothing', DEFAULT_SETTINGS['smoothing']))
+        self.camera_follow_check.setChecked(self.settings['camera_follow'])
+        self.camera_zoom_spin.setValue(self.settings['camera_zoom'])
+        self.camera_smoothing_spin.setValue(self.settings['camera_smoothing'])
 
     def update_setting(self, key, value):
         self.settings[key] = value
@@ -734,21 +953,44 @@ class MainWindow(QMainWindow):
     def load_image(self):
         path, _ = QFileDialog.getOpenFileName(self, "Ouvrir une image", "", "Images (*.png *.jpg *.bmp)")
         if path:
-            self.image_path, self.cv_image = path, cv2.imread(path)
-            pixmap = QPixmap(self.image_path)
+            # Les très grandes images sont projetées en mémoire par tuiles et
+            # affichées à résolution réduite ; les autres sont décodées une seule fois
+            size = read_image_size(path)
+            if size and size[0] * size[1] >= TILED_IMAGE_MIN_PIXELS:
+                image = open_tiled_image(path)
+                height, width = image.shape[:2]
+                scale = min(1.0, DISPLAY_MAX_SIDE / max(width, height))
+                display = image.resize((max(1, round(width * scale)), max(1, round(height * scale))))
+            else:
+                image = cv2.imread(path)
+                if image is None:
+                    QMessageBox.critical(self, "Erreur", f"Impossible de lire l'image: {path}")
+                    return
+                height, width = image.shape[:2]
+                display = image
+            self.image_path, self.cv_image = path, image
+            self.image_hash = None
+            q_image = QImage(display.data, display.shape[1], display.shape[0], display.strides[0],
+                             QImage.Format.Format_BGR888)
+            pixmap = QPixmap.fromImage(q_image)
+            self.source_pixmap = pixmap
+            # Le pixmap couvre l'image entière : la scène reste en pixels source
+            self.image_transform = QTransform.fromScale(width / display.shape[1], height / display.shape[0])
             self.scene.clear()
-            self.scene.addPixmap(pixmap)
-            height = self.cv_image.shape[0]
+            self.image_item = self.scene.addPixmap(pixmap)
+            self.image_item.setTransform(self.image_transform)
             self.size_slider.setMaximum(height)
             self.settings['size'] = int(height / 4)
             self.size_slider.setValue(self.settings['size'])
-            self.overlay_item = QGraphicsRectItem(QRectF(pixmap.rect()))
+            self.overlay_item = QGraphicsRectItem(QRectF(0, 0, width, height))
             self.overlay_item.setZValue(5)
             self.scene.addItem(self.overlay_item)
             self.view.fitInView(self.scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
             
             # Initialisation de l'éditeur de chemin
+            self.point_grid = PointGrid(max(32.0, max(width, height) / 128))
             self.path_editor = PathEditor(self.scene)
+            self.path_editor.smoothing = self.settings['smoothing'] / 100.0
             self.reset_path()
             self.update_brightness_overlay()
 
@@ -759,28 +1001,83 @@ class MainWindow(QMainWindow):
 
     def save_path(self):
         if not self.path_points: return
-        path, _ = QFileDialog.getSaveFileName(self, "Sauvegarder le projet", "", "Projet Vidéo (*.json)")
-        if path:
-            with open(path, 'w') as f: json.dump({"settings": self.settings, "path_points": self.path_points}, f, indent=4)
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Sauvegarder le projet", "", f"{PROJECT_JSON_FILTER};;{PROJECT_BINARY_FILTER}"
+        )
+        if not path:
+            return
+        if selected_filter == PROJECT_BINARY_FILTER and not is_binary_project(path):
+            path += BINARY_PROJECT_EXTENSION
+        try:
+            if is_binary_project(path):
+                # Le format binaire garde l'empreinte de l'image et la table de longueur d'arc
+                arc_table = self.path_editor.get_arc_length_table() if self.path_editor else None
+                save_project(path, self.settings, self.path_points, self.current_image_hash(), arc_table)
+            else:
+                save_project(path, self.settings, self.path_points)
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'enregistrer le projet :\n{e}")
+
+    def current_image_hash(self):
+        """Empreinte du fichier de l'image chargée, calculée une seule fois par image."""
+        if self.image_path and self.image_hash is None:
+            self.image_hash = image_file_hash(self.image_path)
+        return self.image_hash
 
     def load_path(self):
         if self.cv_image is None: return
-        path, _ = QFileDialog.getOpenFileName(self, "Charger un projet", "", "Projet Vidéo (*.json)")
+        path, _ = QFileDialog.getOpenFileName(self, "Charger un projet", "", "Projets (*.json *.npz)")
         if path:
             try:
-                with open(path, 'r') as f: project_data = json.load(f)
-                self.settings = project_data.get("settings", DEFAULT_SETTINGS.copy())
-                self.path_points = project_data.get("path_points", [])
+                with open_project(path) as project:
+                    self.settings, self.path_points = project.settings, project.path_points
+                    if project.image_hash and project.image_hash != self.current_image_hash():
+                        QMessageBox.warning(self, "Image différente",
+                                            "Ce projet a été enregistré avec une autre image que celle chargée.")
                 self.init_controls()
+                if self.path_editor:
+                    # L'éditeur porte le tracé lissé suivi par l'animation
+                    self.path_editor.set_points(self.path_points)
+                    self.path_points = self.path_editor.get_points()
                 self.sync_scene_from_data()
             except Exception as e:
                 print(f"Erreur lors du chargement du fichier projet : {e}")
 
+    def import_dense_path(self):
+        """Importe une polyligne dense (CSV, GPX, SVG), placée dans l'image et simplifiée."""
+        if self.cv_image is None: return
+        path, _ = QFileDialog.getOpenFileName(self, "Importer un tracé", "", "Tracés (*.csv *.gpx *.svg)")
+        if not path:
+            return
+        tolerance, ok = QInputDialog.getDouble(
+            self, "Importer un tracé", "Écart maximal de simplification (pixels) :", DEFAULT_TOLERANCE, 0.0, 100.0, 1
+        )
+        if not ok:
+            return
+        height, width = self.cv_image.shape[:2]
+        try:
+            path_points, report = import_path(path, (width, height), tolerance, self.settings['size'])
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'importer le tracé :\n{e}")
+            return
+        if self.path_editor:
+            self.path_editor.set_points(path_points)
+            path_points = self.path_editor.get_points()
+        self.path_points = path_points
+        self.sync_scene_from_data()
+        reduction = 100.0 * (1 - report['points'] / report['source_points'])
+        self.statusBar().showMessage(
+            f"Tracé importé : {report['source_points']} → {report['points']} points "
+            f"(-{reduction:.1f} %), écart max {report['max_deviation']:.2f} px"
+        )
+
     def update_smoothing(self, value):
         """Met à jour le niveau de lissage du chemin"""
         self.smoothing_label.setText(f"{value}%")
+        self.settings['smoothing'] = value
         if self.path_editor:
-            self.path_editor.set_smoothing(value / 100.0)
+            self.path_editor.set_smoothing(value)
+            self.calculate_and_display_duration()
     
     def view_mouse_press(self, event):
         if not self.path_editor:
@@ -792,10 +1089,12 @@ class MainWindow(QMainWindow):
         shift_pressed = (QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier) == Qt.KeyboardModifier.ShiftModifier
         
         if shift_pressed:
-            # Mode édition - on laisse gérer le déplacement des points par Qt
-            item = self.scene.itemAt(scene_pos, self.view.transform())
-            if isinstance(item, ControlPoint):
-                self.dragged_point = item
+            # Mode édition - déplacement du point sous le curseur
+            index = self.point_at(event.pos())
+            if index is not None:
+                control_points = self.graphic_items['points']
+                self.dragged_point = control_points[index] if index < len(control_points) else None
+                self.start_drag(index)
                 return
         else:
             # Mode ajout de point
@@ -803,33 +1102,86 @@ class MainWindow(QMainWindow):
                 return
                 
             # Ajout d'un point avec l'éditeur de chemin
-            self.path_editor.add_point(scene_pos, self.settings['size'])
-            self.sync_path_from_editor()
+            index = self.path_editor.add_point(scene_pos, self.settings['size'])
+            self.point_added(index)
 
     def view_mouse_move(self, event):
-        if self.dragged_point:
-            new_pos = self.view.mapToScene(event.pos())
-            index = self.dragged_point.index
-            self.dragged_point.setPos(new_pos)
-            if index < len(self.path_points):
-                self.path_points[index]['x'], self.path_points[index]['y'] = new_pos.x(), new_pos.y()
-                self.redraw_dependent_graphics()
-                self.calculate_and_display_duration()
+        if self.dragged_index is not None:
+            # Seule la dernière position compte : elle est appliquée au prochain rafraîchissement
+            self.pending_drag_pos = self.view.mapToScene(event.pos())
+            if not self.drag_timer.isActive():
+                self.drag_timer.start()
             return
             
         shift_pressed = (QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier) == Qt.KeyboardModifier.ShiftModifier
         new_hover_index = None
         if shift_pressed:
-            scene_pos = self.view.mapToScene(event.pos())
-            item = self.scene.itemAt(scene_pos, self.view.transform())
-            if isinstance(item, ControlPoint):
-                new_hover_index = item.index
+            new_hover_index = self.point_at(event.pos())
         if new_hover_index != self.hovered_point_index:
             if self.hovered_point_index is not None: self.highlight_shape(self.hovered_point_index, False)
             if new_hover_index is not None: self.highlight_shape(new_hover_index, True)
             self.hovered_point_index = new_hover_index
 
-    def view_mouse_release(self, event): self.dragged_point = None
+    def view_mouse_release(self, event):
+        if self.dragged_index is not None:
+            self.drag_timer.stop()
+            self.apply_drag()
+            self.dragged_index = None
+            self.calculate_and_display_duration()
+        self.dragged_point = None
+
+    def point_at(self, view_pos):
+        """
+        Retourne le point de contrôle sous une position de la vue, par l'index
+        spatial plutôt que par les éléments de la scène.
+        
+        Args:
+            view_pos: Position QPoint dans la vue
+            
+        Returns:
+            int: Index du point le plus proche dans la tolérance, ou None
+        """
+        scene_pos = self.view.mapToScene(view_pos)
+        scale = self.view.transform().m11() or 1.0
+        return self.point_grid.nearest(scene_pos.x(), scene_pos.y(), HIT_TOLERANCE_PX / scale)
+
+    def start_drag(self, index):
+        """Commence le déplacement d'un point, à la cadence d'affichage de l'écran."""
+        self.dragged_index = index
+        self.pending_drag_pos = None
+        screen = self.view.screen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        self.drag_timer.setInterval(max(1, int(1000 / (refresh_rate or 60))))
+
+    def apply_drag(self):
+        """Applique la dernière position du point déplacé à ses seuls éléments dépendants."""
+        if self.dragged_index is None or self.pending_drag_pos is None:
+            return
+        index, pos = self.dragged_index, self.pending_drag_pos
+        self.pending_drag_pos = None
+        if self.dragged_point:
+            self.dragged_point.setPos(pos)
+        if self.path_editor and index < len(self.path_editor.points):
+            # Le modèle est partagé : path_points suit le déplacement
+            self.path_editor.move_point(index, pos)
+        elif index < len(self.path_points):
+            self.path_points.move(index, pos.x(), pos.y())
+        if index < len(self.path_points):
+            self.point_grid.move(index, pos.x(), pos.y())
+            self.update_point_graphics(index)
+        self.timeline = None  # La durée est recalculée au relâchement
+
+    def update_point_graphics(self, index):
+        """Met à jour la forme d'un point et les deux segments qui le relient à ses voisins."""
+        xy, sizes = self.path_points.xy, self.path_points.sizes
+        if index < len(self.graphic_items['shapes']):
+            x, y = xy[index]
+            size = sizes[index]
+            self.graphic_items['shapes'][index].setRect(x - size/2, y - size/2, size, size)
+        lines = self.graphic_items['lines']
+        for segment in (index - 1, index):
+            if 0 <= segment < len(lines):
+                lines[segment].setLine(*xy[segment], *xy[segment + 1])
 
     def highlight_shape(self, index, highlight_on):
         if index < len(self.graphic_items['shapes']):
@@ -845,8 +1197,21 @@ class MainWindow(QMainWindow):
         if not self.path_editor:
             return
             
-        self.path_points = self.path_editor.get_points().copy()
+        self.path_points = self.path_editor.get_points()
         self.redraw_dependent_graphics()
+        self.point_grid.rebuild(self.path_points)
+        self.calculate_and_display_duration()
+        self.update_button_states()
+
+    def point_added(self, index):
+        """Met à jour l'affichage et les index après l'ajout d'un point en fin de tracé."""
+        self.path_points = self.path_editor.get_points()
+        if index != len(self.graphic_items['shapes']):
+            self.sync_path_from_editor()
+            return
+        x, y = self.path_points.xy[index]
+        self.add_shape_item(x, y, self.path_points.sizes[index])
+        self.point_grid.insert(index, x, y)
         self.calculate_and_display_duration()
         self.update_button_states()
     
@@ -870,14 +1235,15 @@ class MainWindow(QMainWindow):
                 self.graphic_items['points'].append(point_item)
             self.redraw_dependent_graphics()
             
+        self.point_grid.rebuild(self.path_points)
         self.calculate_and_display_duration()
         self.update_button_states()
 
     def handle_point_move(self, index, pos):
-        if not self.dragged_point: return
-        self.path_points[index]['x'], self.path_points[index]['y'] = pos.x(), pos.y()
-        self.redraw_dependent_graphics()
-        self.calculate_and_display_duration()
+        if not self.dragged_point or self.dragged_index is not None: return
+        self.path_points.move(index, pos.x(), pos.y())
+        self.point_grid.move(index, pos.x(), pos.y())
+        self.update_point_graphics(index)
 
     def redraw_dependent_graphics(self):
         # Nettoyage des anciens éléments graphiques
@@ -894,33 +1260,39 @@ class MainWindow(QMainWindow):
         # Sinon, on utilise le rendu par défaut
         elif len(self.path_points) >= 2:
             pen_line = QPen(QColor(self.settings['trace_color']), 2, Qt.PenStyle.DashLine)
-            for i in range(len(self.path_points) - 1):
-                p1, p2 = self.path_points[i], self.path_points[i+1]
-                line = self.scene.addLine(p1["x"], p1["y"], p2["x"], p2["y"], pen_line)
+            xy = self.path_points.xy.tolist()
+            for p1, p2 in zip(xy[:-1], xy[1:]):
+                line = self.scene.addLine(*p1, *p2, pen_line)
                 self.graphic_items['lines'].append(line)
         
         # Dessin des formes (cercles ou carrés) pour chaque point
+        for (x, y), size in zip(self.path_points.xy.tolist(), self.path_points.sizes.tolist()):
+            self.add_shape_item(x, y, size)
+
+    def add_shape_item(self, x, y, size):
+        """Ajoute la forme (cercle ou carré) du projecteur d'un point."""
         pen_shape = QPen(QColor(self.settings['shape_color']), 3, Qt.PenStyle.SolidLine)
-        for point_data in self.path_points:
-            size, x, y = point_data["size"], point_data["x"], point_data["y"]
-            if self.settings.get("shape", "Cercle") == "Cercle":
-                shape = self.scene.addEllipse(x - size/2, y - size/2, size, size, pen_shape)
-            else:
-                shape = self.scene.addRect(x - size/2, y - size/2, size, size, pen_shape)
-            if shape:
-                shape.setZValue(10)
-                self.graphic_items['shapes'].append(shape)
+        if self.settings.get("shape", "Cercle") == "Cercle":
+            shape = self.scene.addEllipse(x - size/2, y - size/2, size, size, pen_shape)
+        else:
+            shape = self.scene.addRect(x - size/2, y - size/2, size, size, pen_shape)
+        if shape:
+            shape.setZValue(10)
+            self.graphic_items['shapes'].append(shape)
 
     def calculate_and_display_duration(self):
+        # La durée ne dépend que de la longueur totale : la trajectoire image
+        # par image n'est construite qu'à la demande (get_timeline)
         fps = self.settings['fps']
-        speed = self.settings['speed']
-        if len(self.path_points) < 2 or speed <= 0 or fps <= 0:
+        self.timeline = None
+        if self.path_editor:
+            total_distance = self.path_editor.total_distance()
+        else:
+            total_distance = ArcLengthTable.from_polyline(self.path_points).total_distance
+        total_frames = AnimationTimeline.count_frames(self.path_points, total_distance, self.settings['speed'], fps)
+        if total_frames == 0:
             self.duration_label.setText("Durée: 00:00:00"); return
         
-        total_distance = self.calculate_total_distance()
-        total_seconds = total_distance / speed
-        
-        total_frames = int(total_seconds * fps)
         total_seconds_from_frames = total_frames // fps
         remaining_frames = total_frames % fps
         minutes = total_seconds_from_frames // 60
@@ -928,13 +1300,17 @@ class MainWindow(QMainWindow):
         
         self.duration_label.setText(f"Durée: {minutes:02d}:{seconds:02d}:{remaining_frames:02d}")
 
-    def calculate_total_distance(self):
-        return sum(math.sqrt((self.path_points[i+1]["x"] - self.path_points[i]["x"])**2 + (self.path_points[i+1]["y"] - self.path_points[i]["y"])**2) for i in range(len(self.path_points) - 1))
+    def get_timeline(self):
+        """Retourne la trajectoire précalculée, en la construisant si nécessaire"""
+        if self.timeline is None:
+            arc_table = self.path_editor.get_arc_length_table() if self.path_editor else None
+            self.timeline = AnimationTimeline(self.path_points, self.settings['speed'], self.settings['fps'], arc_table)
+        return self.timeline
 
     def update_button_states(self, is_previewing=False):
         has_image = self.cv_image is not None
         has_path = len(self.path_points) >= 2
-        for widget in [self.btn_load, self.btn_export, self.btn_reset, self.size_slider, self.speed_slider, self.shape_combo, self.bg_slider, self.btn_save_path, self.btn_load_path, self.btn_prefs, self.export_profile_combo, self.fps_combo]:
+        for widget in [self.btn_load, self.btn_export, self.btn_reset, self.size_slider, self.speed_slider, self.shape_combo, self.bg_slider, self.btn_save_path, self.btn_load_path, self.btn_import_path, self.btn_prefs, self.export_profile_combo, self.export_workers_spin, self.export_cache_check, self.preview_mode_combo, self.fps_combo, self.camera_follow_check, self.camera_zoom_spin, self.camera_smoothing_spin]:
             widget.setEnabled(not is_previewing)
         if not is_previewing:
             self.btn_export.setEnabled(has_image and has_path)
@@ -942,12 +1318,23 @@ class MainWindow(QMainWindow):
             self.btn_reset.setEnabled(has_image and len(self.path_points) > 0)
             self.btn_save_path.setEnabled(has_image and len(self.path_points) > 0)
             self.btn_load_path.setEnabled(has_image)
+            self.btn_import_path.setEnabled(has_image)
+            self.update_export_controls()
         else: self.btn_preview.setEnabled(True)
+
+    def update_export_controls(self):
+        """Désactive les options sans effet sur l'export choisi : le cadrage qui suit le
+        projecteur se rend en une passe, sans processus ni cache de segments"""
+        single_pass = self.settings['camera_follow']
+        self.export_workers_spin.setEnabled(not single_pass)
+        self.export_cache_check.setEnabled(not single_pass and self.ffmpeg_available)
     
     def reset_path(self):
         if self.path_editor:
             self.path_editor.clear()
-        self.path_points = []
+            self.path_points = self.path_editor.get_points()
+        else:
+            self.path_points = PathModel()
         self.sync_scene_from_data()
 
     def toggle_preview_animation(self):
@@ -956,19 +1343,56 @@ class MainWindow(QMainWindow):
             if not (self.cv_image is not None and len(self.path_points) >= 2): return
             self.btn_preview.setText("Arrêter")
             self.update_button_states(is_previewing=True)
-            self.preview_worker = AnimationWorker(self.path_points, self.settings, self.cv_image, None)
+            if self.preview_mode_combo.currentText() == PREVIEW_SCENE:
+                self.preview_worker = ScenePreview(
+                    self.scene, self.source_pixmap, self.settings['shape'], self.get_timeline(),
+                    pixmap_transform=self.image_transform, camera=self.camera_preview_windows()
+                )
+                self.preview_worker.stats_ready.connect(self.show_preview_stats)
+                self.preview_worker.finished.connect(self.animation_finished)
+                self.preview_worker.start()
+                return
+            resolution = self.preview_resolution()
+            height, width = self.cv_image.shape[:2]
+            # Les frames réduites sont agrandies par l'élément pour couvrir l'image d'origine
+            self.image_item.setTransform(QTransform.fromScale(width / resolution[0], height / resolution[1]))
+            self.preview_worker = AnimationWorker(self.path_points.copy(), self.settings, self.cv_image, resolution, timeline=self.get_timeline())
             self.preview_worker.frame_ready_for_preview.connect(self.update_preview_frame)
+            self.preview_worker.stats_ready.connect(self.show_preview_stats)
             self.preview_worker.finished.connect(self.animation_finished)
             self.preview_worker.start()
 
+    def camera_preview_windows(self):
+        """
+        Fenêtres du cadrage pour le profil d'export choisi, si le suivi caméra est actif.
+
+        Returns:
+            tuple: Résultat de camera_windows, ou None
+        """
+        resolution = PROFILES.get(self.export_profile_combo.currentText())
+        if not self.settings['camera_follow'] or resolution is None:
+            return None
+        height, width = self.cv_image.shape[:2]
+        return camera_windows(self.get_timeline(), (width, height), resolution,
+                              self.settings['camera_zoom'], self.settings['camera_smoothing'])
+
+    def preview_resolution(self):
+        """
+        Taille de l'aperçu : celle de l'image telle qu'affichée dans la vue,
+        sans dépasser la taille source.
+
+        Returns:
+            tuple: (largeur, hauteur) en pixels
+        """
+        height, width = self.cv_image.shape[:2]
+        scale = min(1.0, self.view.transform().m11() * self.view.devicePixelRatioF())
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
     def update_preview_frame(self, frame_np):
-        rgb_image = cv2.cvtColor(frame_np, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        q_image = QImage(rgb_image.data, w, h, ch * w, QImage.Format.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_image)
-        current_pixmap_item = next((item for item in self.scene.items() if isinstance(item, QGraphicsPixmapItem)), None)
-        if current_pixmap_item: current_pixmap_item.setPixmap(pixmap)
-        else: self.scene.addPixmap(pixmap)
+        # La frame BGR est lue telle quelle par Qt, sans conversion de couleurs
+        h, w = frame_np.shape[:2]
+        q_image = QImage(frame_np.data, w, h, frame_np.strides[0], QImage.Format.Format_BGR888)
+        self.image_item.setPixmap(QPixmap.fromImage(q_image))
 
     def export_video(self):
         try:
@@ -1007,13 +1431,8 @@ class MainWindow(QMainWindow):
                 output_path += '.mp4'
                 
             # Créer et configurer le worker d'exportation
-            self.export_worker = AnimationWorker(
-                self.path_points, 
-                self.settings, 
-                self.cv_image, 
-                resolution, 
-                output_path
-            )
+            self.export_resolutions = [resolution]
+            self.export_worker = self.create_export_worker(resolution, output_path)
             
             # Configurer la boîte de dialogue de progression
             self.progress_dialog = QProgressDialog("Rendu de la vidéo...", "Annuler", 0, 100, self)
@@ -1034,6 +1453,76 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Une erreur est survenue lors de l'exportation :\n{str(e)}")
     
+    def create_export_worker(self, resolution, output_path):
+        """
+        Choisit le worker d'exportation selon les options d'export.
+
+        Args:
+            resolution: Résolution du profil sélectionné
+            output_path: Chemin de la vidéo
+
+        Returns:
+            QThread: Le worker prêt à démarrer
+        """
+        workers = self.export_workers_spin.value()
+        if self.export_cache_check.isChecked() and not self.settings['camera_follow']:
+            worker = CachedExportWorker(
+                self.settings,
+                self.cv_image,
+                resolution,
+                output_path,
+                self.get_timeline(),
+                workers,
+                self.render_cache
+            )
+            worker.stats_ready.connect(self.show_cache_stats)
+        elif workers > 1 and not self.settings['camera_follow']:
+            worker = ParallelExportWorker(
+                self.settings,
+                self.cv_image,
+                resolution,
+                output_path,
+                self.get_timeline(),
+                workers
+            )
+        else:
+            worker = AnimationWorker(
+                self.path_points.copy(),
+                self.settings, 
+                self.cv_image, 
+                resolution, 
+                output_path,
+                timeline=self.get_timeline()
+            )
+            worker.stats_ready.connect(self.show_export_stats)
+        return worker
+
+    def show_export_stats(self, stats):
+        """Affiche dans la barre d'état le temps par frame de chaque étage du pipeline d'export"""
+        stages = ", ".join(
+            f"{name} {stage['ms_per_frame']:.1f} ms/frame" for name, stage in stats["stages"].items()
+        )
+        queues = ", ".join(
+            f"file {q['mean_depth']:.1f}/{q['capacity']}" for q in stats["queues"]
+        )
+        self.statusBar().showMessage(f"Export : {stages} ({queues})")
+
+    def show_cache_stats(self, stats):
+        """Affiche dans la barre d'état les segments repris du cache de rendu"""
+        self.statusBar().showMessage(
+            f"Export : {stats['reused']}/{stats['chunks']} segment(s) repris du cache, "
+            f"{stats['rendered']} rendu(s)"
+        )
+
+    def show_preview_stats(self, stats):
+        """Affiche dans la barre d'état la cadence obtenue par l'aperçu"""
+        render_ms = stats["render_ms"]
+        self.statusBar().showMessage(
+            f"Aperçu : {stats['achieved_fps']:.1f}/{stats['target_fps']} fps, "
+            f"{stats['dropped']} frame(s) sautée(s), rendu {render_ms['p50']:.1f} ms "
+            f"(p95 {render_ms['p95']:.1f}, p99 {render_ms['p99']:.1f})"
+        )
+
     def handle_export_error(self, error_message):
         """Gère les erreurs d'exportation"""
         if self.progress_dialog:
@@ -1043,17 +1532,24 @@ class MainWindow(QMainWindow):
     def animation_finished(self):
         sender = self.sender()
         if sender == self.preview_worker: self.preview_worker = None
-        elif sender == self.export_worker: self.export_worker = None
-        if self.image_path:
-            pixmap = QPixmap(self.image_path)
-            current_pixmap_item = next((item for item in self.scene.items() if isinstance(item, QGraphicsPixmapItem)), None)
-            if current_pixmap_item: current_pixmap_item.setPixmap(pixmap)
-            else: self.scene.addPixmap(pixmap)
+        elif sender == self.export_worker:
+            self.export_worker = None
+            self.release_export_images()
+        if self.image_item:
+            self.image_item.setPixmap(self.source_pixmap)
+            self.image_item.setTransform(self.image_transform)
             self.update_brightness_overlay()
             self.sync_scene_from_data()
         self.btn_preview.setText("Animer")
         self.update_button_states()
 
+    def release_export_images(self):
+        """Libère les images préparées pour l'export terminé, sauf si un aperçu s'en sert encore"""
+        if self.preview_worker is None and self.cv_image is not None:
+            for resolution in self.export_resolutions:
+                EXPORT_IMAGE_STORE.discard(self.cv_image, resolution)
+        self.export_resolutions = []
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainWindow()
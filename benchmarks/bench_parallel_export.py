@@ -0,0 +1,69 @@
+# =============================================================================
+# --- Banc d'essai : montée en charge de l'export parallèle ---
+# =============================================================================
+# Mesure le débit (frames/s) de tube_render.render_parallel selon le nombre de
+# processus, sur une image synthétique.
+#
+# Utilisation :
+#   python benchmarks/bench_parallel_export.py [--width 3840] [--height 2160]
+#       [--profile "Full HD 1080p"] [--frames 600] [--workers 1 2 4 8]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tube_render import PROFILES, AnimationTimeline, render_parallel  # noqa: E402
+
+
+def make_path(width, height, frames, speed, fps):
+    """Construit un tracé en zigzag dont la durée correspond au nombre de frames demandé."""
+    target_distance = frames * speed / fps
+    points, x, y, direction = [], width * 0.1, height * 0.1, 1
+    points.append({"x": x, "y": y, "size": height / 4})
+    distance = 0.0
+    while distance < target_distance:
+        x_next = width * (0.9 if direction > 0 else 0.1)
+        y = min(y + height * 0.1, height * 0.9)
+        distance += np.hypot(x_next - x, height * 0.1)
+        x, direction = x_next, -direction
+        points.append({"x": x, "y": y, "size": height / (3 + direction)})
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de l'export parallèle selon le nombre de processus.")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--profile", default="Full HD 1080p", choices=list(PROFILES))
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    settings = {"speed": 500, "fps": 50, "brightness": 50, "shape": "Cercle"}
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+    timeline = AnimationTimeline(make_path(args.width, args.height, args.frames, settings["speed"],
+                                           settings["fps"]), settings["speed"], settings["fps"])
+
+    print(f"Source {args.width}x{args.height} -> {args.profile}, {len(timeline)} frames")
+    print(f"{'processus':>9} {'durée (s)':>10} {'frames/s':>9} {'accélération':>13}")
+    # Le rendu sur un processus sert de référence à l'accélération : il passe toujours en premier
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in sorted(set(args.workers) | {1}):
+            output_path = os.path.join(tmp, f"bench_{workers}.mp4")
+            start = time.perf_counter()
+            render_parallel(timeline, settings, image, PROFILES[args.profile], output_path, workers=workers)
+            elapsed = time.perf_counter() - start
+            if workers == 1:
+                baseline = elapsed
+            print(f"{workers:>9} {elapsed:>10.2f} {len(timeline) / elapsed:>9.1f} {baseline / elapsed:>12.2f}x")
+
+
+if __name__ == '__main__':
+    main()
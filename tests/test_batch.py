@@ -0,0 +1,54 @@
+# =============================================================================
+# --- Tests de la file de rendus par lots (tube_batch) ---
+# =============================================================================
+import multiprocessing
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+import tube_render
+from tube_batch import DONE, FAILED, BatchJob, BatchScheduler
+from tube_path import PathModel
+from tube_render import DEFAULT_SETTINGS, save_project
+from tube_tiles import read_image_size
+
+needs_fork = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(),
+                                reason="le codec de test est transmis aux processus par fork")
+
+
+@pytest.fixture
+def ppm_job(tmp_path, monkeypatch):
+    # Encodeur présent dans toutes les distributions d'OpenCV
+    monkeypatch.setattr(tube_render, "VIDEO_FOURCC", "mp4v")
+    image_path = str(tmp_path / "source.ppm")
+    cv2.imwrite(image_path, np.random.default_rng(0).integers(0, 256, (120, 200, 3), dtype=np.uint8))
+    xy = np.column_stack((np.linspace(10, 190, 6), np.full(6, 60.0)))
+    project_path = str(tmp_path / "projet.json")
+    save_project(project_path, dict(DEFAULT_SETTINGS, speed=400, fps=25), PathModel(xy, np.full(6, 30.0)))
+    return BatchJob("ppm", project_path, image_path, "HD 720p", str(tmp_path / "sortie.mp4"))
+
+
+def run_scheduler(jobs, **kwargs):
+    scheduler = BatchScheduler(jobs, concurrency=1, **kwargs)
+    # Les processus héritent du codec de test
+    scheduler.context = multiprocessing.get_context("fork")
+    return scheduler.run()
+
+
+@needs_fork
+def test_unlimited_batch_renders_image_of_unknown_size(ppm_job):
+    assert read_image_size(ppm_job.image) is None
+    job, = run_scheduler([ppm_job])
+    assert job.status == DONE, job.error
+    assert job.memory == 0
+    assert os.path.getsize(job.output) > 0
+
+
+@needs_fork
+def test_memory_limit_rejects_image_of_unknown_size(ppm_job):
+    job, = run_scheduler([ppm_job], memory_limit=1 << 30)
+    assert job.status == FAILED
+    assert "Taille inconnue" in job.error
+    assert not os.path.exists(job.output)
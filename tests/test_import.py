@@ -0,0 +1,23 @@
+# =============================================================================
+# --- Tests de l'import de tracés denses (tube_import) ---
+# =============================================================================
+import numpy as np
+
+from tube_import import import_path, max_deviation, simplify_rdp
+
+
+def test_report_counts_rows_read_before_deduplication(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("x,y\n1,2\n1,2\n5,5\n")
+    path_points, report = import_path(str(path), (640, 480))
+    assert report["source_points"] == 3
+    assert report["points"] == len(path_points) == 2
+
+
+def test_simplification_stays_within_tolerance():
+    t = np.linspace(0, 4 * np.pi, 5000)
+    points = np.column_stack((t * 40, np.sin(t) * 100))
+    kept = simplify_rdp(points, 2.0)
+    assert kept[0] == 0 and kept[-1] == len(points) - 1
+    assert len(kept) < len(points) // 10
+    assert max_deviation(points, kept) <= 2.0
@@ -0,0 +1,57 @@
+# =============================================================================
+# --- Tests du modèle de tracé (tube_path) ---
+# =============================================================================
+import numpy as np
+import pytest
+
+from tube_path import PathModel, PointGrid, compute_bezier_handles
+
+
+def assert_handles_match_full_pass(model):
+    handle_in, handle_out = compute_bezier_handles(model.xy, model.smoothing)
+    np.testing.assert_array_equal(model.handles[0], handle_in)
+    np.testing.assert_array_equal(model.handles[1], handle_out)
+
+
+def test_handles_follow_insert_move_remove():
+    rng = np.random.default_rng(0)
+    model = PathModel(smoothing=0.7)
+    for _ in range(300):
+        action = rng.integers(3) if len(model) > 2 else 0
+        if action == 0:
+            model.insert(int(rng.integers(len(model) + 1)), *rng.uniform(0, 1000, 2), 50.0)
+        elif action == 1:
+            model.move(int(rng.integers(len(model))), *rng.uniform(0, 1000, 2))
+        else:
+            model.remove(int(rng.integers(len(model))))
+        assert_handles_match_full_pass(model)
+
+
+def test_set_smoothing_recomputes_all_handles():
+    model = PathModel(np.random.default_rng(1).uniform(0, 100, (20, 2)), np.full(20, 10.0), 0.2)
+    model.set_smoothing(0.9)
+    assert_handles_match_full_pass(model)
+
+
+def test_behaves_like_project_point_list():
+    points = [{"x": 1.0, "y": 2.0, "size": 30.0}, {"x": 4.5, "y": 6.0, "size": 40.0}]
+    model = PathModel.from_points(points)
+    assert len(model) == 2
+    assert model[-1] == points[1]
+    assert model.to_list() == points
+    copy = model.copy()
+    copy.move(0, 9.0, 9.0)
+    assert model[0] == points[0]
+    with pytest.raises(IndexError):
+        model[2]
+
+
+def test_point_grid_matches_brute_force():
+    rng = np.random.default_rng(2)
+    xy = rng.uniform(0, 500, (400, 2))
+    grid = PointGrid(cell_size=32)
+    grid.rebuild(xy)
+    for x, y in rng.uniform(0, 500, (200, 2)):
+        distances = np.hypot(xy[:, 0] - x, xy[:, 1] - y)
+        expected = int(np.argmin(distances)) if distances.min() < 10 else None
+        assert grid.nearest(x, y, 10) == expected
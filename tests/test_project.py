@@ -0,0 +1,85 @@
+# =============================================================================
+# --- Tests des fichiers projet (tube_render) ---
+# =============================================================================
+import json
+import os
+
+import numpy as np
+import pytest
+
+from tube_path import PathModel
+from tube_render import (
+    DEFAULT_SETTINGS, PROJECT_FORMAT_VERSION, build_timeline, image_file_hash, load_project,
+    open_project, save_project
+)
+
+
+@pytest.fixture
+def project():
+    rng = np.random.default_rng(0)
+    settings = dict(DEFAULT_SETTINGS, speed=300, smoothing=40)
+    path_points = PathModel(rng.uniform(0, 800, (25, 2)), rng.uniform(20, 120, 25), settings['smoothing'] / 100.0)
+    return settings, path_points
+
+
+@pytest.mark.parametrize("extension", [".json", ".npz"])
+def test_round_trip(tmp_path, project, extension):
+    settings, path_points = project
+    path = str(tmp_path / f"projet{extension}")
+    save_project(path, settings, path_points)
+    loaded_settings, loaded_points = load_project(path)
+    assert loaded_settings == settings
+    np.testing.assert_array_equal(loaded_points.xy, path_points.xy)
+    np.testing.assert_array_equal(loaded_points.sizes, path_points.sizes)
+    assert loaded_points.smoothing == path_points.smoothing
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_json_keeps_point_list_schema(tmp_path, project):
+    settings, path_points = project
+    path = str(tmp_path / "projet.json")
+    save_project(path, settings, path_points)
+    with open(path) as f:
+        data = json.load(f)
+    assert data["path_points"][0] == path_points[0]
+
+
+def test_binary_stores_image_hash_and_arc_table(tmp_path, project):
+    settings, path_points = project
+    image_path = tmp_path / "image.bin"
+    image_path.write_bytes(b"image")
+    timeline = build_timeline(path_points, settings)
+    path = str(tmp_path / "projet.npz")
+    save_project(path, settings, path_points, image_file_hash(str(image_path)), timeline.arc_table)
+    with open_project(path) as opened:
+        assert opened.version == PROJECT_FORMAT_VERSION
+        assert opened.image_hash == image_file_hash(str(image_path))
+        table = opened.arc_table()
+        np.testing.assert_array_equal(table.distance, timeline.arc_table.distance)
+        cached = build_timeline(opened.path_points, opened.settings, table)
+        np.testing.assert_array_equal(cached.x, timeline.x)
+
+
+def test_arc_table_ignored_when_smoothing_differs(tmp_path, project):
+    settings, path_points = project
+    path = str(tmp_path / "projet.npz")
+    save_project(path, settings, path_points, arc_table=build_timeline(path_points, settings).arc_table)
+    # Paramètres modifiés sans recalculer la table enregistrée
+    with open(path, "rb") as f:
+        arrays = dict(np.load(f))
+    arrays["settings"] = np.array(json.dumps(dict(settings, smoothing=90)))
+    np.savez(path, **arrays)
+    with open_project(path) as opened:
+        assert opened.arc_table() is None
+
+
+def test_newer_version_rejected(tmp_path, project):
+    settings, path_points = project
+    path = str(tmp_path / "projet.npz")
+    save_project(path, settings, path_points)
+    with open(path, "rb") as f:
+        arrays = dict(np.load(f))
+    arrays["version"] = np.array(PROJECT_FORMAT_VERSION + 1)
+    np.savez(path, **arrays)
+    with pytest.raises(ValueError):
+        open_project(path)
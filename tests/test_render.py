@@ -0,0 +1,140 @@
+# =============================================================================
+# --- Tests du cœur de rendu (tube_render) ---
+# =============================================================================
+import queue
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from tube_path import PathModel
+from tube_render import (
+    ArcLengthTable, ExportImageStore, FramePipeline, IncrementalFrameRenderer, PathLengthIndex, darken_image
+)
+
+
+def reference_frame(image, dark_image, shape, x, y, size):
+    """Frame de référence : masque plein cadre puis np.where, comme le rendu d'origine."""
+    mask = np.zeros(image.shape[:2], dtype="uint8")
+    if shape == "Cercle":
+        cv2.circle(mask, (int(x), int(y)), int(size / 2), 255, -1)
+    elif shape == "Carré":
+        half_size = int(size / 2)
+        cv2.rectangle(mask, (int(x - half_size), int(y - half_size)),
+                      (int(x + half_size), int(y + half_size)), 255, -1)
+    return np.where(mask[:, :, np.newaxis] > 0, image, dark_image)
+
+
+@pytest.fixture
+def images():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (90, 160, 3), dtype=np.uint8)
+    return image, darken_image(image, 30)
+
+
+@pytest.mark.parametrize("shape", ["Cercle", "Carré"])
+def test_incremental_render_matches_full_frame(images, shape):
+    image, dark_image = images
+    renderer = IncrementalFrameRenderer(image, dark_image, shape)
+    rng = np.random.default_rng(1)
+    # Positions en partie hors de l'image, tailles nulles comprises
+    frames = np.column_stack((
+        rng.uniform(-60, 220, 400),
+        rng.uniform(-60, 150, 400),
+        rng.choice([0.0, 1.0, 2.5, 7.0, 40.0, 131.0, 400.0], 400),
+    ))
+    for x, y, size in frames:
+        expected = reference_frame(image, dark_image, shape, x, y, size)
+        np.testing.assert_array_equal(renderer.render(x, y, size), expected)
+
+
+@pytest.mark.parametrize("shape", ["Cercle", "Carré"])
+def test_incremental_render_off_image_restores_background(images, shape):
+    image, dark_image = images
+    renderer = IncrementalFrameRenderer(image, dark_image, shape)
+    renderer.render(80, 45, 50)
+    np.testing.assert_array_equal(renderer.render(-500, -500, 50), dark_image)
+
+
+def test_darken_image_matches_float_scaling(images):
+    image, _ = images
+    for brightness in range(101):
+        expected = (image * (brightness / 100.0)).astype(np.uint8)
+        np.testing.assert_array_equal(darken_image(image, brightness), expected)
+
+
+def test_pipeline_producer_time_excludes_back_pressure():
+    # Un seul tampon et un encodeur lent : le producteur attend presque tout le temps
+    free = queue.Queue()
+    free.put(object())
+
+    def produce():
+        for _ in range(20):
+            token = pipeline.acquire(free)
+            if token is None:
+                return
+            yield token
+
+    def encode(token):
+        time.sleep(0.01)
+        free.put(token)
+
+    pipeline = FramePipeline(("compositing", produce()), [("encodage", encode)], queue_depth=1)
+    assert pipeline.run()
+    producer = pipeline.stats()["stages"]["compositing"]
+    assert producer["frames"] == 20
+    assert producer["wait_s"] > 0.1
+    assert producer["busy_s"] < 0.05
+
+
+def test_export_image_store_discard(images):
+    image, _ = images
+    store = ExportImageStore()
+    store.get(image, (80, 45), 30)
+    store.get(image, (80, 45), 60)
+    store.get(image, (40, 20), 30)
+    assert store.discard(image, (80, 45)) == 2
+    assert store.stats()["entries"] == 1
+    assert store.discard(image) == 1
+    assert store.stats() == {"hits": 0, "misses": 3, "entries": 0, "bytes": 0}
+
+
+def test_path_length_index_matches_full_table():
+    rng = np.random.default_rng(2)
+    points = PathModel(smoothing=0.5)
+    index = PathLengthIndex()
+    index.set_path(points, points.handles)
+    for step in range(120):
+        action = rng.integers(3) if len(points) > 3 else 0
+        if action == 0:
+            position = int(rng.integers(len(points) + 1))
+            points.insert(position, *rng.uniform(0, 500, 2), rng.uniform(10, 100))
+            index.point_inserted(points, points.handles, position)
+        elif action == 1:
+            position = int(rng.integers(len(points)))
+            points.move(position, *rng.uniform(0, 500, 2))
+            index.points_moved(points, points.handles, position, position)
+        else:
+            position = int(rng.integers(len(points)))
+            points.remove(position)
+            index.point_removed(points, points.handles, position)
+        if len(points) >= 2:
+            expected = ArcLengthTable.from_bezier(points, points.handles)
+            table = index.arc_table()
+            assert index.total_distance == pytest.approx(expected.total_distance)
+            np.testing.assert_allclose(table.distance, expected.distance, rtol=1e-12, atol=1e-9)
+
+
+def test_path_length_index_position_at_matches_table_sample():
+    rng = np.random.default_rng(3)
+    points = PathModel(rng.uniform(0, 500, (12, 2)), rng.uniform(10, 100, 12), 0.5)
+    index = PathLengthIndex()
+    index.set_path(points, points.handles)
+    points.move(5, 250.0, 250.0)
+    index.points_moved(points, points.handles, 5, 5)
+    expected = ArcLengthTable.from_bezier(points, points.handles)
+    distances = np.concatenate((rng.uniform(0, index.total_distance, 500), index.cumulative, [-10.0, 1e9]))
+    positions = np.array([index.position_at(distance) for distance in distances])
+    clamped = np.clip(distances, 0.0, expected.total_distance)
+    np.testing.assert_allclose(positions, np.column_stack(expected.sample(clamped)), rtol=1e-9, atol=1e-6)
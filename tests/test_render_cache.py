@@ -0,0 +1,134 @@
+# =============================================================================
+# --- Tests du cache de rendu sur disque (tube_render) ---
+# =============================================================================
+import os
+import shutil
+
+import cv2
+import numpy as np
+import pytest
+
+import tube_render
+from tube_path import PathModel
+from tube_render import DEFAULT_SETTINGS, RenderCache, build_timeline, render_cached
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg assemble les segments")
+
+
+@pytest.fixture(autouse=True)
+def available_codec(monkeypatch):
+    # Encodeur présent dans toutes les distributions d'OpenCV
+    monkeypatch.setattr(tube_render, "VIDEO_FOURCC", "mp4v")
+
+
+@pytest.fixture
+def scene():
+    image = np.random.default_rng(0).integers(0, 256, (120, 200, 3), dtype=np.uint8)
+    xy = np.column_stack((np.linspace(10, 190, 8), 60 + 40 * np.sin(np.arange(8))))
+    path_points = PathModel(xy, np.full(8, 30.0))
+    settings = dict(DEFAULT_SETTINGS, speed=200, fps=25)
+    return image, path_points, settings
+
+
+def frame_count(path):
+    capture = cv2.VideoCapture(path)
+    count = 0
+    while capture.read()[0]:
+        count += 1
+    capture.release()
+    return count
+
+
+def temp_files(cache):
+    return [name for name in os.listdir(cache.directory) if name.endswith(".tmp.mp4")]
+
+
+@needs_ffmpeg
+def test_reexport_reuses_unchanged_segments(tmp_path, scene):
+    image, path_points, settings = scene
+    cache = RenderCache(str(tmp_path / "cache"))
+    output = str(tmp_path / "video.mp4")
+    timeline = build_timeline(path_points, settings)
+
+    completed, stats = render_cached(timeline, settings, image, (160, 96), output, cache, chunk_frames=10)
+    assert completed
+    assert stats["reused"] == 0 and stats["rendered"] == stats["chunks"] == -(-len(timeline) // 10)
+    assert frame_count(output) == len(timeline)
+
+    # Même export : tout vient du cache
+    completed, stats = render_cached(timeline, settings, image, (160, 96), output, cache, chunk_frames=10)
+    assert completed and stats["rendered"] == 0
+    assert frame_count(output) == len(timeline)
+
+    # Dernier point déplacé : seuls les derniers segments sont rendus
+    path_points.move(len(path_points) - 1, 195, 110)
+    timeline = build_timeline(path_points, settings)
+    completed, stats = render_cached(timeline, settings, image, (160, 96), output, cache, chunk_frames=10)
+    assert completed
+    assert 0 < stats["reused"] < stats["chunks"]
+    assert stats["rendered"] == stats["chunks"] - stats["reused"]
+    assert frame_count(output) == len(timeline)
+    assert temp_files(cache) == []
+
+
+def test_single_segment_is_copied_out_of_the_cache(tmp_path, scene):
+    image, path_points, settings = scene
+    cache = RenderCache(str(tmp_path / "cache"))
+    timeline = build_timeline(path_points, settings)
+    for name in ("a.mp4", "b.mp4"):
+        completed, stats = render_cached(timeline, settings, image, (160, 96), str(tmp_path / name), cache,
+                                         chunk_frames=len(timeline))
+        assert completed and stats["chunks"] == 1
+        assert frame_count(str(tmp_path / name)) == len(timeline)
+    assert stats["reused"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_settings_change_misses(tmp_path, scene):
+    image, path_points, settings = scene
+    cache = RenderCache(str(tmp_path / "cache"))
+    timeline = build_timeline(path_points, settings)
+    output = str(tmp_path / "video.mp4")
+    render_cached(timeline, settings, image, (160, 96), output, cache, chunk_frames=len(timeline))
+    _, stats = render_cached(timeline, dict(settings, brightness=settings['brightness'] + 10), image, (160, 96),
+                             output, cache, chunk_frames=len(timeline))
+    assert stats["reused"] == 0
+
+
+def test_cancel_keeps_finished_segments_and_no_temp_files(tmp_path, scene):
+    image, path_points, settings = scene
+    cache = RenderCache(str(tmp_path / "cache"))
+    timeline = build_timeline(path_points, settings)
+    calls = []
+
+    def is_cancelled():
+        calls.append(None)
+        return len(calls) > 25  # Interrompt le troisième segment
+
+    completed, stats = render_cached(timeline, settings, image, (160, 96), str(tmp_path / "video.mp4"), cache,
+                                     chunk_frames=10, is_cancelled=is_cancelled)
+    assert not completed
+    assert not os.path.exists(tmp_path / "video.mp4")
+    assert temp_files(cache) == []
+    assert cache.stats()["entries"] == 2
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"), max_bytes=250)
+    os.makedirs(cache.directory)
+    for age, key in enumerate(["c", "b", "a"]):
+        segment = cache.temp_path(key)
+        with open(segment, "wb") as f:
+            f.write(b"\0" * 100)
+        cache.put(key, segment)
+        os.utime(cache.path(key), (1000 + age, 1000 + age))
+    with open(cache.temp_path("d"), "wb") as f:
+        f.write(b"\0" * 1000)  # Rendu en cours : ni compté ni supprimé
+
+    assert cache.get("c") is not None  # Devient le plus récemment utilisé
+    assert cache.get("z") is None
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert os.path.exists(cache.temp_path("d"))
+    assert cache.stats()["entries"] == 2
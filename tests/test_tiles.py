@@ -0,0 +1,113 @@
+# =============================================================================
+# --- Tests des images en tuiles (tube_tiles) ---
+# =============================================================================
+import cv2
+import numpy as np
+import pytest
+
+import tube_render
+import tube_tiles
+from tube_tiles import TiledImage, build_tile_cache, open_tiled_image, read_image_size, source_memory
+
+
+@pytest.mark.parametrize("extension, params", [
+    (".png", []), (".jpg", []), (".bmp", []), (".tif", []),
+    (".webp", [cv2.IMWRITE_WEBP_QUALITY, 80]), (".webp", [cv2.IMWRITE_WEBP_QUALITY, 101]),
+])
+def test_read_image_size_from_header(tmp_path, extension, params):
+    path = str(tmp_path / f"image{extension}")
+    image = np.random.default_rng(0).integers(0, 256, (123, 457, 3), dtype=np.uint8)
+    assert cv2.imwrite(path, image, params)
+    assert read_image_size(path) == (457, 123)
+
+
+def test_read_image_size_unknown_format(tmp_path):
+    path = tmp_path / "image.xyz"
+    path.write_bytes(b"\0" * 64)
+    assert read_image_size(str(path)) is None
+
+
+def smooth_image(height, width):
+    """Dégradé sans détail fin : toutes les interpolations y donnent presque le même résultat."""
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    image = np.dstack((x / width * 255, y / height * 255, (x + y) / (width + height) * 255))
+    return image.astype(np.uint8)
+
+
+@pytest.mark.parametrize("size, resolution", [
+    ((300, 200), (120, 70)),   # Réduction sur les deux axes
+    ((60, 600), (150, 90)),    # Image haute : largeur agrandie, hauteur réduite
+    ((600, 60), (90, 150)),    # Image large : largeur réduite, hauteur agrandie
+    ((40, 30), (120, 90)),     # Agrandissement sur les deux axes
+])
+def test_tiled_resize_reads_bands_only(tmp_path, monkeypatch, size, resolution):
+    width, height = size
+    image = smooth_image(height, width)
+    cache_path = str(tmp_path / "tiles.npy")
+    build_tile_cache(image, cache_path, tile_size=32)
+    tiled = TiledImage(cache_path)
+
+    monkeypatch.setattr(tube_tiles, "_BAND_BYTES", 16 * max(width, resolution[0]) * 3 * 4)
+    rows_read = []
+    region = tiled.region
+    monkeypatch.setattr(tiled, "region", lambda x0, y0, x1, y1: rows_read.append(y1 - y0) or region(x0, y0, x1, y1))
+
+    result = tiled.resize(resolution)
+    assert result.shape == (resolution[1], resolution[0], 3)
+    expected = cv2.resize(image, resolution, interpolation=cv2.INTER_AREA)
+    assert np.abs(result.astype(int) - expected).mean() < 2.0
+    if resolution[0] < width or resolution[1] < height:
+        assert max(rows_read) < height
+
+
+def test_tiled_resize_matches_area_when_reducing(tmp_path):
+    image = np.random.default_rng(0).integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    cache_path = str(tmp_path / "tiles.npy")
+    build_tile_cache(image, cache_path, tile_size=32)
+    result = TiledImage(cache_path).resize((120, 70))
+    expected = cv2.resize(image, (120, 70), interpolation=cv2.INTER_AREA)
+    assert np.abs(result.astype(int) - expected).max() <= 1
+
+
+def test_open_tiled_image_beyond_opencv_limit(tmp_path, monkeypatch):
+    image = np.random.default_rng(1).integers(0, 256, (90, 130, 3), dtype=np.uint8)
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, image)
+    # Limite de décodage plus petite que l'image : le cache est construit dans un processus séparé
+    monkeypatch.setenv("OPENCV_IO_MAX_IMAGE_PIXELS", "1000")
+    calls = []
+    run = tube_tiles.subprocess.run
+
+    def counting_run(*args, **kwargs):
+        calls.append(args)
+        return run(*args, **kwargs)
+    monkeypatch.setattr(tube_tiles.subprocess, "run", counting_run)
+    tiled = open_tiled_image(path, str(tmp_path / "tuiles"))
+    assert len(calls) == 1
+    np.testing.assert_array_equal(tiled.region(0, 0, 130, 90), image)
+
+
+def test_load_image_opens_large_images_in_tiles(tmp_path, monkeypatch):
+    image = smooth_image(90, 130)
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, image)
+    monkeypatch.setattr(tube_tiles, "TILE_CACHE_DIR", str(tmp_path / "tuiles"))
+    assert isinstance(tube_render.load_image(path), np.ndarray)
+    monkeypatch.setattr(tube_render, "TILED_IMAGE_MIN_PIXELS", 130 * 90)
+    tiled = tube_render.load_image(path)
+    assert isinstance(tiled, TiledImage)
+    np.testing.assert_array_equal(tiled.region(0, 0, 130, 90), image)
+
+
+def test_source_memory_counts_bands_once_cached(tmp_path, monkeypatch):
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, smooth_image(400, 600))
+    monkeypatch.setattr(tube_tiles, "TILE_CACHE_DIR", str(tmp_path / "tuiles"))
+    monkeypatch.setattr(tube_tiles, "TILED_IMAGE_MIN_PIXELS", 100_000)
+    monkeypatch.setattr(tube_tiles, "_BAND_BYTES", 4096)
+    decoded = 600 * 400 * 3
+    assert source_memory(path, (600, 400), (60, 40)) == decoded   # Cache à construire
+    open_tiled_image(path)
+    assert source_memory(path, (600, 400), (60, 40)) < decoded / 10
+    monkeypatch.setattr(tube_tiles, "TILED_IMAGE_MIN_PIXELS", 10**9)
+    assert source_memory(path, (600, 400), (60, 40)) == decoded   # Image décodée en mémoire
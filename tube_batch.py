@@ -0,0 +1,289 @@
+# =============================================================================
+# --- File de rendus par lots ---
+# =============================================================================
+# Exécute une liste de rendus (image × tracé × profil) décrite dans un manifeste
+# JSON, sur plusieurs processus, avec une limite de rendus simultanés et de
+# mémoire. Chaque rendu tourne dans son propre processus : un échec n'interrompt
+# pas les autres. Le moteur est celui de l'export de l'interface (render_video).
+#
+# Format du manifeste :
+#   {
+#       "defaults": {"profile": "Full HD 1080p", "workers": 1},
+#       "jobs": [
+#           {"name": "plan_a_1080", "project": "a.json", "image": "a.png",
+#            "profile": "Full HD 1080p", "output": "rendus/a_1080.mp4"},
+#           ...
+#       ]
+#   }
+# Les chemins relatifs sont résolus depuis le dossier du manifeste. Un rendu
+# peut nommer un dossier "cache_dir" (ou le recevoir de --cache-dir) : les
+# segments déjà rendus y sont réutilisés, y compris d'un lot à l'autre.
+#
+# Utilisation :
+#   python tube_batch.py manifeste.json [--jobs 4] [--memory-limit 8G] [--cache-dir dossier]
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+
+from tube_render import (
+    PROFILES, RenderCache, build_timeline, load_image, open_project, parse_memory, render_video
+)
+from tube_tiles import read_image_size, source_memory
+
+# États d'un rendu
+PENDING, RUNNING, DONE, FAILED = "en attente", "en cours", "terminé", "échec"
+
+# Frames de sortie en mémoire par processus : tampons du pipeline d'export
+# (queue_depth + 2) et marge pour l'encodeur
+_FRAME_BUFFERS = 10
+
+
+class BatchJob:
+    """Un rendu du lot et son état."""
+    def __init__(self, name, project, image, profile, output, workers=1, cache_dir=None):
+        self.name = name
+        self.project = project
+        self.image = image
+        self.profile = profile
+        self.output = output
+        self.workers = workers
+        self.cache_dir = cache_dir  # Dossier du cache de segments (pas de cache si None)
+        self.status = PENDING
+        self.error = None
+        self.started_at = None
+        self.duration = None
+        self.memory = 0  # Estimation de la mémoire nécessaire, en octets
+
+    def to_dict(self):
+        return {
+            "name": self.name, "project": self.project, "image": self.image,
+            "profile": self.profile, "output": self.output, "workers": self.workers,
+            "cache_dir": self.cache_dir
+        }
+
+
+def load_manifest(path):
+    """
+    Lit un manifeste de rendus par lots.
+
+    Args:
+        path: Chemin du manifeste JSON (liste de rendus, ou objet {"defaults", "jobs"})
+
+    Returns:
+        list: Les rendus (BatchJob) dans l'ordre du manifeste
+
+    Raises:
+        ValueError: Si un rendu est incomplet ou utilise un profil inconnu
+    """
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+    defaults = manifest.get("defaults", {})
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    jobs = []
+    for index, entry in enumerate(manifest.get("jobs", [])):
+        entry = {**defaults, **entry}
+        missing = [key for key in ("project", "image", "profile", "output") if key not in entry]
+        if missing:
+            raise ValueError(f"Rendu n°{index + 1} : champ(s) manquant(s) {', '.join(missing)}")
+        if entry["profile"] not in PROFILES:
+            raise ValueError(f"Rendu n°{index + 1} : profil non reconnu {entry['profile']}")
+        output = entry["output"] if entry["output"].lower().endswith('.mp4') else entry["output"] + '.mp4'
+        jobs.append(BatchJob(
+            entry.get("name", os.path.splitext(os.path.basename(output))[0]),
+            os.path.join(base_dir, entry["project"]),
+            os.path.join(base_dir, entry["image"]),
+            entry["profile"],
+            os.path.join(base_dir, output),
+            int(entry.get("workers", 1)),
+            os.path.join(base_dir, entry["cache_dir"]) if entry.get("cache_dir") else None
+        ))
+    return jobs
+
+
+def estimate_job_memory(job):
+    """
+    Estime la mémoire de pointe d'un rendu : image source (décodée, ou lue par
+    bandes de tuiles au-delà de TILED_IMAGE_MIN_PIXELS), image redimensionnée et
+    fond assombri à la taille de sortie, tampons du pipeline. Le rendu sur
+    plusieurs processus copie les images de sortie dans chacun.
+
+    Returns:
+        int: Estimation en octets
+
+    Raises:
+        ValueError: Si la taille de l'image ne se lit pas dans son en-tête ; elle
+            n'est jamais décodée par l'ordonnanceur
+    """
+    size = read_image_size(job.image)
+    if size is None:
+        raise ValueError(f"Taille inconnue de l'image {os.path.basename(job.image)} "
+                         "(formats reconnus : PNG, JPEG, BMP, TIFF, WebP)")
+    out_w, out_h = PROFILES[job.profile]
+    frame_bytes = out_w * out_h * 3
+    per_process = frame_bytes * (2 + _FRAME_BUFFERS)
+    return source_memory(job.image, size, (out_w, out_h)) + per_process * max(1, job.workers)
+
+
+def _run_job(job_data, connection):
+    """Point d'entrée du processus d'un rendu : renvoie le résultat par la connexion."""
+    try:
+        with open_project(job_data["project"]) as project:
+            settings, path_points = project.settings, project.path_points
+            if len(path_points) < 2:
+                raise ValueError("Le tracé doit comporter au moins 2 points.")
+            timeline = build_timeline(path_points, settings, project.arc_table())
+        image = load_image(job_data["image"])
+        output_dir = os.path.dirname(job_data["output"])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        cache = RenderCache(job_data["cache_dir"]) if job_data["cache_dir"] else None
+        render_video(image, path_points, settings, PROFILES[job_data["profile"]],
+                     job_data["output"], workers=job_data["workers"], timeline=timeline, cache=cache)
+        connection.send((DONE, None))
+    except Exception as e:
+        connection.send((FAILED, str(e)))
+    finally:
+        connection.close()
+
+
+class BatchScheduler:
+    """
+    Ordonnanceur des rendus par lots. Un rendu démarre dès qu'un emplacement est
+    libre et que sa mémoire estimée tient dans la limite ; les rendus plus petits
+    peuvent passer devant un rendu trop gros pour la mémoire disponible. Un
+    rendu seul est toujours lancé, même au-delà de la limite, pour ne pas bloquer la file.
+    """
+    def __init__(self, jobs, concurrency=None, memory_limit=None, on_status=None):
+        """
+        Args:
+            jobs: Liste des rendus (BatchJob)
+            concurrency: Nombre maximal de rendus simultanés (nombre de cœurs par défaut)
+            memory_limit: Mémoire maximale estimée des rendus simultanés, en octets (sans limite si None)
+            on_status: Fonction appelée avec le rendu à chaque changement d'état
+        """
+        self.jobs = jobs
+        self.concurrency = max(1, concurrency or os.cpu_count() or 1)
+        self.memory_limit = memory_limit
+        self.on_status = on_status
+        self.context = multiprocessing.get_context("spawn")
+
+    def _set_status(self, job, status, error=None):
+        job.status = status
+        job.error = error
+        if self.on_status:
+            self.on_status(job)
+
+    def _fits(self, job, memory_in_use, running_count):
+        if running_count >= self.concurrency:
+            return False
+        if self.memory_limit is None or running_count == 0:
+            return True
+        return memory_in_use + job.memory <= self.memory_limit
+
+    def run(self):
+        """
+        Exécute tous les rendus.
+
+        Returns:
+            list: Les rendus, avec leur état final
+        """
+        pending = []
+        for job in self.jobs:
+            # Sans limite de mémoire, l'estimation est inutile : le rendu n'est pas refusé
+            # pour une image dont la taille ne se lit pas dans l'en-tête
+            if self.memory_limit is not None:
+                try:
+                    job.memory = estimate_job_memory(job)
+                except Exception as e:
+                    self._set_status(job, FAILED, str(e))
+                    continue
+            pending.append(job)
+
+        running = {}  # Connexion -> (rendu, processus)
+        while pending or running:
+            # Lancement des rendus qui tiennent dans les limites
+            memory_in_use = sum(job.memory for job, _ in running.values())
+            for job in list(pending):
+                if not self._fits(job, memory_in_use, len(running)):
+                    continue
+                running.update(self._start(job))
+                memory_in_use += job.memory
+                pending.remove(job)
+
+            # Attente de la fin d'au moins un rendu
+            for receiver in wait(list(running)):
+                self._finish(receiver, *running.pop(receiver))
+        return self.jobs
+
+    def _start(self, job):
+        """
+        Lance un rendu dans son propre processus.
+
+        Returns:
+            dict: {connexion de réception du résultat: (rendu, processus)}
+        """
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=_run_job, args=(job.to_dict(), sender), name=job.name)
+        process.start()
+        sender.close()
+        job.started_at = time.perf_counter()
+        self._set_status(job, RUNNING)
+        return {receiver: (job, process)}
+
+    def _finish(self, receiver, job, process):
+        """Récupère le résultat d'un rendu terminé et attend la fin de son processus."""
+        try:
+            status, error = receiver.recv()
+        except EOFError:
+            status, error = FAILED, None
+        receiver.close()
+        process.join()
+        if status == FAILED and error is None:
+            error = f"Processus interrompu (code {process.exitcode})"
+        job.duration = time.perf_counter() - job.started_at
+        self._set_status(job, status, error)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendu par lots d'animations Tube Effect.")
+    parser.add_argument("manifest", help="Manifeste JSON des rendus")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Nombre maximal de rendus simultanés (nombre de cœurs par défaut)")
+    parser.add_argument("--memory-limit", type=parse_memory, default=None,
+                        help="Mémoire maximale des rendus simultanés, par exemple 8G")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Dossier du cache de segments pour les rendus qui n'en nomment pas")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except Exception as e:
+        sys.stderr.write(f"Erreur : {e}\n")
+        return 1
+    for job in jobs:
+        if job.cache_dir is None and args.cache_dir:
+            job.cache_dir = os.path.abspath(args.cache_dir)
+
+    def report(job):
+        line = f"[{job.status}] {job.name}"
+        if job.duration is not None:
+            line += f" ({job.duration:.1f} s)"
+        if job.error:
+            line += f" : {job.error}"
+        print(line, flush=True)
+
+    BatchScheduler(jobs, args.jobs, args.memory_limit, on_status=report).run()
+    failed = [job for job in jobs if job.status != DONE]
+    print(f"{len(jobs) - len(failed)}/{len(jobs)} rendus terminés", flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
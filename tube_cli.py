@@ -0,0 +1,83 @@
+# =============================================================================
+# --- Rendu en ligne de commande (sans interface graphique) ---
+# =============================================================================
+# Rend un projet enregistré par l'interface sans importer Qt, pour les machines
+# de rendu sans affichage.
+#
+# Utilisation :
+#   python tube_cli.py projet.json image.png "Full HD 1080p" sortie.mp4 [--workers 4]
+# Le projet peut aussi être au format binaire (.npz) : sa table de longueur
+# d'arc est alors réutilisée et l'image est comparée à celle du projet.
+# Pour livrer plusieurs profils, tube_batch.py rend un manifeste de rendus sur
+# plusieurs processus.
+# Avec --cache-dir, les segments déjà rendus par un rendu précédent du même
+# profil sont réutilisés : après une petite modification du tracé, seuls les
+# segments qui changent sont rendus à nouveau.
+import argparse
+import sys
+
+from tube_render import (
+    PROFILES, RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES, RenderCache, build_timeline, image_file_hash,
+    load_image, open_project, parse_memory, render_video
+)
+
+
+def make_progress_printer():
+    """Retourne une fonction qui affiche la progression sur une seule ligne de la sortie d'erreur."""
+    last_percent = [None]
+
+    def print_progress(percent):
+        if percent != last_percent[0]:
+            last_percent[0] = percent
+            sys.stderr.write(f"\rRendu : {percent:3d}%")
+            sys.stderr.flush()
+    return print_progress
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Rendu d'une animation Tube Effect sans interface graphique.")
+    parser.add_argument("project", help="Fichier projet JSON ou .npz (Sauvegarder le tracé)")
+    parser.add_argument("image", help="Image source du projet")
+    parser.add_argument("profile", choices=list(PROFILES), help="Profil d'exportation")
+    parser.add_argument("output", help="Vidéo MP4 à créer")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Nombre de processus de rendu (1 : export en pipeline, défaut)")
+    parser.add_argument("--cache-dir", nargs="?", const=RENDER_CACHE_DIR, default=None,
+                        help="Réutilise les segments déjà rendus, rangés dans ce dossier "
+                             f"({RENDER_CACHE_DIR} si omis)")
+    parser.add_argument("--cache-size", type=parse_memory, default=RENDER_CACHE_MAX_BYTES,
+                        help="Taille maximale du cache de segments, par exemple 4G")
+    parser.add_argument("--quiet", action="store_true", help="N'affiche pas la progression")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output_path = args.output if args.output.lower().endswith('.mp4') else args.output + '.mp4'
+    progress_callback = None if args.quiet else make_progress_printer()
+    try:
+        with open_project(args.project) as project:
+            settings, path_points = project.settings, project.path_points
+            if len(path_points) < 2:
+                raise ValueError("Le tracé doit comporter au moins 2 points.")
+            if project.image_hash and project.image_hash != image_file_hash(args.image):
+                sys.stderr.write("Attention : l'image diffère de celle avec laquelle le projet a été enregistré\n")
+            timeline = build_timeline(path_points, settings, project.arc_table())
+        image = load_image(args.image)
+        cache = RenderCache(args.cache_dir, args.cache_size) if args.cache_dir else None
+        render_video(image, path_points, settings, PROFILES[args.profile], output_path,
+                     workers=args.workers, timeline=timeline, progress_callback=progress_callback,
+                     cache=cache)
+    except KeyboardInterrupt:
+        sys.stderr.write("\nRendu interrompu\n")
+        return 130
+    except Exception as e:
+        sys.stderr.write(f"\nErreur : {e}\n")
+        return 1
+    if not args.quiet:
+        sys.stderr.write(f"\nVidéo enregistrée : {output_path}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
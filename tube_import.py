@@ -0,0 +1,290 @@
+# =============================================================================
+# --- Import de tracés denses ---
+# =============================================================================
+# Lit des polylignes de plusieurs dizaines de milliers de sommets (traces GPS,
+# exports SVG, tableaux CSV), les place dans l'image et les simplifie avant de
+# produire le tracé de l'éditeur (PathModel) en une seule fois.
+#
+# Formats reconnus :
+#   .csv : colonnes x,y (ou lon,lat / lat,lon si l'en-tête les nomme)
+#   .gpx : points de trace (trkpt), puis de route (rtept)
+#   .svg : <polyline>, <polygon> et <path> composés de segments droits
+#
+# Comme tube_render, ce module ne dépend que de NumPy et du modèle de tracé.
+import csv
+import math
+import os
+import re
+import xml.etree.ElementTree as ET
+import numpy as np
+from tube_path import PathModel
+
+IMPORT_MARGIN = 0.05     # Marge laissée autour du tracé importé, en fraction de l'image
+DEFAULT_TOLERANCE = 2.0  # Écart maximal de la simplification, en pixels de l'image
+
+
+# =============================================================================
+# --- Lecture des fichiers ---
+# =============================================================================
+def read_csv_points(path):
+    """
+    Lit une polyligne dans un fichier CSV (virgule, point-virgule ou tabulation).
+    Sans en-tête, les deux premières colonnes sont x et y.
+
+    Returns:
+        tuple: (tableau (N, 2) des coordonnées, True si ce sont des longitudes/latitudes)
+    """
+    with open(path, newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        rows = [row for row in csv.reader(f, dialect) if row]
+
+    columns, geographic = (0, 1), False
+    header = [cell.strip().lower() for cell in rows[0]] if rows else []
+    if header and not _is_number(header[0]):
+        rows = rows[1:]
+        lon = next((i for i, name in enumerate(header) if name in ("lon", "lng", "longitude")), None)
+        lat = next((i for i, name in enumerate(header) if name in ("lat", "latitude")), None)
+        if lon is not None and lat is not None:
+            columns, geographic = (lon, lat), True
+        elif "x" in header and "y" in header:
+            columns = (header.index("x"), header.index("y"))
+    points = np.array([(float(row[columns[0]]), float(row[columns[1]])) for row in rows], dtype=np.float64)
+    return points.reshape(-1, 2), geographic
+
+
+def read_gpx_points(path):
+    """
+    Lit les points d'une trace GPX (toutes les traces et segments bout à bout).
+
+    Returns:
+        tuple: (tableau (N, 2) des longitudes et latitudes, True)
+    """
+    root = ET.parse(path).getroot()
+    for tag in ("trkpt", "rtept"):
+        elements = [element for element in root.iter() if element.tag.rsplit('}', 1)[-1] == tag]
+        if elements:
+            points = np.array([(float(e.get("lon")), float(e.get("lat"))) for e in elements], dtype=np.float64)
+            return points, True
+    return np.zeros((0, 2)), True
+
+
+_SVG_TOKEN = re.compile(r"[MmLlHhVvZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def _svg_path_points(data):
+    """Sommets d'un attribut d de chemin SVG ne contenant que des segments droits."""
+    tokens = _SVG_TOKEN.findall(data)
+    if re.search(r"[AaCcQqSsTt]", data):
+        raise ValueError("Seuls les chemins SVG en segments droits (M, L, H, V, Z) sont pris en charge.")
+    points, command = [], None
+    x = y = start_x = start_y = 0.0
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.isalpha():
+            command = token
+            i += 1
+            if command in "Zz":
+                x, y = start_x, start_y
+                points.append((x, y))
+            continue
+        relative = command.islower()
+        if command in "Hh":
+            x = float(token) + (x if relative else 0.0)
+            i += 1
+        elif command in "Vv":
+            y = float(token) + (y if relative else 0.0)
+            i += 1
+        else:
+            dx, dy = float(token), float(tokens[i + 1])
+            x, y = (x + dx, y + dy) if relative else (dx, dy)
+            i += 2
+            if command in "Mm":
+                start_x, start_y = x, y
+                command = "l" if relative else "L"  # Les paires suivantes sont des lignes
+        points.append((x, y))
+    return points
+
+
+def read_svg_points(path):
+    """
+    Lit la première polyligne d'un fichier SVG (<polyline>, <polygon> ou <path>).
+
+    Returns:
+        tuple: (tableau (N, 2) des coordonnées SVG, False)
+
+    Raises:
+        ValueError: Si le chemin contient des courbes
+    """
+    root = ET.parse(path).getroot()
+    for element in root.iter():
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag in ("polyline", "polygon") and element.get("points"):
+            values = [float(v) for v in re.findall(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?", element.get("points"))]
+            points = np.array(values[:len(values) // 2 * 2], dtype=np.float64).reshape(-1, 2)
+            if tag == "polygon" and len(points):
+                points = np.vstack([points, points[:1]])
+            return points, False
+        if tag == "path" and element.get("d"):
+            return np.array(_svg_path_points(element.get("d")), dtype=np.float64).reshape(-1, 2), False
+    return np.zeros((0, 2)), False
+
+
+_READERS = {".csv": read_csv_points, ".gpx": read_gpx_points, ".svg": read_svg_points}
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+# =============================================================================
+# --- Placement et simplification ---
+# =============================================================================
+def fit_to_image(points, image_size, geographic=False, margin=IMPORT_MARGIN):
+    """
+    Place une polyligne dans l'image en conservant ses proportions : sa boîte
+    englobante est centrée et agrandie jusqu'à la marge. Les longitudes et
+    latitudes sont projetées (équirectangulaire) avec le nord en haut.
+
+    Args:
+        points: Tableau (N, 2) des coordonnées sources
+        image_size: Taille (largeur, hauteur) de l'image
+        geographic: True pour des longitudes/latitudes en degrés
+        margin: Marge autour du tracé, en fraction de l'image
+
+    Returns:
+        np.ndarray: Tableau (N, 2) des coordonnées en pixels de l'image
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if geographic:
+        lat0 = math.radians(float(np.mean(points[:, 1])))
+        points = np.column_stack((points[:, 0] * math.cos(lat0), -points[:, 1]))
+    low, high = points.min(axis=0), points.max(axis=0)
+    extent = high - low
+    width, height = image_size
+    available = np.array([width, height], dtype=np.float64) * (1.0 - 2 * margin)
+    with np.errstate(divide='ignore'):
+        scale = np.min(np.where(extent > 0, available / np.where(extent > 0, extent, 1.0), np.inf))
+    if not np.isfinite(scale):
+        scale = 1.0  # Tracé réduit à un point
+    center = np.array([width, height], dtype=np.float64) / 2
+    return (points - (low + high) / 2) * scale + center
+
+
+def _segment_distances(points, start, end):
+    """Distance de chaque point au segment [start, end]."""
+    direction = end - start
+    length2 = float(direction @ direction)
+    if length2 == 0.0:
+        return np.hypot(*(points - start).T)
+    t = np.clip((points - start) @ direction / length2, 0.0, 1.0)
+    return np.hypot(*(points - (start + t[:, np.newaxis] * direction)).T)
+
+
+def simplify_rdp(points, tolerance):
+    """
+    Simplification de Ramer-Douglas-Peucker. Chaque intervalle est traité en
+    une passe NumPy (distance de tous ses points à la corde) ; seule la pile
+    des intervalles reste en Python.
+
+    Args:
+        points: Tableau (N, 2) des coordonnées
+        tolerance: Écart maximal toléré, dans l'unité des coordonnées
+
+    Returns:
+        np.ndarray: Index des points conservés, dans l'ordre
+    """
+    count = len(points)
+    if count < 3:
+        return np.arange(count)
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _segment_distances(points[first + 1:last], points[first], points[last])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+def max_deviation(points, kept):
+    """
+    Écart maximal entre la polyligne d'origine et sa version simplifiée :
+    distance de chaque point d'origine au segment simplifié qui le remplace.
+
+    Args:
+        points: Tableau (N, 2) des coordonnées d'origine
+        kept: Index des points conservés (dont le premier et le dernier)
+
+    Returns:
+        float: Écart maximal, dans l'unité des coordonnées
+    """
+    if len(points) < 3 or len(kept) < 2:
+        return 0.0
+    # Segment simplifié de chaque point : entre le dernier point conservé avant lui et le suivant
+    segment = np.clip(np.searchsorted(kept, np.arange(len(points)), side='right') - 1, 0, len(kept) - 2)
+    start, end = points[kept[segment]], points[kept[segment + 1]]
+    direction = end - start
+    length2 = np.einsum('ij,ij->i', direction, direction)
+    t = np.divide(np.einsum('ij,ij->i', points - start, direction), length2,
+                  out=np.zeros(len(points)), where=length2 > 0)
+    closest = start + np.clip(t, 0.0, 1.0)[:, np.newaxis] * direction
+    return float(np.max(np.hypot(*(points - closest).T)))
+
+
+# =============================================================================
+# --- Import ---
+# =============================================================================
+def import_path(path, image_size, tolerance=DEFAULT_TOLERANCE, size=100):
+    """
+    Importe une polyligne dense comme tracé de l'éditeur.
+
+    Args:
+        path: Fichier .csv, .gpx ou .svg
+        image_size: Taille (largeur, hauteur) de l'image
+        tolerance: Écart maximal de la simplification, en pixels de l'image (0 pour tout garder)
+        size: Taille du projecteur donnée à chaque point
+
+    Returns:
+        tuple: (path_points sous forme de PathModel, rapport {"source_points" (sommets lus),
+            "points" (points conservés), "max_deviation"})
+
+    Raises:
+        ValueError: Si le format n'est pas reconnu ou si le fichier contient moins de 2 points
+    """
+    reader = _READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        raise ValueError(f"Format de tracé non reconnu : {os.path.basename(path)}")
+    points, geographic = reader(path)
+    source_points = len(points)  # Sommets lus, doublons compris
+    # Sommets répétés (arrêts d'une trace GPS) : sans effet sur le tracé
+    if len(points) > 1:
+        points = points[np.r_[True, np.any(np.diff(points, axis=0) != 0, axis=1)]]
+    if len(points) < 2:
+        raise ValueError("Le fichier doit contenir au moins 2 points distincts.")
+
+    points = fit_to_image(points, image_size, geographic)
+    kept = simplify_rdp(points, tolerance)
+    path_points = PathModel(points[kept], np.full(len(kept), float(size)))
+    report = {
+        "source_points": source_points,
+        "points": len(kept),
+        "max_deviation": max_deviation(points, kept),
+    }
+    return path_points, report
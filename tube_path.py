@@ -0,0 +1,315 @@
+# =============================================================================
+# --- Modèle du tracé ---
+# =============================================================================
+# Structures du tracé indépendantes de l'affichage : l'interface les tient à
+# jour à chaque modification et les interroge au lieu de parcourir la scène.
+#
+# Comme tube_render, ce module ne dépend que de NumPy.
+import math
+import numpy as np
+
+
+# =============================================================================
+# --- Points et poignées ---
+# =============================================================================
+def path_arrays(path_points):
+    """
+    Coordonnées et tailles d'un tracé sous forme de tableaux.
+
+    Args:
+        path_points: PathModel, ou liste de points ({"x", "y", "size"}) au format des projets
+
+    Returns:
+        tuple: (tableau (N, 2) des coordonnées, tableau (N,) des tailles) ; les
+            tableaux d'un PathModel sont des vues à ne pas modifier
+    """
+    if isinstance(path_points, PathModel):
+        return path_points.xy, path_points.sizes
+    xy = np.array([(p["x"], p["y"]) for p in path_points], dtype=np.float64).reshape(-1, 2)
+    sizes = np.array([p["size"] for p in path_points], dtype=np.float64)
+    return xy, sizes
+
+
+def compute_bezier_handles(points, smoothing):
+    """
+    Calcule les poignées de Bézier de chaque point de contrôle, en une passe NumPy.
+    Les extrémités n'ont pas de poignées ; pour un point intermédiaire, les
+    poignées suivent la direction entre ses deux voisins.
+
+    Args:
+        points: Tableau (N, 2) des coordonnées, PathModel ou liste de points
+        smoothing: Niveau de lissage (0.0 à 1.0)
+
+    Returns:
+        tuple: (poignées d'entrée, poignées de sortie), tableaux (N, 2) valant NaN aux extrémités
+    """
+    xy = points if isinstance(points, np.ndarray) else path_arrays(points)[0]
+    handle_in = np.full(xy.shape, np.nan)
+    handle_out = np.full(xy.shape, np.nan)
+    if len(xy) >= 3:
+        # Le facteur 0.2 et le smoothing déterminent l'intensité de la courbure
+        delta = (xy[2:] - xy[:-2]) * 0.2 * smoothing
+        handle_in[1:-1] = xy[1:-1] - delta   # Côté point précédent
+        handle_out[1:-1] = xy[1:-1] + delta  # Côté point suivant
+    return handle_in, handle_out
+
+
+class PathModel:
+    """
+    Tracé stocké dans des tableaux NumPy : coordonnées, tailles et poignées de
+    Bézier de chaque point, avec une capacité doublée au besoin pour que
+    l'ajout d'un point soit en temps constant amorti. Une modification ne
+    recalcule que les poignées du point et de ses voisins.
+
+    Le modèle se comporte comme la liste de points des projets : len(), accès
+    par index et itération donnent des dictionnaires {"x", "y", "size"}, qui
+    sont aussi le format de sauvegarde JSON.
+    """
+    def __init__(self, xy=None, sizes=None, smoothing=0.5):
+        """
+        Args:
+            xy: Tableau (N, 2) des coordonnées (tracé vide si None)
+            sizes: Tableau (N,) des tailles du projecteur
+            smoothing: Niveau de lissage (0.0 à 1.0)
+        """
+        count = 0 if xy is None else len(xy)
+        self._count = 0
+        self._smoothing = smoothing
+        self._xy, self._sizes = np.zeros((0, 2)), np.zeros(0)
+        self._in, self._out = np.zeros((0, 2)), np.zeros((0, 2))
+        self._reserve(count)
+        if count:
+            self._xy[:count] = xy
+            self._sizes[:count] = sizes
+            self._count = count
+        self._update_handles(0, count - 1)
+
+    @classmethod
+    def from_points(cls, points, smoothing=0.5):
+        """
+        Construit le modèle à partir d'une liste de points au format des projets.
+
+        Args:
+            points: Liste de points ({"x", "y", "size"}) ou PathModel
+            smoothing: Niveau de lissage (0.0 à 1.0)
+
+        Returns:
+            PathModel: Nouveau modèle (les points ne sont pas partagés)
+        """
+        xy, sizes = path_arrays(points)
+        return cls(xy, sizes, smoothing)
+
+    def _reserve(self, count):
+        """Agrandit les tableaux pour contenir au moins count points."""
+        capacity = len(self._xy)
+        if count <= capacity:
+            return
+        capacity = max(16, count, capacity * 2)
+        arrays = (np.zeros((capacity, 2)), np.zeros(capacity), np.full((capacity, 2), np.nan), np.full((capacity, 2), np.nan))
+        for new, old in zip(arrays, (self._xy, self._sizes, self._in, self._out)):
+            new[:self._count] = old[:self._count]
+        self._xy, self._sizes, self._in, self._out = arrays
+
+    def _update_handles(self, first, last):
+        """Recalcule les poignées des points first à last à partir de leurs voisins."""
+        first, last = max(0, first), min(self._count - 1, last)
+        if first > last:
+            return
+        start, stop = max(0, first - 1), min(self._count, last + 2)
+        # Les bords de la tranche ne sont pas recopiés : seules les vraies extrémités restent sans poignées
+        handle_in, handle_out = compute_bezier_handles(self._xy[start:stop], self._smoothing)
+        self._in[first:last + 1] = handle_in[first - start:last + 1 - start]
+        self._out[first:last + 1] = handle_out[first - start:last + 1 - start]
+
+    # --- Accès ---
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return {"x": float(self._xy[index, 0]), "y": float(self._xy[index, 1]), "size": float(self._sizes[index])}
+
+    def __iter__(self):
+        for (x, y), size in zip(self.xy.tolist(), self.sizes.tolist()):
+            yield {"x": x, "y": y, "size": size}
+
+    @property
+    def xy(self):
+        return self._xy[:self._count]
+
+    @property
+    def sizes(self):
+        return self._sizes[:self._count]
+
+    @property
+    def handles(self):
+        """Poignées (entrée, sortie) de chaque point, NaN aux extrémités."""
+        return self._in[:self._count], self._out[:self._count]
+
+    @property
+    def smoothing(self):
+        return self._smoothing
+
+    def copy(self):
+        return PathModel(self.xy, self.sizes, self._smoothing)
+
+    def to_list(self):
+        """Points au format des projets JSON."""
+        return list(self)
+
+    # --- Modifications ---
+    def set_smoothing(self, smoothing):
+        """Change le niveau de lissage : toutes les poignées sont recalculées en une passe."""
+        self._smoothing = smoothing
+        self._update_handles(0, self._count - 1)
+
+    def append(self, x, y, size):
+        """
+        Ajoute un point en fin de tracé.
+
+        Returns:
+            int: Index du point ajouté
+        """
+        return self.insert(self._count, x, y, size)
+
+    def insert(self, index, x, y, size):
+        """
+        Insère un point ; les points suivants sont décalés d'un bloc.
+
+        Returns:
+            int: Index du point inséré
+        """
+        self._reserve(self._count + 1)
+        for array in (self._xy, self._sizes, self._in, self._out):
+            array[index + 1:self._count + 1] = array[index:self._count]
+        self._count += 1
+        self._xy[index] = (x, y)
+        self._sizes[index] = size
+        self._update_handles(index - 1, index + 1)
+        return index
+
+    def remove(self, index):
+        """Supprime un point ; les points suivants sont décalés d'un bloc."""
+        for array in (self._xy, self._sizes, self._in, self._out):
+            array[index:self._count - 1] = array[index + 1:self._count]
+        self._count -= 1
+        self._update_handles(index - 1, index)
+
+    def move(self, index, x, y):
+        """Déplace un point : seules ses poignées et celles de ses voisins changent."""
+        self._xy[index] = (x, y)
+        self._update_handles(index - 1, index + 1)
+
+    def clear(self):
+        self._count = 0
+
+# =============================================================================
+# --- Index spatial ---
+# =============================================================================
+
+
+class PointGrid:
+    """
+    Index spatial des points de contrôle sur une grille uniforme.
+    Chaque cellule contient les index des points qui s'y trouvent ; la
+    recherche du point le plus proche ne parcourt que les cellules sous la
+    tolérance, en temps quasi constant quel que soit le nombre de points ou
+    d'éléments de la scène.
+    """
+    def __init__(self, cell_size=64.0):
+        """
+        Args:
+            cell_size: Côté des cellules, en pixels de l'image
+        """
+        self.cell_size = float(cell_size)
+        self.cells = {}      # (colonne, ligne) -> liste des index de points
+        self.positions = []  # (x, y) de chaque point, dans l'ordre du tracé
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def rebuild(self, points):
+        """
+        Reconstruit l'index (chargement d'un projet, réinitialisation).
+
+        Args:
+            points: PathModel, liste de points ({"x", "y", ...}) ou tableau (N, 2) des coordonnées
+        """
+        xy = points if isinstance(points, np.ndarray) else path_arrays(points)[0]
+        self.cells = {}
+        self.positions = [tuple(position) for position in xy.tolist()]
+        for index, (x, y) in enumerate(self.positions):
+            self.cells.setdefault(self._cell(x, y), []).append(index)
+
+    def insert(self, index, x, y):
+        """
+        Ajoute un point. L'ajout en fin de tracé est en temps constant ; une
+        insertion au milieu décale les index suivants et reconstruit l'index.
+
+        Args:
+            index: Position du point dans le tracé
+            x, y: Coordonnées du point
+        """
+        if index == len(self.positions):
+            self.positions.append((x, y))
+            self.cells.setdefault(self._cell(x, y), []).append(index)
+            return
+        self.rebuild(np.array(self.positions[:index] + [(x, y)] + self.positions[index:]).reshape(-1, 2))
+
+    def remove(self, index):
+        """
+        Retire un point ; les index suivants sont décalés.
+
+        Args:
+            index: Position du point dans le tracé
+        """
+        self.rebuild(np.array(self.positions[:index] + self.positions[index + 1:]).reshape(-1, 2))
+
+    def move(self, index, x, y):
+        """
+        Déplace un point : il ne change de cellule que s'il en franchit une limite.
+
+        Args:
+            index: Position du point dans le tracé
+            x, y: Nouvelles coordonnées
+        """
+        old_cell = self._cell(*self.positions[index])
+        new_cell = self._cell(x, y)
+        self.positions[index] = (x, y)
+        if new_cell != old_cell:
+            members = self.cells[old_cell]
+            members.remove(index)
+            if not members:
+                del self.cells[old_cell]
+            self.cells.setdefault(new_cell, []).append(index)
+
+    def nearest(self, x, y, tolerance):
+        """
+        Point le plus proche d'une position, dans un rayon donné.
+
+        Args:
+            x, y: Position recherchée, en pixels de l'image
+            tolerance: Distance maximale, en pixels de l'image
+
+        Returns:
+            int: Index du point le plus proche (le plus récent en cas d'égalité),
+                ou None si aucun point n'est assez proche
+        """
+        col0, row0 = self._cell(x - tolerance, y - tolerance)
+        col1, row1 = self._cell(x + tolerance, y + tolerance)
+        best_index, best_distance = None, tolerance * tolerance
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                for index in self.cells.get((col, row), ()):
+                    px, py = self.positions[index]
+                    distance = (px - x) ** 2 + (py - y) ** 2
+                    if distance < best_distance or (distance == best_distance
+                                                    and (best_index is None or index > best_index)):
+                        best_index, best_distance = index, distance
+        return best_index
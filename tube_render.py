@@ -0,0 +1,2079 @@
+# =============================================================================
+# --- Cœur de rendu de l'effet tube (sans dépendance à Qt) ---
+# =============================================================================
+# Ce module est importé par l'interface et par les processus de rendu parallèle :
+# il ne doit dépendre que de NumPy, d'OpenCV et du modèle de tracé (tube_path).
+import os
+import json
+import hashlib
+import math
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import multiprocessing
+import weakref
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import cv2
+import numpy as np
+from tube_path import PathModel, compute_bezier_handles, path_arrays
+from tube_tiles import TILED_IMAGE_MIN_PIXELS, open_tiled_image, read_image_size
+
+# =============================================================================
+# --- Constantes globales de l'application ---
+# =============================================================================
+PROFILES = {
+    "HD 720p": (1280, 720),
+    "Full HD 1080p": (1920, 1080),
+    "4K UHD": (3840, 2160)
+}
+DEFAULT_SETTINGS = {
+    "speed": 500,
+    "size": 250,
+    "brightness": 50,
+    "fps": 50,
+    "shape": "Cercle",
+    "smoothing": 50,
+    "camera_follow": False,   # Cadrage qui suit le projecteur au lieu de l'image entière
+    "camera_zoom": 1.0,       # Pixels de sortie par pixel source dans le cadrage
+    "camera_smoothing": 0.5,  # Lissage du mouvement du cadrage, en secondes
+    "trace_color": "#FFFF00",
+    "shape_color": "#00FFFF"
+}
+
+
+# =============================================================================
+# --- Fonctions de rendu du projecteur ---
+# =============================================================================
+def spotlight_bounds(shape, x, y, size, size_y=None):
+    """
+    Calcule le rectangle englobant de la zone éclairée, tel que dessiné par OpenCV.
+
+    Args:
+        shape: Forme du projecteur ("Cercle" ou "Carré")
+        x, y: Position du centre de la zone
+        size: Taille de la zone (largeur)
+        size_y: Hauteur de la zone si elle diffère de la largeur (image redimensionnée
+            de façon non uniforme) ; None pour une forme régulière
+
+    Returns:
+        tuple: (x0, y0, x1, y1) avec bornes de fin exclusives, ou None si la forme est inconnue
+    """
+    half_w = int(size / 2)
+    half_h = half_w if size_y is None else int(size_y / 2)
+    if shape == "Cercle":
+        cx, cy = int(x), int(y)
+        # Marge d'un pixel pour l'approximation polygonale des ellipses
+        margin = 0 if half_w == half_h else 1
+        return (cx - half_w - margin, cy - half_h - margin,
+                cx + half_w + margin + 1, cy + half_h + margin + 1)
+    if shape == "Carré":
+        left, right = sorted((int(x - half_w), int(x + half_w)))
+        top, bottom = sorted((int(y - half_h), int(y + half_h)))
+        return (left, top, right + 1, bottom + 1)
+    return None
+
+
+def clip_bounds(bounds, image_shape):
+    """
+    Restreint un rectangle aux dimensions de l'image.
+
+    Args:
+        bounds: Rectangle (x0, y0, x1, y1) ou None
+        image_shape: Forme (hauteur, largeur, ...) de l'image
+
+    Returns:
+        tuple: Rectangle restreint, ou None s'il est vide
+    """
+    if bounds is None:
+        return None
+    height, width = image_shape[:2]
+    x0, y0, x1, y1 = bounds
+    x0, y0 = max(x0, 0), max(y0, 0)
+    x1, y1 = min(x1, width), min(y1, height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def spotlight_mask(shape, x, y, size, roi, size_y=None):
+    """
+    Dessine le masque booléen de la forme, limité à une région de l'image.
+    Le centre est décalé dans le repère de la région, ce qui donne exactement
+    les mêmes pixels qu'un masque plein cadre.
+
+    Args:
+        shape: Forme du projecteur ("Cercle" ou "Carré")
+        x, y: Position du centre de la zone (repère de l'image)
+        size: Taille de la zone (largeur)
+        roi: Région (x0, y0, x1, y1) déjà restreinte à l'image
+        size_y: Hauteur de la zone si elle diffère de la largeur
+
+    Returns:
+        np.ndarray: Masque booléen de la taille de la région
+    """
+    x0, y0, x1, y1 = roi
+    mask = np.zeros((y1 - y0, x1 - x0), dtype="uint8")
+    half_w = int(size / 2)
+    half_h = half_w if size_y is None else int(size_y / 2)
+    if shape == "Cercle":
+        center = (int(x) - x0, int(y) - y0)
+        if half_w == half_h:
+            cv2.circle(mask, center, half_w, 255, -1)
+        else:
+            cv2.ellipse(mask, center, (half_w, half_h), 0, 0, 360, 255, -1)
+    elif shape == "Carré":
+        cv2.rectangle(
+            mask,
+            (int(x - half_w) - x0, int(y - half_h) - y0),
+            (int(x + half_w) - x0, int(y + half_h) - y0),
+            255,
+            -1
+        )
+    return mask > 0
+
+
+class MaskStampCache:
+    """
+    Cache LRU borné des masques (« tampons ») de projecteur déjà dessinés.
+    La taille varie lentement entre deux points de contrôle : les mêmes quelques
+    centaines de formes reviennent sans cesse et n'ont pas à être redessinées.
+    Le dessin d'OpenCV aligne le centre sur un pixel entier, la phase sous-pixel
+    est donc toujours nulle et la clé se limite à (forme, demi-largeur, demi-hauteur).
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Initialise le cache.
+
+        Args:
+            max_bytes: Taille mémoire maximale occupée par les masques
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0                # Nombre de masques trouvés dans le cache
+        self.misses = 0              # Nombre de masques dessinés
+        self._stamps = OrderedDict() # Masques du plus ancien au plus récent
+        self._bytes = 0
+        self._lock = threading.Lock()  # Partagé entre prévisualisation et export
+
+    def lookup(self, shape, size, size_y=None):
+        """
+        Retourne le masque de la forme, centré dans son rectangle englobant.
+
+        Args:
+            shape: Forme du projecteur ("Cercle" ou "Carré")
+            size: Taille de la zone (largeur)
+            size_y: Hauteur de la zone si elle diffère de la largeur
+
+        Returns:
+            np.ndarray: Masque booléen en lecture seule, aux dimensions de
+            spotlight_bounds(shape, 0, 0, size, size_y), ou None si la forme
+            remplit entièrement son rectangle englobant (carré)
+        """
+        if shape != "Cercle":
+            return None
+
+        half_w = int(size / 2)
+        half_h = half_w if size_y is None else int(size_y / 2)
+        key = (shape, half_w, half_h)
+        with self._lock:
+            stamp = self._stamps.get(key)
+            if stamp is not None:
+                self._stamps.move_to_end(key)
+                self.hits += 1
+                return stamp
+            self.misses += 1
+
+        bounds = spotlight_bounds(shape, 0, 0, size, size_y)
+        stamp = spotlight_mask(shape, 0, 0, size, bounds, size_y)
+        stamp.flags.writeable = False
+
+        with self._lock:
+            if key not in self._stamps:
+                self._stamps[key] = stamp
+                self._bytes += stamp.nbytes
+                # Éviction des masques les moins récemment utilisés
+                while self._bytes > self.max_bytes and len(self._stamps) > 1:
+                    _, evicted = self._stamps.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+        return stamp
+
+    def stats(self):
+        """
+        Retourne les compteurs du cache, utiles pour ajuster sa taille.
+
+        Returns:
+            dict: Succès, échecs, taux de succès, nombre d'entrées et mémoire occupée
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._stamps),
+                "bytes": self._bytes
+            }
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._stamps.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+
+# Cache partagé par tous les moteurs de rendu
+MASK_STAMP_CACHE = MaskStampCache()
+
+
+class IncrementalFrameRenderer:
+    """
+    Rendu incrémental des frames dans un tampon de sortie persistant.
+    Entre deux frames consécutives, seule l'ancienne zone éclairée est restaurée
+    depuis le fond assombri et seule la nouvelle est recopiée depuis la source :
+    le travail par frame dépend de la taille du projecteur, pas de celle de l'image.
+    """
+    def __init__(self, image, dark_image, shape, stamp_cache=None):
+        """
+        Initialise le moteur de rendu incrémental.
+
+        Args:
+            image: Image source en pleine luminosité
+            dark_image: Image de fond assombrie (même taille que la source)
+            shape: Forme du projecteur ("Cercle" ou "Carré")
+            stamp_cache: Cache des masques (MASK_STAMP_CACHE par défaut)
+        """
+        self.image = image
+        self.dark_image = dark_image
+        self.shape = shape
+        self.stamp_cache = stamp_cache if stamp_cache is not None else MASK_STAMP_CACHE
+        self.buffer = dark_image.copy()  # Tampon réutilisé d'une frame à l'autre
+        self.previous_roi = None         # Zone éclairée de la frame précédente
+
+    def render(self, x, y, size, size_y=None):
+        """
+        Met à jour le tampon pour la position donnée.
+
+        Args:
+            x, y: Position du centre de la zone
+            size: Taille de la zone (largeur)
+            size_y: Hauteur de la zone si elle diffère de la largeur
+
+        Returns:
+            np.ndarray: Le tampon de sortie, valide jusqu'au prochain appel
+        """
+        # Restauration du fond sous l'ancienne zone éclairée
+        if self.previous_roi is not None:
+            x0, y0, x1, y1 = self.previous_roi
+            self.buffer[y0:y1, x0:x1] = self.dark_image[y0:y1, x0:x1]
+
+        bounds = spotlight_bounds(self.shape, x, y, size, size_y)
+        roi = clip_bounds(bounds, self.buffer.shape)
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            stamp = self.stamp_cache.lookup(self.shape, size, size_y)
+            if stamp is None:
+                # Forme pleine : simple copie du rectangle
+                self.buffer[y0:y1, x0:x1] = self.image[y0:y1, x0:x1]
+            else:
+                # Partie du masque en cache qui recouvre l'image
+                bx0, by0 = bounds[0], bounds[1]
+                mask = stamp[y0 - by0:y1 - by0, x0 - bx0:x1 - bx0]
+                np.copyto(self.buffer[y0:y1, x0:x1], self.image[y0:y1, x0:x1], where=mask[:, :, np.newaxis])
+        self.previous_roi = roi
+        return self.buffer
+
+
+# =============================================================================
+# --- Trajectoire de l'animation ---
+# =============================================================================
+def sample_bezier_segments(path_points, bezier_handles, first, last, samples=32):
+    """
+    Échantillonne les segments first à last - 1 du tracé lissé (le segment i
+    relie les points i et i + 1), en une passe NumPy. Un segment est une courbe
+    cubique lorsque ses deux poignées existent, une ligne droite sinon.
+
+    Args:
+        path_points: PathModel ou liste des points de contrôle ({"x", "y", "size"})
+        bezier_handles: Poignées (entrée, sortie) de chaque point (voir compute_bezier_handles)
+        first, last: Plage de points ; les segments first à last - 1 sont échantillonnés
+        samples: Nombre d'intervalles par segment
+
+    Returns:
+        tuple: Tableaux (segments, samples + 1) : longueur d'arc locale, x, y, taille
+    """
+    points, sizes = path_arrays(path_points)
+    points, sizes = points[first:last + 1], sizes[first:last + 1]
+    start, end = points[:-1], points[1:]
+
+    # Points de contrôle ; une ligne droite est une cubique dégénérée
+    handle_in, handle_out = bezier_handles
+    ctrl_out, ctrl_in = handle_out[first:last], handle_in[first + 1:last + 1]
+    curved = ~(np.isnan(ctrl_out[:, :1]) | np.isnan(ctrl_in[:, :1]))
+    ctrl_out = np.where(curved, ctrl_out, start)
+    ctrl_in = np.where(curved, ctrl_in, end)
+
+    # Évaluation de tous les segments en une passe : (segments, échantillons, 2)
+    t = np.linspace(0.0, 1.0, samples + 1)[np.newaxis, :, np.newaxis]
+    u = 1.0 - t
+    curve = (u**3 * start[:, np.newaxis] + 3 * u**2 * t * ctrl_out[:, np.newaxis]
+             + 3 * u * t**2 * ctrl_in[:, np.newaxis] + t**3 * end[:, np.newaxis])
+
+    # Longueur d'arc locale à chaque segment
+    step = np.hypot(*np.moveaxis(np.diff(curve, axis=1), -1, 0))
+    local = np.zeros(curve.shape[:2])
+    local[:, 1:] = np.cumsum(step, axis=1)
+    segment_length = local[:, -1:]
+
+    # Taille interpolée proportionnellement à la distance parcourue dans le segment
+    fraction = np.divide(local, segment_length, out=np.broadcast_to(t[..., 0], local.shape).copy(),
+                         where=segment_length > 0)
+    size = sizes[:-1, np.newaxis] + (sizes[1:] - sizes[:-1])[:, np.newaxis] * fraction
+    return local, curve[..., 0], curve[..., 1], size
+
+
+class ArcLengthTable:
+    """
+    Table de correspondance longueur d'arc -> (x, y, taille) le long du tracé.
+    Les segments de Bézier cubiques de PathEditor sont échantillonnés une seule
+    fois par modification du tracé ; une interpolation linéaire dans la table
+    donne ensuite un déplacement à vitesse constante le long des courbes, pour
+    le même coût par frame qu'une interpolation entre points de contrôle.
+    """
+    SAMPLES_PER_SEGMENT = 32
+
+    def __init__(self, distance, x, y, size):
+        """
+        Args:
+            distance: Longueur d'arc cumulée de chaque échantillon (croissante)
+            x, y: Coordonnées des échantillons
+            size: Taille du projecteur aux échantillons
+        """
+        self.distance = distance
+        self.x = x
+        self.y = y
+        self.size = size
+
+    @property
+    def total_distance(self):
+        return float(self.distance[-1]) if len(self.distance) else 0.0
+
+    @classmethod
+    def from_polyline(cls, path_points):
+        """
+        Construit la table d'un tracé en lignes droites entre les points de contrôle.
+
+        Args:
+            path_points: PathModel ou liste des points de contrôle ({"x", "y", "size"})
+        """
+        xy, size = path_arrays(path_points)
+        x, y, size = xy[:, 0].copy(), xy[:, 1].copy(), size.copy()
+        distance = np.zeros(len(x))
+        if len(x) >= 2:
+            distance[1:] = np.cumsum(np.hypot(np.diff(x), np.diff(y)))
+        return cls(distance, x, y, size)
+
+    @classmethod
+    def from_bezier(cls, path_points, bezier_handles, samples=SAMPLES_PER_SEGMENT):
+        """
+        Construit la table du tracé lissé, tel que dessiné par PathEditor.get_smoothed_path.
+        Un segment est une courbe cubique lorsque ses deux poignées existent,
+        une ligne droite sinon.
+
+        Args:
+            path_points: PathModel ou liste des points de contrôle ({"x", "y", "size"})
+            bezier_handles: Poignées (entrée, sortie) de chaque point
+            samples: Nombre d'échantillons par segment
+        """
+        if len(path_points) < 3 or len(bezier_handles[0]) != len(path_points):
+            return cls.from_polyline(path_points)
+        local, x, y, size = sample_bezier_segments(path_points, bezier_handles, 0, len(path_points) - 1, samples)
+        return cls.from_segments(local, x, y, size)
+
+    @classmethod
+    def from_segments(cls, local, x, y, size):
+        """
+        Assemble la table à partir de segments échantillonnés séparément.
+
+        Args:
+            local: Longueur d'arc locale de chaque segment (segments, échantillons)
+            x, y, size: Échantillons de chaque segment (segments, échantillons)
+        """
+        # Concaténation : le premier échantillon de chaque segment est le dernier du précédent
+        offset = np.concatenate(([0.0], np.cumsum(local[:, -1])[:-1]))
+        distance = np.concatenate(([0.0], (local[:, 1:] + offset[:, np.newaxis]).ravel()))
+        x = np.concatenate((x[:1, 0], x[:, 1:].ravel()))
+        y = np.concatenate((y[:1, 0], y[:, 1:].ravel()))
+        size = np.concatenate((size[:1, 0], size[:, 1:].ravel()))
+        return cls(distance, x, y, size)
+
+    def sample(self, distances):
+        """
+        Interpole les positions et tailles aux distances données.
+
+        Args:
+            distances: Tableau de longueurs d'arc depuis le départ
+
+        Returns:
+            tuple: Tableaux (x, y, size)
+        """
+        return (np.interp(distances, self.distance, self.x),
+                np.interp(distances, self.distance, self.y),
+                np.interp(distances, self.distance, self.size))
+
+
+class PathLengthIndex:
+    """
+    Index de longueur d'arc du tracé lissé, tenu à jour point par point.
+    Chaque segment garde ses échantillons et sa longueur ; les sommes préfixes
+    des longueurs donnent la distance de départ de chaque segment. Ajouter,
+    déplacer ou supprimer un point ne rééchantillonne que les segments dont
+    la forme change (ceux qui touchent le point et ses voisins, dont les
+    poignées dépendent de lui).
+    """
+    def __init__(self, samples=ArcLengthTable.SAMPLES_PER_SEGMENT):
+        """
+        Args:
+            samples: Nombre d'intervalles par segment
+        """
+        self.samples = samples
+        self.local = np.zeros((0, samples + 1))   # Longueur d'arc locale des échantillons
+        self.x = np.zeros((0, samples + 1))
+        self.y = np.zeros((0, samples + 1))
+        self.size = np.zeros((0, samples + 1))
+        self.cumulative = np.zeros(1)             # Distance au début de chaque segment, puis totale
+        self.points = []
+        self._table = None                        # ArcLengthTable assemblée à la demande
+
+    @property
+    def total_distance(self):
+        return float(self.cumulative[-1])
+
+    def _resample(self, points, handles, first_segment, last_segment):
+        """Rééchantillonne les segments first_segment à last_segment inclus."""
+        first_segment = max(0, first_segment)
+        last_segment = min(len(points) - 2, last_segment)
+        if first_segment > last_segment:
+            return
+        local, x, y, size = sample_bezier_segments(points, handles, first_segment, last_segment + 1, self.samples)
+        segments = slice(first_segment, last_segment + 1)
+        old_lengths = self.local[segments, -1].copy()
+        self.local[segments], self.x[segments], self.y[segments], self.size[segments] = local, x, y, size
+        # Mise à jour des sommes préfixes par l'écart de longueur de chaque segment
+        delta = np.cumsum(local[:, -1] - old_lengths)
+        self.cumulative[first_segment + 1:last_segment + 2] += delta
+        self.cumulative[last_segment + 2:] += delta[-1]
+
+    def set_path(self, points, handles):
+        """
+        Reconstruit l'index complet (chargement, changement de lissage).
+
+        Args:
+            points: Liste des points de contrôle ({"x", "y", "size"})
+            handles: Poignées (entrée, sortie) de chaque point
+        """
+        count = max(0, len(points) - 1)
+        self.points = points
+        self.local, self.x, self.y, self.size = (np.zeros((count, self.samples + 1)) for _ in range(4))
+        self.cumulative = np.zeros(count + 1)
+        self._resample(points, handles, 0, count - 1)
+        self._table = None
+
+    def points_moved(self, points, handles, first, last):
+        """
+        Met à jour l'index après le déplacement des points first à last.
+
+        Args:
+            points, handles: Tracé à jour
+            first, last: Plage des points déplacés
+        """
+        # Les poignées des voisins changent aussi : segments first - 2 à last + 1
+        self._resample(points, handles, first - 2, last + 1)
+        self.points = points
+        self._table = None
+
+    def point_inserted(self, points, handles, index):
+        """
+        Met à jour l'index après l'insertion d'un point.
+
+        Args:
+            points, handles: Tracé à jour (le nouveau point est à index)
+            index: Position du point inséré
+        """
+        if len(points) < 2:
+            self.set_path(points, handles)
+            return
+        segment = min(index, len(points) - 2)
+        blank = np.zeros((1, self.samples + 1))
+        self.local, self.x, self.y, self.size = (
+            np.insert(array, segment, blank, axis=0) for array in (self.local, self.x, self.y, self.size)
+        )
+        self.cumulative = np.insert(self.cumulative, segment + 1, self.cumulative[segment])
+        if len(points) == 3:
+            # Passage de la ligne droite aux courbes : tout le tracé change
+            self.set_path(points, handles)
+            return
+        self._resample(points, handles, index - 2, index + 1)
+        self.points = points
+        self._table = None
+
+    def point_removed(self, points, handles, index):
+        """
+        Met à jour l'index après la suppression d'un point.
+
+        Args:
+            points, handles: Tracé à jour (sans le point supprimé)
+            index: Ancienne position du point supprimé
+        """
+        if len(points) < 3:
+            self.set_path(points, handles)
+            return
+        segment = min(index, len(self.local) - 1)
+        length = self.local[segment, -1]
+        self.local, self.x, self.y, self.size = (
+            np.delete(array, segment, axis=0) for array in (self.local, self.x, self.y, self.size)
+        )
+        self.cumulative = np.delete(self.cumulative, segment + 1)
+        self.cumulative[segment + 1:] -= length
+        self._resample(points, handles, index - 2, index)
+        self.points = points
+        self._table = None
+
+    def position_at(self, distance):
+        """
+        Position et taille du projecteur à une distance du départ, par recherche
+        dichotomique dans les sommes préfixes puis dans le segment.
+
+        Args:
+            distance: Longueur d'arc depuis le départ (bornée au tracé)
+
+        Returns:
+            tuple: (x, y, size)
+        """
+        if len(self.local) == 0:
+            point = self.points[0] if self.points else {"x": 0.0, "y": 0.0, "size": 0.0}
+            return float(point["x"]), float(point["y"]), float(point["size"])
+        distance = min(max(distance, 0.0), self.total_distance)
+        segment = min(int(np.searchsorted(self.cumulative, distance, side='right')) - 1, len(self.local) - 1)
+        local = self.local[segment]
+        offset = distance - self.cumulative[segment]
+        return (float(np.interp(offset, local, self.x[segment])),
+                float(np.interp(offset, local, self.y[segment])),
+                float(np.interp(offset, local, self.size[segment])))
+
+    def arc_table(self):
+        """
+        Table de longueur d'arc complète pour l'échantillonnage vectorisé des frames.
+
+        Returns:
+            ArcLengthTable: Identique à ArcLengthTable.from_bezier sur le même tracé
+        """
+        if self._table is None:
+            if len(self.points) >= 3:
+                self._table = ArcLengthTable.from_segments(self.local, self.x, self.y, self.size)
+            else:
+                self._table = ArcLengthTable.from_polyline(self.points)
+        return self._table
+
+
+class AnimationTimeline:
+    """
+    Trajectoire de l'animation précalculée pour toutes les frames.
+    Les positions et tailles sont obtenues en une seule passe NumPy sur la
+    longueur d'arc cumulée du tracé : la frame k se trouve à la distance
+    k * vitesse / fps du départ. Prévisualisation, export et affichage de la
+    durée partagent ainsi le même nombre de frames.
+    """
+    def __init__(self, path_points, speed, fps, arc_table=None):
+        """
+        Calcule la trajectoire complète.
+
+        Args:
+            path_points: Liste des points de contrôle ({"x", "y", "size"})
+            speed: Vitesse de déplacement en pixels par seconde
+            fps: Nombre d'images par seconde
+            arc_table: Table de longueur d'arc du tracé lissé (ArcLengthTable) ;
+                lignes droites entre les points de contrôle si None
+        """
+        self.speed = speed
+        self.fps = fps
+        self.arc_table = arc_table if arc_table is not None else ArcLengthTable.from_polyline(path_points)
+        self.total_distance = self.arc_table.total_distance
+
+        self.frame_count = self.count_frames(path_points, self.total_distance, speed, fps)
+
+        # Interpolation de toutes les frames en une passe
+        if self.frame_count:
+            distances = np.arange(self.frame_count) * (speed / fps)
+            self.x, self.y, self.size = self.arc_table.sample(distances)
+        else:
+            self.x = self.y = self.size = np.zeros(0)
+
+    @staticmethod
+    def count_frames(path_points, total_distance, speed, fps):
+        """
+        Nombre de frames de l'animation, sans calculer la trajectoire.
+
+        Args:
+            path_points: Liste des points de contrôle
+            total_distance: Longueur du tracé en pixels
+            speed: Vitesse de déplacement en pixels par seconde
+            fps: Nombre d'images par seconde
+
+        Returns:
+            int: Nombre de frames (0 si le tracé ou la vitesse ne permettent pas d'animation)
+        """
+        if len(path_points) >= 2 and speed > 0 and fps > 0:
+            return int((total_distance / speed) * fps)
+        return 0
+
+    def __len__(self):
+        return self.frame_count
+
+    def frame(self, index):
+        """
+        Retourne la position et la taille du projecteur pour une frame.
+
+        Args:
+            index: Index de la frame (0 <= index < len(self))
+
+        Returns:
+            tuple: (x, y, size)
+        """
+        return float(self.x[index]), float(self.y[index]), float(self.size[index])
+
+
+def build_timeline(path_points, settings, arc_table=None):
+    """
+    Construit la trajectoire qui suit le tracé lissé, comme dans l'éditeur.
+
+    Args:
+        path_points: Liste des points de contrôle ({"x", "y", "size"})
+        settings: Paramètres de l'animation ('speed', 'fps', 'smoothing')
+        arc_table: Table de longueur d'arc déjà calculée (celle d'un projet
+            binaire, voir ProjectFile.arc_table) ; échantillonnée depuis le tracé si None
+
+    Returns:
+        AnimationTimeline: Trajectoire précalculée
+    """
+    if arc_table is None:
+        smoothing = settings.get('smoothing', DEFAULT_SETTINGS['smoothing']) / 100.0
+        arc_table = ArcLengthTable.from_bezier(path_points, compute_bezier_handles(path_points, smoothing))
+    return AnimationTimeline(path_points, settings['speed'], settings['fps'], arc_table)
+
+
+# =============================================================================
+# --- Cadence de l'aperçu ---
+# =============================================================================
+class PreviewPacer:
+    """
+    Cadence de lecture de l'aperçu calée sur l'horloge : la frame k doit
+    s'afficher k / fps secondes après le début. Quand le rendu prend du retard,
+    les frames dont l'échéance est déjà dépassée sont sautées plutôt que
+    d'allonger la lecture, qui garde ainsi la durée de la vidéo exportée.
+    """
+    def __init__(self, frame_count, fps, clock=time.perf_counter, sleep=time.sleep):
+        """
+        Args:
+            frame_count: Nombre de frames de l'animation
+            fps: Nombre d'images par seconde
+            clock: Horloge en secondes (monotone)
+            sleep: Fonction d'attente en secondes
+        """
+        self.frame_count = frame_count
+        self.fps = fps
+        self.clock = clock
+        self.sleep = sleep
+        self.start_time = None
+        self.end_time = None
+        self.presented = 0
+        self.dropped = 0
+        self.late = 0
+        self.render_times = []
+
+    def deadline(self, index):
+        """Instant d'affichage prévu de la frame (horloge de self.clock)."""
+        return self.start_time + index / self.fps
+
+    def frames(self):
+        """
+        Itère sur les index des frames à rendre. Après chaque frame, la suivante
+        est la première dont l'échéance tombe après la fin prévue de son rendu
+        (estimée d'après la frame précédente) ; la dernière frame est toujours rendue.
+        """
+        self.start_time = self.clock()
+        index = 0
+        while index < self.frame_count:
+            yield index
+            expected = self.clock() + (self.render_times[-1] if self.render_times else 0.0)
+            due = math.ceil((expected - self.start_time) * self.fps - 1e-9)
+            next_index = max(index + 1, min(due, self.frame_count - 1))
+            self.dropped += next_index - index - 1
+            index = next_index
+        self.end_time = self.clock()
+
+    def present(self, index, render_time):
+        """
+        Attend l'échéance de la frame rendue avant son affichage.
+
+        Args:
+            index: Index de la frame
+            render_time: Durée du rendu de la frame, en secondes
+        """
+        self.render_times.append(render_time)
+        remaining = self.deadline(index) - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+        elif remaining < -0.5 / self.fps:
+            self.late += 1  # Affichée plus d'une demi-période après son échéance
+        self.presented += 1
+
+    def stats(self):
+        """
+        Mesures de la lecture.
+
+        Returns:
+            dict: fps visé et obtenu, frames affichées, sautées et en retard,
+                durée de lecture, percentiles du temps de rendu en ms (p50, p95, p99)
+        """
+        end = self.end_time if self.end_time is not None else self.clock()
+        elapsed = end - self.start_time if self.start_time is not None else 0.0
+        times = np.array(self.render_times) * 1000.0
+        p50, p95, p99 = np.percentile(times, [50, 95, 99]) if len(times) else (0.0, 0.0, 0.0)
+        return {
+            "target_fps": self.fps,
+            "achieved_fps": self.presented / elapsed if elapsed > 0 else 0.0,
+            "presented": self.presented,
+            "dropped": self.dropped,
+            "late": self.late,
+            "elapsed_s": elapsed,
+            "render_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+        }
+
+
+# =============================================================================
+# --- Fichiers projet ---
+# =============================================================================
+# Deux formats sont lus et écrits, choisis par l'extension du fichier :
+#   .json : {"settings", "path_points"} indenté, le format historique
+#   .npz  : archive NumPy versionnée (PROJECT_FORMAT_VERSION) avec les tableaux
+#           du tracé, les paramètres en JSON, l'empreinte SHA-256 de l'image
+#           source et, en option, la table de longueur d'arc du tracé lissé.
+#           Les membres de l'archive ne sont lus qu'à leur premier accès.
+# Les deux formats sont écrits dans un fichier temporaire puis renommés : un
+# enregistrement interrompu ne laisse jamais de projet tronqué.
+PROJECT_FORMAT_VERSION = 1
+BINARY_PROJECT_EXTENSION = ".npz"
+PROJECT_ARC_TABLE_MAX_BYTES = 16 * 1024 * 1024  # Au-delà, la table coûte plus à lire qu'à recalculer
+
+
+def is_binary_project(path):
+    return path.lower().endswith(BINARY_PROJECT_EXTENSION)
+
+
+def image_file_hash(image_path):
+    """
+    Empreinte SHA-256 du fichier d'une image, lue par blocs.
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomically(path, write):
+    """
+    Écrit un fichier par un fichier temporaire du même dossier, renommé une fois complet.
+
+    Args:
+        path: Chemin du fichier final
+        write: Fonction qui écrit le contenu dans le fichier binaire ouvert qu'elle reçoit
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class ProjectFile:
+    """
+    Projet ouvert en lecture. Pour le format binaire, seuls la version, les
+    paramètres et l'empreinte de l'image sont lus à l'ouverture ; le tracé et
+    la table de longueur d'arc le sont à leur premier accès.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path: Chemin du projet (.json ou .npz)
+
+        Raises:
+            ValueError: Si le projet binaire a été écrit par une version plus récente
+        """
+        self.path = path
+        self.settings = DEFAULT_SETTINGS.copy()
+        self._archive = None
+        self._path_points = None
+        if is_binary_project(path):
+            self._archive = np.load(path, allow_pickle=False)  # Archive lue membre par membre
+            self.version = int(self._archive["version"])
+            if self.version > PROJECT_FORMAT_VERSION:
+                self.close()
+                raise ValueError(f"Projet au format {self.version}, non pris en charge "
+                                 f"(format {PROJECT_FORMAT_VERSION} au plus)")
+            self.settings.update(json.loads(str(self._archive["settings"])))
+            self.image_hash = str(self._archive["image_hash"]) or None
+        else:
+            with open(path, 'r') as f:
+                project_data = json.load(f)
+            self.version = 0
+            self.settings.update(project_data.get("settings", {}))
+            self.image_hash = None
+            self._path_points = PathModel.from_points(project_data.get("path_points", []), self._smoothing())
+
+    def _smoothing(self):
+        return self.settings['smoothing'] / 100.0
+
+    @property
+    def path_points(self):
+        """Le tracé (PathModel), lu à la première demande."""
+        if self._path_points is None:
+            self._path_points = PathModel(self._archive["xy"], self._archive["sizes"], self._smoothing())
+        return self._path_points
+
+    def arc_table(self):
+        """
+        Table de longueur d'arc enregistrée avec le projet.
+
+        Returns:
+            ArcLengthTable: La table, ou None si le projet n'en contient pas ou
+                si elle a été calculée avec un autre lissage
+        """
+        if self._archive is None or "arc_table" not in self._archive.files:
+            return None
+        if float(self._archive["arc_smoothing"]) != self.settings['smoothing']:
+            return None
+        return ArcLengthTable(*self._archive["arc_table"])
+
+    def close(self):
+        if self._archive is not None:
+            self._archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_project(path):
+    """
+    Ouvre un projet JSON ou binaire (à fermer, ou à utiliser avec with).
+
+    Returns:
+        ProjectFile: Le projet ouvert
+    """
+    return ProjectFile(path)
+
+
+def load_project(path):
+    """
+    Lit un fichier projet écrit par l'interface (JSON ou binaire).
+
+    Args:
+        path: Chemin du fichier projet
+
+    Returns:
+        tuple: (settings complétés par DEFAULT_SETTINGS, path_points sous forme de PathModel)
+    """
+    with open_project(path) as project:
+        return project.settings, project.path_points
+
+
+def save_project(path, settings, path_points, image_hash=None, arc_table=None):
+    """
+    Écrit un fichier projet, au format binaire si son extension est .npz.
+
+    Args:
+        path: Chemin du fichier projet
+        settings: Paramètres de l'animation
+        path_points: PathModel ou liste des points de contrôle
+        image_hash: Empreinte de l'image source (image_file_hash), format binaire seulement
+        arc_table: Table de longueur d'arc du tracé lissé à mettre en cache, format binaire
+            seulement ; ignorée au-delà de PROJECT_ARC_TABLE_MAX_BYTES (tracés denses importés)
+    """
+    if not is_binary_project(path):
+        text = json.dumps({"settings": settings, "path_points": list(path_points)}, indent=4)
+        _write_atomically(path, lambda f: f.write(text.encode('utf-8')))
+        return
+
+    xy, sizes = path_arrays(path_points)
+    arrays = {
+        "version": np.array(PROJECT_FORMAT_VERSION),
+        "settings": np.array(json.dumps(settings)),
+        "image_hash": np.array(image_hash or ""),
+        "xy": xy,
+        "sizes": sizes,
+    }
+    if arc_table is not None and 4 * arc_table.distance.nbytes <= PROJECT_ARC_TABLE_MAX_BYTES:
+        arrays["arc_table"] = np.stack((arc_table.distance, arc_table.x, arc_table.y, arc_table.size))
+        arrays["arc_smoothing"] = np.array(float(settings['smoothing']))
+    _write_atomically(path, lambda f: np.savez(f, **arrays))
+
+
+# =============================================================================
+# --- Préparation de l'export ---
+# =============================================================================
+VIDEO_FOURCC = 'X264'  # Encodeur H.264 pour une meilleure qualité
+
+
+def open_video_writer(output_path, fps, resolution):
+    """
+    Ouvre un fichier vidéo MP4 en écriture.
+
+    Args:
+        output_path: Chemin du fichier vidéo
+        fps: Nombre d'images par seconde
+        resolution: Taille (largeur, hauteur) des frames
+
+    Returns:
+        cv2.VideoWriter: Le writer ouvert
+
+    Raises:
+        RuntimeError: Si le fichier ne peut pas être initialisé
+    """
+    fourcc = cv2.VideoWriter_fourcc(*VIDEO_FOURCC)
+    video_writer = cv2.VideoWriter(output_path, fourcc, fps, resolution)
+    if not video_writer.isOpened():
+        raise RuntimeError(f"Impossible d'initialiser le fichier vidéo: {output_path}")
+    return video_writer
+
+
+def darken_image(image, brightness):
+    """
+    Construit le fond assombri par une table de correspondance sur 8 bits,
+    sans passer par une image intermédiaire en flottants. Le résultat est
+    identique à (image * (brightness / 100.0)).astype(np.uint8).
+
+    Args:
+        image: Image source (BGR, uint8)
+        brightness: Luminosité du fond en pourcentage (0 à 100)
+
+    Returns:
+        np.ndarray: Image assombrie
+    """
+    lut = (np.arange(256) * (brightness / 100.0)).astype(np.uint8)
+    return cv2.LUT(image, lut)
+
+
+class ExportImageStore:
+    """
+    Cache partagé, en lecture seule, des images prêtes au rendu : source mise à
+    la résolution de sortie et fond assombri. La clé est (identité de l'image
+    source, résolution, luminosité) : l'aperçu puis l'export de la même image
+    empruntent les mêmes tableaux au lieu de les recalculer et de les copier.
+    Les entrées d'une image source disparaissent avec elle.
+    """
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        """
+        Initialise le cache.
+
+        Args:
+            max_bytes: Taille mémoire maximale occupée par les images préparées
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0                 # Nombre de préparations évitées
+        self.misses = 0               # Nombre de préparations calculées
+        self._entries = OrderedDict() # Entrées de la moins à la plus récemment utilisée
+        self._bytes = 0
+        self._lock = threading.Lock()  # Partagé entre prévisualisation et export
+
+    def get(self, image, resolution, brightness):
+        """
+        Retourne la source à la résolution demandée et son fond assombri.
+
+        Args:
+            image: Image source (BGR, ou TiledImage) ; elle ne doit plus être modifiée ensuite
+            resolution: Taille (largeur, hauteur) de sortie, ou None pour la taille source
+            brightness: Luminosité du fond en pourcentage (0 à 100)
+
+        Returns:
+            tuple: (image, dark_image, scale_x, scale_y), tableaux en lecture seule
+        """
+        height, width = image.shape[:2]
+        out_w, out_h = resolution if resolution else (width, height)
+        key = (id(image), out_w, out_h, brightness)
+        # Une image en tuiles (tube_tiles.TiledImage) est toujours matérialisée à la taille de sortie
+        same_size = (out_w, out_h) == (width, height) and isinstance(image, np.ndarray)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is image:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                frame_image, dark_image, scale_x, scale_y, _ = entry[1:]
+                return self._borrow(image, frame_image), dark_image, scale_x, scale_y
+            self.misses += 1
+
+        scale_x, scale_y = 1.0, 1.0
+        frame_image = None  # À la taille source, la source est prêtée telle quelle
+        if not same_size:
+            if isinstance(image, np.ndarray):
+                frame_image = cv2.resize(image, (out_w, out_h), interpolation=cv2.INTER_AREA)
+            else:
+                frame_image = image.resize((out_w, out_h))  # Lecture bande par bande des tuiles
+            frame_image.flags.writeable = False
+            scale_x, scale_y = out_w / width, out_h / height
+        dark_image = darken_image(image if same_size else frame_image, brightness)
+        dark_image.flags.writeable = False
+
+        # La source n'est ni comptée ni retenue : elle appartient à l'appelant
+        nbytes = dark_image.nbytes + (frame_image.nbytes if frame_image is not None else 0)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[-1]
+            self._entries[key] = (weakref.ref(image), frame_image, dark_image, scale_x, scale_y, nbytes)
+            self._bytes += nbytes
+            weakref.finalize(image, self._forget, key)
+            # Éviction des entrées les moins récemment utilisées
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[-1]
+        return self._borrow(image, frame_image), dark_image, scale_x, scale_y
+
+    @staticmethod
+    def _borrow(image, frame_image):
+        """Image à composer : celle du cache, ou une vue en lecture seule de la source."""
+        if frame_image is not None:
+            return frame_image
+        view = image.view()
+        view.flags.writeable = False
+        return view
+
+    def _forget(self, key):
+        """Retire l'entrée d'une image source libérée."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is None:
+                del self._entries[key]
+                self._bytes -= entry[-1]
+
+    def discard(self, image, resolution=None):
+        """
+        Libère les images préparées d'une source, par exemple à la fin d'un
+        export, pour ne pas les garder en mémoire tant que l'interface est inactive.
+
+        Args:
+            image: Image source
+            resolution: Taille (largeur, hauteur) dont les entrées sont libérées ; toutes si None
+
+        Returns:
+            int: Nombre d'entrées libérées
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if entry[0]() is image and (resolution is None or tuple(resolution) == key[1:3])]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)[-1]
+        return len(keys)
+
+    def stats(self):
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            dict: Succès, échecs, nombre d'entrées et mémoire occupée
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+
+# Cache partagé par l'aperçu et les exports
+EXPORT_IMAGE_STORE = ExportImageStore()
+
+
+def prepare_export_images(image, resolution, brightness):
+    """
+    Met la source à la résolution de sortie et construit le fond assombri.
+    Le redimensionnement n'a lieu qu'une fois : chaque frame est ensuite
+    composée directement à la taille de sortie. Le résultat est emprunté à
+    EXPORT_IMAGE_STORE et ne doit pas être modifié.
+
+    Args:
+        image: Image source (BGR, ou TiledImage pour les très grandes images)
+        resolution: Taille (largeur, hauteur) de sortie, ou None pour la taille source
+        brightness: Luminosité du fond en pourcentage (0 à 100)
+
+    Returns:
+        tuple: (image, dark_image, scale_x, scale_y)
+    """
+    return EXPORT_IMAGE_STORE.get(image, resolution, brightness)
+
+
+def timeline_to_output(timeline, scale_x, scale_y):
+    """
+    Convertit la trajectoire dans le repère de l'image de sortie
+    (centres de pixels alignés comme cv2.resize).
+
+    Args:
+        timeline: Trajectoire précalculée (AnimationTimeline)
+        scale_x, scale_y: Facteurs d'échelle source -> sortie
+
+    Returns:
+        tuple: Tableaux (x, y, largeur, hauteur) de la zone éclairée pour chaque frame
+    """
+    return ((timeline.x + 0.5) * scale_x - 0.5,
+            (timeline.y + 0.5) * scale_y - 0.5,
+            timeline.size * scale_x,
+            timeline.size * scale_y)
+
+
+# =============================================================================
+# --- Cadrage qui suit le projecteur ---
+# =============================================================================
+def camera_windows(timeline, image_size, resolution, zoom=1.0, smoothing=0.0):
+    """
+    Calcule la fenêtre de la source filmée à chaque frame : elle est centrée sur
+    le projecteur, lissée dans le temps et maintenue à l'intérieur de l'image.
+
+    Args:
+        timeline: Trajectoire précalculée (AnimationTimeline)
+        image_size: Taille (largeur, hauteur) de la source
+        resolution: Taille (largeur, hauteur) de sortie
+        zoom: Pixels de sortie par pixel source ; une fenêtre plus grande que
+            l'image est réduite jusqu'à y tenir
+        smoothing: Écart type du lissage gaussien du centre, en secondes (0 : aucun)
+
+    Returns:
+        tuple: (x0, y0, largeur, hauteur) : origines entières de la fenêtre pour
+        chaque frame et taille fixe de la fenêtre
+    """
+    width, height = image_size
+    out_w, out_h = resolution
+    window_w, window_h = out_w / zoom, out_h / zoom
+    fit = min(1.0, width / window_w, height / window_h)
+    window_w, window_h = max(1, int(round(window_w * fit))), max(1, int(round(window_h * fit)))
+
+    center_x, center_y = timeline.x, timeline.y
+    sigma = smoothing * timeline.fps
+    if sigma > 0 and len(center_x) > 1:
+        # Lissage sans retard : noyau gaussien centré, bords prolongés
+        radius = max(1, int(3 * sigma))
+        kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+        kernel /= kernel.sum()
+        center_x = np.convolve(np.pad(center_x, radius, mode='edge'), kernel, mode='valid')
+        center_y = np.convolve(np.pad(center_y, radius, mode='edge'), kernel, mode='valid')
+
+    x0 = np.clip(np.rint(center_x - window_w / 2), 0, width - window_w).astype(np.int64)
+    y0 = np.clip(np.rint(center_y - window_h / 2), 0, height - window_h).astype(np.int64)
+    return x0, y0, window_w, window_h
+
+
+class CameraFrameRenderer:
+    """
+    Rendu d'une frame à partir de la seule fenêtre de la source sous le cadrage :
+    la fenêtre est mise à la taille de sortie, assombrie par table de
+    correspondance, puis la zone éclairée y est recopiée. Le travail par frame
+    dépend de la taille de sortie, pas de celle de l'image.
+    """
+    def __init__(self, image, brightness, shape, resolution, window_size):
+        """
+        Args:
+            image: Image source (BGR, ou TiledImage : seules les tuiles de la fenêtre sont lues)
+            brightness: Luminosité du fond en pourcentage (0 à 100)
+            shape: Forme du projecteur ("Cercle" ou "Carré")
+            resolution: Taille (largeur, hauteur) de sortie
+            window_size: Taille (largeur, hauteur) de la fenêtre dans la source
+        """
+        self.image = image
+        self.shape = shape
+        self.resolution = resolution
+        self.window_w, self.window_h = window_size
+        self.scale_x = resolution[0] / self.window_w
+        self.scale_y = resolution[1] / self.window_h
+        self.interpolation = cv2.INTER_AREA if self.scale_x < 1 else cv2.INTER_LINEAR
+        self.lut = (np.arange(256) * (brightness / 100.0)).astype(np.uint8)
+        self.buffer = np.empty((resolution[1], resolution[0], 3), dtype=np.uint8)
+
+    def render(self, x0, y0, x, y, size):
+        """
+        Compose la frame d'une fenêtre.
+
+        Args:
+            x0, y0: Origine de la fenêtre dans la source
+            x, y: Position du centre de la zone (repère de la source)
+            size: Taille de la zone dans la source
+
+        Returns:
+            np.ndarray: Le tampon de sortie, valide jusqu'au prochain appel
+        """
+        x0, y0 = int(x0), int(y0)
+        x1, y1 = x0 + self.window_w, y0 + self.window_h
+        if isinstance(self.image, np.ndarray):
+            window = self.image[y0:y1, x0:x1]
+        else:
+            window = self.image.region(x0, y0, x1, y1)
+        if (self.window_w, self.window_h) != self.resolution:
+            window = cv2.resize(window, self.resolution, interpolation=self.interpolation)
+        cv2.LUT(window, self.lut, dst=self.buffer)
+
+        # Zone éclairée dans le repère de la sortie (centres de pixels alignés comme cv2.resize)
+        out_x = (x - x0 + 0.5) * self.scale_x - 0.5
+        out_y = (y - y0 + 0.5) * self.scale_y - 0.5
+        out_size = size * self.scale_x
+        roi = clip_bounds(spotlight_bounds(self.shape, out_x, out_y, out_size), self.buffer.shape)
+        if roi is not None:
+            rx0, ry0, rx1, ry1 = roi
+            mask = spotlight_mask(self.shape, out_x, out_y, out_size, roi)
+            # cv2.copyTo écrit dans la vue du tampon, bien plus vite qu'un np.copyto masqué
+            cv2.copyTo(window[ry0:ry1, rx0:rx1], mask.view(np.uint8), self.buffer[ry0:ry1, rx0:rx1])
+        return self.buffer
+
+
+# =============================================================================
+# --- Export en pipeline (compositing et encodage simultanés) ---
+# =============================================================================
+_END_OF_STREAM = object()  # Marqueur de fin propagé d'étage en étage
+
+
+class FramePipeline:
+    """
+    Chaîne d'étages exécutés chacun dans son propre thread et reliés par des
+    files bornées. NumPy et OpenCV libèrent le GIL : le compositing d'une frame
+    se fait pendant l'encodage de la précédente.
+
+    Une annulation arrête la production puis laisse les étages suivants vider
+    leurs files, afin que chacun se termine proprement. Une erreur dans un
+    étage interrompt immédiatement toute la chaîne.
+    """
+    def __init__(self, producer, stages, queue_depth=4):
+        """
+        Args:
+            producer: Couple (nom, itérable) produisant les éléments à traiter
+            stages: Liste de couples (nom, fonction) ; chaque fonction reçoit la
+                sortie de l'étage précédent, la sortie du dernier est ignorée
+            queue_depth: Nombre maximal d'éléments en attente entre deux étages
+        """
+        self.producer = producer
+        self.stages = stages
+        self.queue_depth = queue_depth
+        self.queues = [queue.Queue(maxsize=queue_depth) for _ in stages]
+        self.cancelled = False
+        self._cancel = threading.Event()  # Arrête la production, les files se vident
+        self._abort = threading.Event()   # Arrête tous les étages (erreur)
+        self._errors = []
+        names = [producer[0]] + [name for name, _ in stages]
+        self._timings = {name: {"frames": 0, "busy": 0.0, "wait": 0.0} for name in names}
+        self._depths = [{"sum": 0, "count": 0, "max": 0} for _ in stages]
+        self._producer_wait = 0.0  # Attente de tampons libres dans le producteur (voir acquire)
+
+    @property
+    def interrupted(self):
+        """True dès qu'une annulation ou une erreur a été signalée."""
+        return self._cancel.is_set() or self._abort.is_set()
+
+    def cancel(self):
+        """Demande l'arrêt de la production ; les éléments déjà produits sont traités."""
+        self.cancelled = True
+        self._cancel.set()
+
+    def _put(self, index, item, timing):
+        """Dépose un élément dans une file en attendant de la place."""
+        target = self.queues[index]
+        start = time.perf_counter()
+        while not self._abort.is_set():
+            try:
+                target.put(item, timeout=0.05)
+            except queue.Full:
+                continue
+            timing["wait"] += time.perf_counter() - start
+            depth = self._depths[index]
+            size = target.qsize()
+            depth["sum"] += size
+            depth["count"] += 1
+            depth["max"] = max(depth["max"], size)
+            return True
+        return False
+
+    def _get(self, index, timing):
+        """Retire un élément d'une file, ou None si la chaîne est interrompue."""
+        source = self.queues[index]
+        start = time.perf_counter()
+        while not self._abort.is_set():
+            try:
+                item = source.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            timing["wait"] += time.perf_counter() - start
+            return item
+        return None
+
+    def acquire(self, pool):
+        """
+        Attend, dans le producteur, un tampon libéré par les étages suivants.
+        Cette attente est comptée à part : le temps de travail du producteur ne
+        mesure que la production elle-même, pas la contre-pression de l'encodeur.
+
+        Args:
+            pool: File des tampons libres
+
+        Returns:
+            Le tampon obtenu, ou None si la chaîne est interrompue
+        """
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    return pool.get(timeout=0.05)
+                except queue.Empty:
+                    if self.interrupted:
+                        return None
+        finally:
+            waited = time.perf_counter() - start
+            self._timings[self.producer[0]]["wait"] += waited
+            self._producer_wait += waited
+
+    def _fail(self, error):
+        self._errors.append(error)
+        self._abort.set()
+
+    def _run_producer(self):
+        name, items = self.producer
+        timing = self._timings[name]
+        try:
+            iterator = iter(items)
+            while not self._cancel.is_set() and not self._abort.is_set():
+                start = time.perf_counter()
+                waited = self._producer_wait
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                timing["busy"] += time.perf_counter() - start - (self._producer_wait - waited)
+                timing["frames"] += 1
+                if not self._put(0, item, timing):
+                    return
+        except Exception as e:
+            self._fail(e)
+            return
+        self._put(0, _END_OF_STREAM, timing)
+
+    def _run_stage(self, index):
+        name, function = self.stages[index]
+        timing = self._timings[name]
+        is_last = index == len(self.stages) - 1
+        try:
+            while True:
+                item = self._get(index, timing)
+                if item is None:
+                    return
+                if item is _END_OF_STREAM:
+                    break
+                start = time.perf_counter()
+                result = function(item)
+                timing["busy"] += time.perf_counter() - start
+                timing["frames"] += 1
+                if not is_last and not self._put(index + 1, result, timing):
+                    return
+        except Exception as e:
+            self._fail(e)
+            return
+        if not is_last:
+            self._put(index + 1, _END_OF_STREAM, timing)
+
+    def run(self, is_cancelled=None):
+        """
+        Exécute la chaîne jusqu'à son terme.
+
+        Args:
+            is_cancelled: Fonction retournant True pour interrompre la production
+
+        Returns:
+            bool: True si tous les éléments ont été traités, False en cas d'annulation
+
+        Raises:
+            Exception: La première erreur survenue dans un étage
+        """
+        threads = [threading.Thread(target=self._run_producer, daemon=True)]
+        threads += [threading.Thread(target=self._run_stage, args=(i,), daemon=True)
+                    for i in range(len(self.stages))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.05)
+                if is_cancelled and not self.cancelled and is_cancelled():
+                    self.cancel()
+        if self._errors:
+            raise self._errors[0]
+        return not self.cancelled
+
+    def stats(self):
+        """
+        Retourne les mesures de chaque étage et de chaque file.
+
+        Returns:
+            dict: {"stages": {nom: {frames, busy_s, wait_s, ms_per_frame}},
+                   "queues": [{between, mean_depth, max_depth, capacity}]}
+        """
+        stages = {}
+        for name, timing in self._timings.items():
+            frames = timing["frames"]
+            stages[name] = {
+                "frames": frames,
+                "busy_s": timing["busy"],
+                "wait_s": timing["wait"],
+                "ms_per_frame": 1000.0 * timing["busy"] / frames if frames else 0.0
+            }
+        names = list(self._timings)
+        queues = []
+        for index, depth in enumerate(self._depths):
+            queues.append({
+                "between": (names[index], names[index + 1]),
+                "mean_depth": depth["sum"] / depth["count"] if depth["count"] else 0.0,
+                "max_depth": depth["max"],
+                "capacity": self.queue_depth
+            })
+        return {"stages": stages, "queues": queues}
+
+
+def _export_frame_renderer(timeline, settings, image, resolution):
+    """
+    Moteur de rendu des frames d'un export sur un profil : image entière, ou
+    cadrage qui suit le projecteur avec settings['camera_follow'].
+
+    Returns:
+        tuple: (fonction créant un moteur de rendu, fonction render_frame(moteur, index))
+    """
+    if settings.get('camera_follow'):
+        height, width = image.shape[:2]
+        x0s, y0s, window_w, window_h = camera_windows(
+            timeline, (width, height), resolution,
+            settings.get('camera_zoom', 1.0), settings.get('camera_smoothing', 0.0)
+        )
+
+        def render_camera_frame(renderer, index):
+            renderer.render(x0s[index], y0s[index], timeline.x[index], timeline.y[index], timeline.size[index])
+        return (lambda: CameraFrameRenderer(image, settings['brightness'], settings['shape'],
+                                            resolution, (window_w, window_h)), render_camera_frame)
+
+    frame_image, dark_image, scale_x, scale_y = prepare_export_images(image, resolution, settings['brightness'])
+    xs, ys, widths, heights = timeline_to_output(timeline, scale_x, scale_y)
+
+    def render_frame(renderer, index):
+        renderer.render(xs[index], ys[index], widths[index], heights[index])
+    return lambda: IncrementalFrameRenderer(frame_image, dark_image, settings['shape']), render_frame
+
+
+def render_pipelined(timeline, settings, image, resolution, output_path, queue_depth=4,
+                     progress_callback=None, is_cancelled=None):
+    """
+    Exporte la vidéo en faisant travailler le compositing et l'encodage en parallèle.
+    Les frames circulent dans un ensemble fixe de tampons de rendu : un tampon
+    n'est réutilisé qu'une fois sa frame encodée, sans allocation par frame.
+
+    Avec settings['camera_follow'], la sortie est un cadrage de la source qui
+    suit le projecteur (voir camera_windows) au lieu de l'image entière.
+
+    Args:
+        timeline: Trajectoire précalculée (AnimationTimeline)
+        settings: Paramètres de l'animation ('shape', 'brightness', 'fps', 'camera_*')
+        image: Image source (BGR)
+        resolution: Taille (largeur, hauteur) de sortie, ou None pour la taille source
+        output_path: Chemin de la vidéo
+        queue_depth: Nombre maximal de frames en attente d'encodage
+        progress_callback: Fonction appelée avec la progression en pourcentage
+        is_cancelled: Fonction retournant True pour interrompre le rendu
+
+    Returns:
+        tuple: (terminé, statistiques de FramePipeline.stats())
+    """
+    total_frames = len(timeline)
+    height, width = image.shape[:2]
+    resolution = tuple(resolution) if resolution else (width, height)
+
+    # Tampons disponibles : un en compositing, queue_depth en attente, un en encodage
+    free_renderers = queue.Queue()
+    make_renderer, render_frame = _export_frame_renderer(timeline, settings, image, resolution)
+    for _ in range(queue_depth + 2):
+        free_renderers.put(make_renderer())
+
+    def composite():
+        for index in range(total_frames):
+            # Attente d'un tampon libéré par l'encodeur
+            renderer = pipeline.acquire(free_renderers)
+            if renderer is None:
+                return
+            render_frame(renderer, index)
+            yield index, renderer
+
+    video_writer = open_video_writer(output_path, settings['fps'], resolution)
+
+    def encode(item):
+        index, renderer = item
+        video_writer.write(renderer.buffer)
+        free_renderers.put(renderer)
+        if progress_callback:
+            progress_callback(int((index + 1) / total_frames * 100))
+
+    pipeline = FramePipeline(("compositing", composite()), [("encodage", encode)], queue_depth)
+    try:
+        completed = pipeline.run(is_cancelled)
+    finally:
+        video_writer.release()
+    return completed, pipeline.stats()
+
+
+# =============================================================================
+# --- Export parallèle par segments ---
+# =============================================================================
+# État propre à chaque processus de rendu, initialisé une seule fois par processus
+_segment_worker_state = {}
+
+
+def _init_segment_worker(image, dark_image, shape, frames_done, cancel_event):
+    """Reçoit les images et l'état partagé une fois pour toutes dans chaque processus."""
+    _segment_worker_state.update(
+        image=image, dark_image=dark_image, shape=shape,
+        frames_done=frames_done, cancel_event=cancel_event
+    )
+
+
+def _render_segment(segment_path, fps, xs, ys, widths, heights):
+    """
+    Rend et encode un segment de la vidéo dans un processus de rendu.
+
+    Returns:
+        int: Nombre de frames écrites
+    """
+    state = _segment_worker_state
+    height, width = state["image"].shape[:2]
+    renderer = IncrementalFrameRenderer(state["image"], state["dark_image"], state["shape"])
+    video_writer = open_video_writer(segment_path, fps, (width, height))
+    written = 0
+    try:
+        for x, y, w, h in zip(xs, ys, widths, heights):
+            if state["cancel_event"].is_set():
+                break
+            video_writer.write(renderer.render(x, y, w, h))
+            written += 1
+            with state["frames_done"].get_lock():
+                state["frames_done"].value += 1
+    finally:
+        video_writer.release()
+    return written
+
+
+def concat_segments(segment_paths, output_path, keep_segments=False):
+    """
+    Assemble sans réencodage des segments MP4 encodés avec les mêmes paramètres.
+
+    Args:
+        segment_paths: Chemins des segments, dans l'ordre
+        output_path: Chemin de la vidéo finale
+        keep_segments: True pour laisser les segments en place (segments du cache de rendu)
+
+    Raises:
+        RuntimeError: Si ffmpeg est absent ou échoue
+    """
+    if len(segment_paths) == 1:
+        if keep_segments:
+            shutil.copyfile(segment_paths[0], output_path)
+        else:
+            shutil.move(segment_paths[0], output_path)
+        return
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg est requis pour assembler les segments de l'export parallèle")
+
+    list_fd, list_path = tempfile.mkstemp(suffix=".txt", dir=os.path.dirname(segment_paths[0]))
+    try:
+        with os.fdopen(list_fd, 'w') as f:
+            for path in segment_paths:
+                f.write("file '{}'\n".format(os.path.abspath(path).replace("'", "'\\''")))
+        result = subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+             "-i", list_path, "-c", "copy", output_path],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Échec de l'assemblage des segments: {result.stderr.strip()}")
+    finally:
+        os.remove(list_path)
+
+
+def _render_segments_in_pool(segments, fps, frame_image, dark_image, shape, workers,
+                             frames_callback=None, is_cancelled=None, segment_callback=None):
+    """
+    Rend des segments sur un pool de processus, chacun dans son propre fichier.
+
+    Args:
+        segments: Liste de (chemin, xs, ys, largeurs, hauteurs) dans le repère de sortie
+        fps: Nombre d'images par seconde
+        frame_image, dark_image: Images préparées à la résolution de sortie
+        shape: Forme du projecteur
+        workers: Nombre de processus
+        frames_callback: Fonction appelée avec le nombre de frames déjà rendues
+        is_cancelled: Fonction retournant True pour interrompre le rendu
+        segment_callback: Fonction appelée avec l'index de chaque segment entièrement écrit
+
+    Returns:
+        bool: True si tous les segments ont été rendus, False si le rendu a été annulé
+    """
+    # « spawn » : l'interface utilise des threads Qt, un fork ne serait pas sûr
+    context = multiprocessing.get_context("spawn")
+    frames_done = context.Value('l', 0)
+    cancel_event = context.Event()
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=_init_segment_worker,
+        initargs=(frame_image, dark_image, shape, frames_done, cancel_event)
+    ) as executor:
+        pending = {
+            executor.submit(_render_segment, path, fps, xs, ys, widths, heights): index
+            for index, (path, xs, ys, widths, heights) in enumerate(segments)
+        }
+        while pending:
+            done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    # Arrête les autres segments avant de propager l'erreur
+                    cancel_event.set()
+                    raise error
+                if segment_callback and future.result() == len(segments[index][1]):
+                    segment_callback(index)
+            if is_cancelled and is_cancelled():
+                cancel_event.set()
+                for future in pending:
+                    future.cancel()
+                return False
+            if frames_callback:
+                frames_callback(frames_done.value)
+    return True
+
+
+def render_parallel(timeline, settings, image, resolution, output_path, workers=None,
+                    chunk_count=None, progress_callback=None, is_cancelled=None):
+    """
+    Exporte la vidéo en répartissant des tranches de la trajectoire sur un pool de
+    processus. Chaque processus encode son propre segment ; les segments sont
+    ensuite assemblés sans perte dans le MP4 final.
+
+    Args:
+        timeline: Trajectoire précalculée (AnimationTimeline)
+        settings: Paramètres de l'animation ('shape', 'brightness', 'fps')
+        image: Image source (BGR)
+        resolution: Taille (largeur, hauteur) de sortie
+        output_path: Chemin de la vidéo finale
+        workers: Nombre de processus (nombre de cœurs par défaut)
+        chunk_count: Nombre de segments (deux par processus par défaut)
+        progress_callback: Fonction appelée avec la progression en pourcentage
+        is_cancelled: Fonction retournant True pour interrompre le rendu
+
+    Returns:
+        bool: True si la vidéo a été entièrement rendue, False si le rendu a été annulé
+    """
+    total_frames = len(timeline)
+    workers = max(1, workers or os.cpu_count() or 1)
+    chunk_count = max(1, min(chunk_count or workers * 2, total_frames))
+
+    frame_image, dark_image, scale_x, scale_y = prepare_export_images(image, resolution, settings['brightness'])
+    xs, ys, widths, heights = timeline_to_output(timeline, scale_x, scale_y)
+    bounds = np.linspace(0, total_frames, chunk_count + 1).astype(int)
+
+    segment_dir = tempfile.mkdtemp(prefix=".segments-", dir=os.path.dirname(os.path.abspath(output_path)))
+    segments = [
+        (os.path.join(segment_dir, f"segment_{i:04d}.mp4"),
+         xs[start:stop], ys[start:stop], widths[start:stop], heights[start:stop])
+        for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:]))
+    ]
+
+    def report(frames):
+        if progress_callback and total_frames > 0:
+            progress_callback(int(frames / total_frames * 100))
+
+    try:
+        if not _render_segments_in_pool(segments, settings['fps'], frame_image, dark_image, settings['shape'],
+                                        workers, report, is_cancelled):
+            return False
+        concat_segments([segment[0] for segment in segments], output_path)
+        return True
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+
+
+# =============================================================================
+# --- Cache de rendu sur disque ---
+# =============================================================================
+# La vidéo est découpée en segments d'une durée fixe comptée depuis la première
+# frame. Une frame ne dépend que de l'image préparée, des paramètres de rendu et
+# de la position du projecteur : chaque segment est rangé sous l'empreinte de
+# ces entrées, et un nouvel export ne rend que les segments dont l'empreinte
+# n'est pas dans le cache. Déplacer le dernier point ne change que la fin de la
+# trajectoire, donc seuls les derniers segments sont rendus à nouveau.
+RENDER_CACHE_DIR = os.path.join(tempfile.gettempdir(), "tube_effect_render_cache")
+RENDER_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # Taille des segments conservés sur disque
+RENDER_CACHE_CHUNK_SECONDS = 2                    # Durée d'un segment
+_RENDER_CACHE_VERSION = 1                         # À changer si le rendu d'une frame change
+
+
+class RenderCache:
+    """
+    Segments vidéo encodés, rangés sur disque sous l'empreinte de leurs entrées
+    (un fichier <empreinte>.mp4 par segment). La date de modification d'un
+    segment est mise à jour à chaque réutilisation ; au-delà de la taille
+    maximale, les segments les moins récemment utilisés sont supprimés.
+    """
+    def __init__(self, directory=None, max_bytes=RENDER_CACHE_MAX_BYTES):
+        """
+        Args:
+            directory: Dossier du cache (RENDER_CACHE_DIR par défaut), créé au premier segment
+            max_bytes: Taille maximale des segments conservés, en octets
+        """
+        self.directory = directory or RENDER_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0    # Segments réutilisés
+        self.misses = 0  # Segments absents du cache
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.mp4")
+
+    def temp_path(self, key):
+        """Fichier où rendre un segment avant de le ranger (voir put)."""
+        return os.path.join(self.directory, f"{key}.{os.getpid()}.tmp.mp4")
+
+    def get(self, key):
+        """
+        Cherche un segment ; un segment trouvé devient le plus récemment utilisé.
+
+        Returns:
+            str: Chemin du segment, ou None s'il n'est pas dans le cache
+        """
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, segment_path):
+        """
+        Range un segment rendu : le fichier est renommé, jamais recopié, et un
+        segment incomplet n'est jamais visible sous son empreinte.
+
+        Args:
+            key: Empreinte du segment
+            segment_path: Fichier rendu, dans le dossier du cache (voir temp_path)
+
+        Returns:
+            str: Chemin du segment dans le cache
+        """
+        path = self.path(key)
+        os.replace(segment_path, path)
+        return path
+
+    def _entries(self):
+        """Segments du cache : liste de (date d'utilisation, taille, chemin)."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    # Les fichiers temporaires (<empreinte>.<pid>.tmp.mp4) appartiennent à un rendu en cours
+                    if entry.name.endswith(".mp4") and entry.name.count(".") == 1:
+                        info = entry.stat()
+                        entries.append((info.st_mtime, info.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def evict(self):
+        """
+        Supprime les segments les moins récemment utilisés jusqu'à revenir sous la taille maximale.
+
+        Returns:
+            int: Nombre de segments supprimés
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            dict: Succès, échecs, nombre de segments et taille occupée
+        """
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries)
+        }
+
+
+def render_context_hash(frame_image, settings, resolution):
+    """
+    Empreinte des entrées communes à tous les segments d'un export : image à la
+    résolution de sortie, paramètres qui changent le rendu d'une frame, encodeur.
+
+    Returns:
+        hashlib._Hash: Empreinte à compléter par segment (voir segment_key)
+    """
+    digest = hashlib.sha256()
+    header = {
+        "version": _RENDER_CACHE_VERSION, "fourcc": VIDEO_FOURCC, "fps": settings['fps'],
+        "shape": settings['shape'], "brightness": settings['brightness'], "resolution": list(resolution)
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    digest.update(np.ascontiguousarray(frame_image).data)
+    return digest
+
+
+def segment_key(context_hash, xs, ys, widths, heights):
+    """
+    Empreinte d'un segment : celle de l'export complétée par les positions et
+    tailles du projecteur de chacune de ses frames.
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = context_hash.copy()
+    for values in (xs, ys, widths, heights):
+        digest.update(np.ascontiguousarray(values, dtype=np.float64).data)
+    return digest.hexdigest()
+
+
+def _render_segments_here(segments, fps, frame_image, dark_image, shape,
+                          frames_callback=None, is_cancelled=None, segment_callback=None):
+    """
+    Rend des segments l'un après l'autre dans ce processus
+    (mêmes arguments que _render_segments_in_pool).
+
+    Returns:
+        bool: True si tous les segments ont été rendus, False si le rendu a été annulé
+    """
+    height, width = frame_image.shape[:2]
+    frames_done = 0
+    for index, (path, xs, ys, widths, heights) in enumerate(segments):
+        # Tampon neuf par segment : le segment ne dépend que de ses propres positions
+        renderer = IncrementalFrameRenderer(frame_image, dark_image, shape)
+        video_writer = open_video_writer(path, fps, (width, height))
+        try:
+            for x, y, w, h in zip(xs, ys, widths, heights):
+                if is_cancelled and is_cancelled():
+                    return False
+                video_writer.write(renderer.render(x, y, w, h))
+                frames_done += 1
+                if frames_callback:
+                    frames_callback(frames_done)
+        finally:
+            video_writer.release()
+        if segment_callback:
+            segment_callback(index)
+    return True
+
+
+def _plan_cached_segments(cache, context_hash, positions, total_frames, chunk_frames):
+    """
+    Découpe la trajectoire en segments de chunk_frames frames alignés sur la
+    première frame (une modification de la fin du tracé garde les premiers) et
+    cherche chacun dans le cache.
+
+    Args:
+        cache: Cache des segments (RenderCache)
+        context_hash: Empreinte de l'export (render_context_hash)
+        positions: Tableaux (x, y, largeur, hauteur) de chaque frame dans le repère de sortie
+        total_frames: Nombre de frames
+        chunk_frames: Nombre de frames par segment
+
+    Returns:
+        tuple: (empreintes de tous les segments dans l'ordre, segments à rendre
+            {empreinte: (fichier temporaire, xs, ys, largeurs, hauteurs)}, nombre de frames reprises du cache)
+    """
+    keys, missing = [], {}
+    reused_frames = 0
+    for start in range(0, total_frames, chunk_frames):
+        stop = min(start + chunk_frames, total_frames)
+        chunk = tuple(values[start:stop] for values in positions)
+        key = segment_key(context_hash, *chunk)
+        keys.append(key)
+        if key in missing or cache.get(key) is None:
+            missing.setdefault(key, (cache.temp_path(key),) + chunk)
+        else:
+            reused_frames += stop - start
+    return keys, missing, reused_frames
+
+
+def render_cached(timeline, settings, image, resolution, output_path, cache=None, workers=1,
+                  chunk_frames=None, progress_callback=None, is_cancelled=None):
+    """
+    Exporte la vidéo en réutilisant les segments déjà rendus par un export précédent.
+    Les segments absents du cache sont rendus (sur un pool de processus si
+    workers > 1) puis rangés dans le cache ; la vidéo est assemblée sans
+    réencodage. Les segments terminés restent dans le cache même si l'export est annulé.
+
+    Args:
+        timeline: Trajectoire précalculée (AnimationTimeline)
+        settings: Paramètres de l'animation ('shape', 'brightness', 'fps')
+        image: Image source (BGR, ou TiledImage)
+        resolution: Taille (largeur, hauteur) de sortie
+        output_path: Chemin de la vidéo finale
+        cache: Cache des segments (RenderCache dans RENDER_CACHE_DIR par défaut)
+        workers: Nombre de processus pour les segments à rendre
+        chunk_frames: Nombre de frames par segment (RENDER_CACHE_CHUNK_SECONDS par défaut)
+        progress_callback: Fonction appelée avec la progression en pourcentage
+        is_cancelled: Fonction retournant True pour interrompre le rendu
+
+    Returns:
+        tuple: (True si la vidéo a été entièrement rendue, statistiques
+            {"chunks", "reused", "rendered", "evicted"})
+
+    Raises:
+        RuntimeError: Si la vidéo compte plusieurs segments et que ffmpeg est absent
+    """
+    cache = cache if cache is not None else RenderCache()
+    fps = settings['fps']
+    total_frames = len(timeline)
+    chunk_frames = max(1, chunk_frames or int(round(fps * RENDER_CACHE_CHUNK_SECONDS)))
+
+    if total_frames == 0:
+        raise ValueError("La trajectoire ne contient aucune frame à rendre.")
+
+    frame_image, dark_image, scale_x, scale_y = prepare_export_images(image, resolution, settings['brightness'])
+    xs, ys, widths, heights = timeline_to_output(timeline, scale_x, scale_y)
+    context_hash = render_context_hash(frame_image, settings, resolution or frame_image.shape[1::-1])
+
+    keys, missing, reused_frames = _plan_cached_segments(cache, context_hash, (xs, ys, widths, heights),
+                                                         total_frames, chunk_frames)
+    missing_keys, segments = list(missing), list(missing.values())
+    stats = {"chunks": len(keys), "reused": len(keys) - len(missing), "rendered": len(missing), "evicted": 0}
+
+    def report(frames):
+        if progress_callback:
+            progress_callback(min(100, int((reused_frames + frames) / total_frames * 100)))
+
+    def store(index):
+        cache.put(missing_keys[index], segments[index][0])
+
+    try:
+        if segments:
+            os.makedirs(cache.directory, exist_ok=True)
+            render = _render_segments_here if workers <= 1 else partial(_render_segments_in_pool, workers=workers)
+            if not render(segments, fps, frame_image, dark_image, settings['shape'],
+                          frames_callback=report, is_cancelled=is_cancelled, segment_callback=store):
+                return False, stats
+        concat_segments([cache.path(key) for key in keys], output_path, keep_segments=True)
+        return True, stats
+    finally:
+        # Segments interrompus ou en erreur : jamais rangés dans le cache
+        for segment in segments:
+            if os.path.exists(segment[0]):
+                os.remove(segment[0])
+        stats["evicted"] = cache.evict()
+
+
+# =============================================================================
+# --- Rendu sans interface ---
+# =============================================================================
+def render_video(image, path_points, settings, resolution, output_path, workers=1, timeline=None,
+                 progress_callback=None, is_cancelled=None, cache=None):
+    """
+    Exporte une animation : même moteur que l'export de l'interface.
+
+    Args:
+        image: Image source (BGR)
+        path_points: Liste des points de contrôle
+        settings: Paramètres de l'animation
+        resolution: Taille (largeur, hauteur) de sortie
+        output_path: Chemin de la vidéo
+        workers: Nombre de processus ; 1 pour l'export en pipeline dans ce processus
+            (toujours utilisé avec le cadrage qui suit le projecteur)
+        timeline: Trajectoire précalculée (construite depuis le tracé lissé si None)
+        progress_callback: Fonction appelée avec la progression en pourcentage
+        is_cancelled: Fonction retournant True pour interrompre le rendu
+        cache: Cache des segments déjà rendus (RenderCache) ; seuls les segments
+            absents sont rendus (sans effet avec le cadrage qui suit le projecteur)
+
+    Returns:
+        bool: True si la vidéo a été entièrement rendue
+    """
+    if timeline is None:
+        timeline = build_timeline(path_points, settings)
+    if cache is not None and not settings.get('camera_follow'):
+        completed, _ = render_cached(timeline, settings, image, resolution, output_path, cache, workers=workers,
+                                     progress_callback=progress_callback, is_cancelled=is_cancelled)
+        return completed
+    if workers > 1 and not settings.get('camera_follow'):
+        return render_parallel(timeline, settings, image, resolution, output_path, workers=workers,
+                               progress_callback=progress_callback, is_cancelled=is_cancelled)
+    completed, _ = render_pipelined(timeline, settings, image, resolution, output_path,
+                                    progress_callback=progress_callback, is_cancelled=is_cancelled)
+    return completed
+
+
+def load_image(image_path):
+    """
+    Ouvre une image source : décodée en mémoire, ou projetée en tuiles
+    (tube_tiles.TiledImage) à partir de TILED_IMAGE_MIN_PIXELS pixels, comme
+    dans l'interface. Le rendu n'en lit alors que des bandes de tuiles.
+
+    Raises:
+        ValueError: Si l'image ne peut pas être lue
+    """
+    size = read_image_size(image_path)
+    if size and size[0] * size[1] >= TILED_IMAGE_MIN_PIXELS:
+        return open_tiled_image(image_path)
+    image = cv2.imread(image_path)
+    if image is None:
+        raise ValueError(f"Impossible de lire l'image: {image_path}")
+    return image
+
+
+def parse_memory(text):
+    """Convertit une taille comme « 512M » ou « 8G » en octets."""
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+    text = text.strip().upper().rstrip("OB")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
@@ -0,0 +1,354 @@
+# =============================================================================
+# --- Images sources tuilées en mémoire projetée ---
+# =============================================================================
+# Les très grandes images (cartes, numérisations) ne tiennent pas plusieurs fois
+# en mémoire. Au premier chargement, l'image est décodée une fois puis recopiée
+# dans un cache brut découpé en tuiles carrées ; les chargements suivants
+# projettent ce cache en mémoire (np.memmap) sans rien décoder. Le rendu ne lit
+# que les tuiles sous la zone demandée, et le système peut libérer les pages
+# inutilisées. Les processus de rendu parallèle rouvrent le même cache au lieu
+# de recevoir une copie de l'image.
+#
+# OpenCV refuse de décoder une image de plus de OPENCV_IO_MAX_IMAGE_PIXELS
+# pixels (2^30 par défaut), valeur lue au chargement de la bibliothèque. Au-delà,
+# le cache est construit dans un processus séparé dont la limite est relevée à
+# la taille de l'image ; ce premier chargement demande toujours la mémoire de
+# l'image décodée entière (largeur × hauteur × 3 octets).
+#
+# Comme tube_render, ce module ne dépend que de NumPy et d'OpenCV.
+import hashlib
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import cv2
+import numpy as np
+
+TILE_SIZE = 256                       # Côté des tuiles, en pixels
+TILED_IMAGE_MIN_PIXELS = 64_000_000   # Au-delà, l'interface charge l'image en tuiles
+TILE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "tube_effect_tiles")
+_BAND_BYTES = 64 * 1024 * 1024        # Mémoire de travail d'une bande lors d'une réduction
+_OPENCV_DEFAULT_MAX_PIXELS = 1 << 30  # Limite de décodage d'OpenCV sans OPENCV_IO_MAX_IMAGE_PIXELS
+
+
+def _tiff_size(f, byte_order, big):
+    """Dimensions lues dans le premier répertoire (IFD) d'un TIFF ou BigTIFF."""
+    if big:
+        f.seek(8)
+        f.seek(struct.unpack(byte_order + 'Q', f.read(8))[0])
+        count, entry_format, entry_size = struct.unpack(byte_order + 'Q', f.read(8))[0], 'HHQ8s', 20
+    else:
+        f.seek(4)
+        f.seek(struct.unpack(byte_order + 'I', f.read(4))[0])
+        count, entry_format, entry_size = struct.unpack(byte_order + 'H', f.read(2))[0], 'HHI4s', 12
+    size = {}
+    for _ in range(count):
+        entry = f.read(entry_size)
+        if len(entry) < entry_size:
+            break
+        tag, value_type, _, value = struct.unpack(byte_order + entry_format, entry)
+        if tag in (256, 257) and value_type in (3, 4, 16):  # ImageWidth, ImageLength : SHORT, LONG ou LONG8
+            size[tag] = struct.unpack_from(byte_order + {3: 'H', 4: 'I', 16: 'Q'}[value_type], value)[0]
+    if 256 in size and 257 in size:
+        return size[256], size[257]
+    return None
+
+
+def _webp_size(header):
+    """Dimensions lues dans le premier bloc d'un WebP (VP8, VP8L ou VP8X)."""
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = struct.unpack('<I', header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return (int.from_bytes(header[24:27], 'little') + 1, int.from_bytes(header[27:30], 'little') + 1)
+    return None
+
+
+def read_image_size(path):
+    """
+    Lit la taille d'une image PNG, JPEG, BMP, TIFF ou WebP depuis son en-tête, sans la décoder.
+
+    Returns:
+        tuple: (largeur, hauteur), ou None si le format n'est pas reconnu
+    """
+    with open(path, 'rb') as f:
+        header = f.read(30)
+        if header[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', header[16:24])
+        if header[:2] == b'BM':
+            width, height = struct.unpack('<ii', header[18:26])
+            return width, abs(height)
+        if header[:4] in (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+'):
+            return _tiff_size(f, '<' if header[:2] == b'II' else '>', header[2:4] in (b'+\x00', b'\x00+'))
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return _webp_size(header)
+        if header[:2] == b'\xff\xd8':
+            # Parcours des segments jusqu'au marqueur SOF qui porte les dimensions
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                    continue
+                length = struct.unpack('>H', f.read(2))[0]
+                if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack('>xHH', f.read(5))
+                    return width, height
+                f.seek(length - 2, os.SEEK_CUR)
+    return None
+
+
+def _area_weights(source_length, target_length):
+    """
+    Poids de réduction par moyenne de surface le long d'un axe : chaque pixel
+    source recouvre au plus deux pixels de sortie.
+
+    Returns:
+        tuple: (index de sortie bas, poids vers l'index bas, poids vers l'index suivant)
+    """
+    scale = target_length / source_length
+    start = np.arange(source_length) * scale
+    low = np.floor(start).astype(np.int64)
+    end = start + scale
+    weight_low = np.minimum(end, low + 1) - start
+    weight_high = np.maximum(end - (low + 1), 0.0)
+    return low, weight_low.astype(np.float32), weight_high.astype(np.float32)
+
+
+class TiledImage:
+    """
+    Image BGR stockée en tuiles dans un fichier projeté en mémoire.
+    Le tableau a la forme (tuiles_y, tuiles_x, TILE_SIZE, TILE_SIZE, 3) ; les
+    tuiles du bord droit et du bas sont complétées par des zéros.
+    """
+    def __init__(self, cache_path):
+        """
+        Ouvre un cache de tuiles existant (voir open_tiled_image).
+
+        Args:
+            cache_path: Chemin du cache (.npy) écrit par build_tile_cache
+        """
+        self.cache_path = cache_path
+        self.tiles = np.load(cache_path, mmap_mode='r')
+        self.tile_size = self.tiles.shape[2]
+        height, width = np.load(cache_path + ".size.npy")
+        self.shape = (int(height), int(width), 3)
+        self.dtype = np.uint8
+        self.tiles_read = 0  # Nombre de tuiles lues, pour vérifier la localité des accès
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Les processus de rendu rouvrent le cache : l'image n'est jamais copiée
+        return {"cache_path": self.cache_path}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_path"])
+
+    def region(self, x0, y0, x1, y1):
+        """
+        Lit un rectangle de l'image en ne touchant que les tuiles qui le recouvrent.
+
+        Args:
+            x0, y0, x1, y1: Rectangle source, bornes de fin exclusives (déjà bornées à l'image)
+
+        Returns:
+            np.ndarray: Copie BGR du rectangle
+        """
+        out = np.empty((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+        size = self.tile_size
+        count = 0
+        for ty in range(y0 // size, (y1 - 1) // size + 1):
+            top, bottom = max(y0, ty * size), min(y1, (ty + 1) * size)
+            for tx in range(x0 // size, (x1 - 1) // size + 1):
+                left, right = max(x0, tx * size), min(x1, (tx + 1) * size)
+                out[top - y0:bottom - y0, left - x0:right - x0] = self.tiles[
+                    ty, tx, top - ty * size:bottom - ty * size, left - tx * size:right - tx * size
+                ]
+                count += 1
+        with self._lock:
+            self.tiles_read += count
+        return out
+
+    def resize(self, resolution):
+        """
+        Met l'image à la résolution demandée par bandes horizontales, sans
+        jamais charger l'image entière. Chaque bande est d'abord mise à la
+        largeur de sortie, puis les lignes sont réduites par moyenne de surface
+        comme cv2.INTER_AREA (écart d'au plus un niveau dû aux arrondis), ou
+        agrandies en bilinéaire si la hauteur augmente.
+
+        Args:
+            resolution: Taille (largeur, hauteur) de sortie
+
+        Returns:
+            np.ndarray: Image BGR redimensionnée
+        """
+        height, width = self.shape[:2]
+        out_w, out_h = resolution
+        if out_w >= width and out_h >= height:
+            # Agrandissement sur les deux axes : la source est plus petite que la sortie
+            return cv2.resize(self.region(0, 0, width, height), (out_w, out_h), interpolation=cv2.INTER_AREA)
+
+        horizontal = cv2.INTER_AREA if out_w < width else cv2.INTER_LINEAR
+        band = max(1, _BAND_BYTES // (max(width, out_w) * 3 * 4))
+        if out_h >= height:
+            # Hauteur agrandie : les lignes mises à la largeur de sortie tiennent dans
+            # une image plus petite que la sortie, agrandie ensuite verticalement
+            rows = np.empty((height, out_w, 3), dtype=np.uint8)
+            for y0 in range(0, height, band):
+                y1 = min(height, y0 + band)
+                rows[y0:y1] = cv2.resize(self.region(0, y0, width, y1), (out_w, y1 - y0), interpolation=horizontal)
+            return cv2.resize(rows, (out_w, out_h), interpolation=cv2.INTER_LINEAR)
+
+        low, weight_low, weight_high = _area_weights(height, out_h)
+        out = np.zeros((out_h + 1, out_w, 3), dtype=np.float32)  # Une ligne de débordement
+        for y0 in range(0, height, band):
+            y1 = min(height, y0 + band)
+            # Mise à la largeur de sortie de la bande, puis accumulation verticale
+            rows = cv2.resize(self.region(0, y0, width, y1).astype(np.float32), (out_w, y1 - y0),
+                              interpolation=horizontal)
+            targets = low[y0:y1]
+            starts = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+            out[targets[starts]] += np.add.reduceat(rows * weight_low[y0:y1, None, None], starts, axis=0)
+            out[targets[starts] + 1] += np.add.reduceat(rows * weight_high[y0:y1, None, None], starts, axis=0)
+        return np.clip(np.rint(out[:out_h]), 0, 255).astype(np.uint8)
+
+
+def tile_cache_path(image_path, cache_dir=None):
+    """
+    Chemin du cache de tuiles d'une image ; il change si le fichier source est modifié.
+
+    Args:
+        image_path: Chemin de l'image source
+        cache_dir: Dossier des caches (TILE_CACHE_DIR par défaut)
+
+    Returns:
+        str: Chemin du fichier .npy des tuiles
+    """
+    info = os.stat(image_path)
+    key = f"{os.path.abspath(image_path)}|{info.st_size}|{info.st_mtime_ns}|{TILE_SIZE}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir or TILE_CACHE_DIR, f"{digest}.npy")
+
+
+def build_tile_cache(image, cache_path, tile_size=TILE_SIZE):
+    """
+    Recopie une image décodée dans un cache de tuiles. L'écriture passe par un
+    fichier temporaire : un cache interrompu n'est jamais lu.
+
+    Args:
+        image: Image BGR décodée
+        cache_path: Chemin du cache à créer
+        tile_size: Côté des tuiles, en pixels
+    """
+    height, width = image.shape[:2]
+    tiles_y, tiles_x = -(-height // tile_size), -(-width // tile_size)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp.npy"
+    tiles = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.uint8,
+                                      shape=(tiles_y, tiles_x, tile_size, tile_size, 3))
+    band = np.zeros((tile_size, tiles_x * tile_size, 3), dtype=np.uint8)
+    for ty in range(tiles_y):
+        rows = image[ty * tile_size:(ty + 1) * tile_size]
+        band[:len(rows), :width] = rows
+        band[len(rows):] = 0
+        tiles[ty] = band.reshape(tile_size, tiles_x, tile_size, 3).transpose(1, 0, 2, 3)
+    tiles.flush()
+    del tiles
+    np.save(cache_path + ".size.npy", np.array([height, width]))
+    os.replace(temp_path, cache_path)
+
+
+def _decode_into_cache(image_path, cache_path):
+    """Décode l'image entière et la recopie dans un cache de tuiles."""
+    try:
+        image = cv2.imread(image_path)
+    except cv2.error:
+        image = None
+    if image is None:
+        raise ValueError(f"Impossible de lire l'image: {image_path}")
+    build_tile_cache(image, cache_path)
+
+
+def _decode_into_cache_unlimited(image_path, cache_path, pixels):
+    """
+    Construit le cache dans un processus Python séparé dont la limite de
+    décodage d'OpenCV couvre l'image : la limite du processus courant est figée
+    depuis le chargement d'OpenCV.
+
+    Raises:
+        ValueError: Si l'image ne peut pas être lue
+    """
+    env = dict(os.environ, OPENCV_IO_MAX_IMAGE_PIXELS=str(pixels))
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), image_path, cache_path],
+                            env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise ValueError(lines[-1] if lines else f"Impossible de lire l'image: {image_path}")
+
+
+def open_tiled_image(image_path, cache_dir=None):
+    """
+    Ouvre une image en tuiles, en construisant le cache au premier chargement.
+    Seul ce premier chargement décode l'image entière en mémoire, dans un
+    processus séparé si elle dépasse la limite de décodage d'OpenCV.
+
+    Args:
+        image_path: Chemin de l'image source
+        cache_dir: Dossier des caches (TILE_CACHE_DIR par défaut)
+
+    Returns:
+        TiledImage: L'image projetée en mémoire
+
+    Raises:
+        ValueError: Si l'image ne peut pas être lue
+    """
+    cache_path = tile_cache_path(image_path, cache_dir)
+    if not os.path.exists(cache_path):
+        size = read_image_size(image_path)
+        max_pixels = int(os.environ.get("OPENCV_IO_MAX_IMAGE_PIXELS", _OPENCV_DEFAULT_MAX_PIXELS))
+        if size and size[0] * size[1] > max_pixels:
+            _decode_into_cache_unlimited(image_path, cache_path, size[0] * size[1])
+        else:
+            _decode_into_cache(image_path, cache_path)
+    return TiledImage(cache_path)
+
+
+def source_memory(image_path, size, resolution, cache_dir=None):
+    """
+    Estime la mémoire de pointe de la lecture d'une image source et de sa mise
+    à la taille de sortie (voir tube_render.load_image).
+
+    Args:
+        image_path: Chemin de l'image source
+        size: Taille (largeur, hauteur) de l'image
+        resolution: Taille (largeur, hauteur) de sortie
+        cache_dir: Dossier des caches (TILE_CACHE_DIR par défaut)
+
+    Returns:
+        int: Estimation en octets
+    """
+    width, height = size
+    if width * height < TILED_IMAGE_MIN_PIXELS or not os.path.exists(tile_cache_path(image_path, cache_dir)):
+        # Image décodée entière : pendant tout le rendu, ou le temps de construire le cache
+        return width * height * 3
+    # Image en tuiles : bande lue, sa copie en flottants, ses lignes à la largeur de
+    # sortie, et l'accumulateur en flottants de TiledImage.resize
+    out_w, out_h = resolution
+    return 3 * _BAND_BYTES + (out_h + 1) * out_w * 3 * 4
+
+
+if __name__ == '__main__':
+    # Construction du cache par open_tiled_image au-delà de la limite de décodage d'OpenCV
+    try:
+        _decode_into_cache(sys.argv[1], sys.argv[2])
+    except ValueError as e:
+        sys.stderr.write(f"{e}\n")
+        sys.exit(1)